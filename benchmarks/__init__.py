@@ -0,0 +1,4 @@
+"""
+Пакет бенчмарков виртуальной клавиатуры
+Запуск из корня проекта: python -m benchmarks.<имя_модуля>
+"""
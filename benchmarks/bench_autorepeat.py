@@ -0,0 +1,153 @@
+"""
+Бенчмарк автоповтора
+Подаёт удержание клавиши (нажатие, поток повторов ОС, отпускание) и
+быстрые двойные буквы и проверяет, что повторы не зажигают подсветку
+заново, сливаются в одну правку текста, а двойные буквы не теряются
+
+События подаются из отдельного потока (как от слушателя pynput), пока
+главный цикл не обрабатывает события, затем выполняется один root.update().
+Нужен дисплей (на сервере - xvfb-run)
+
+Запуск: python -m benchmarks.bench_autorepeat [--repeats 1000] [--language en]
+"""
+
+# Импортируем модуль argparse для разбора параметров командной строки
+import argparse
+# Импортируем модуль sys для кода завершения
+import sys
+# Импортируем модуль threading для потока-источника событий
+import threading
+# Импортируем модуль time для измерения времени
+import time
+# Импортируем модуль tkinter для окна
+import tkinter as tk
+
+
+def _feed(events, handler) -> float:
+    """Подача событий из отдельного потока; возвращает время подачи в секундах"""
+    def produce():
+        for pressed, event in events:
+            handler(pressed, event)
+
+    start = time.perf_counter()
+    producer = threading.Thread(target=produce)
+    producer.start()
+    producer.join()
+    return time.perf_counter() - start
+
+
+def run(root: tk.Tk, repeats: int, language_code: str) -> bool:
+    """
+    Прогон бенчмарка
+
+    Args:
+        root: Главное окно Tk
+        repeats: Количество событий автоповтора за удержание
+        language_code: Раскладка ('en' или 'ru')
+
+    Returns:
+        bool: True, если все проверки пройдены
+    """
+    # Импортируем pynput и модули клавиатуры здесь: pynput требует дисплей при загрузке
+    from pynput.keyboard import Key, KeyCode
+    from keyboard.config import Language, UIConfig
+    from keyboard.events import KeyEventNormalizer
+    from keyboard.factory import KeyboardFactory
+
+    UIConfig.TEXT_DISPLAY_MODE = 'scroll'
+    visualizer, controller = KeyboardFactory.create_layout(Language(language_code.upper()), root)
+    visualizer.create_keyboard()
+    controller.caps_lock_on = False
+    root.update()
+
+    # События строятся на границе слушателя, как в LayoutManager
+    normalizer = KeyEventNormalizer()
+
+    def handle(pressed, key):
+        event = normalizer.normalize(key, pressed)
+        if pressed:
+            controller.on_press(event)
+        else:
+            controller.on_release(event)
+
+    def tap(key):
+        return [(True, key), (False, key)]
+
+    def hold(key, count):
+        return [(True, key)] * (count + 1)
+
+    counters = visualizer.overload
+    ok = True
+
+    # Быстрые двойные буквы: каждая - своя пара нажатие/отпускание
+    word = [KeyCode.from_char(char) for char in 'bookkeeper']
+    _feed([event for key in word for event in tap(key)], handle)
+    root.update()
+    typed = controller.get_typed_text()
+    if len(typed) != len(word):
+        print(f"ОШИБКА: двойные буквы потеряны ({typed!r})")
+        ok = False
+
+    # Удержание буквы: нажатие и поток повторов без отпускания
+    letter = KeyCode.from_char('a')
+    queued_before = counters.edits_queued
+    batches_before = counters.batches
+    produced = _feed(hold(letter, repeats), handle)
+    highlight_events = visualizer.key_state.events
+    # Удерживается только буква
+    held = next(iter(controller.held_keys.values()), None)
+    pending = len(controller.input_queue)
+    start = time.perf_counter()
+    root.update()
+    frame = time.perf_counter() - start
+    _feed([(False, letter)], handle)
+    root.update()
+
+    print(f"удержание: {repeats} повторов за {produced * 1000:.1f} мс, "
+          f"правок в очереди {pending}, событий подсветки {highlight_events}")
+    print(f"один проход цикла: {frame * 1000:.1f} мс (кадр {UIConfig.ANIMATION_FRAME_MS} мс), "
+          f"пачек {counters.batches - batches_before}")
+    if pending != 1 or highlight_events > 1:
+        print("ОШИБКА: повторы не слились в одну правку и одну подсветку")
+        ok = False
+    if held is None or held.repeats < repeats:
+        print("ОШИБКА: счётчик повторов удерживаемой клавиши не совпадает")
+        ok = False
+    if counters.edits_queued - queued_before != repeats + 1:
+        print("ОШИБКА: не все повторы поставлены в очередь")
+        ok = False
+
+    # Удержание Backspace стирает по символу на каждый повтор
+    length = len(controller.get_typed_text())
+    erase = min(repeats, length - len(word))
+    _feed(hold(Key.backspace, erase - 1) + [(False, Key.backspace)], handle)
+    root.update()
+    typed = controller.get_typed_text()
+    if len(typed) != length - erase:
+        print(f"ОШИБКА: Backspace стёр {length - len(typed)} символов из {erase}")
+        ok = False
+    if controller.held_keys or visualizer.key_state.down:
+        print("ОШИБКА: клавиши остались нажатыми после отпускания")
+        ok = False
+    print(f"счётчики: {counters.summary()}")
+    return ok
+
+
+def main():
+    """Запуск бенчмарка; код завершения 1, если проверка не пройдена"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeats', type=int, default=1000, help="событий автоповтора за удержание")
+    parser.add_argument('--language', default='en', choices=['en', 'ru'], help="раскладка")
+    args = parser.parse_args()
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"Нет дисплея для Tk ({e}); запустите под xvfb-run")
+        sys.exit(2)
+    ok = run(root, args.repeats, args.language)
+    root.destroy()
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
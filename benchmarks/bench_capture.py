@@ -0,0 +1,175 @@
+"""
+Бенчмарк задержки обработчика перехвата клавиатуры
+Сравнивает слушатель в процессе GUI и изолированный перехват под нагрузкой GUI
+
+Перехватчик ОС моделируется потоком, который просыпается в заданный момент
+и вызывает обработчик события. Задержка обработчика - время от запланированного
+момента события до возврата из обработчика: она включает ожидание GIL, пока
+главный поток занят "тяжёлыми" обратными вызовами (перестроение раскладки, GC)
+
+Запуск: python -m benchmarks.bench_capture [--duration 3] [--rate 200] [--load-ms 50]
+"""
+
+# Импортируем модуль argparse для разбора параметров командной строки
+import argparse
+# Импортируем модуль multiprocessing для изолированного режима
+import multiprocessing
+# Импортируем модуль threading для потока-перехватчика в режиме без изоляции
+import threading
+# Импортируем модуль time для измерения времени
+import time
+# Импортируем типы для аннотации
+from typing import Callable, List
+
+# Импортируем источник событий изолированного перехвата
+from keyboard.capture import _CaptureSource
+# Импортируем запись события (распаковка в потоке чтения)
+from keyboard.events import KeyEvent
+
+
+class _BenchKey:
+    """Символьная клавиша с атрибутами как у pynput.keyboard.KeyCode"""
+
+    def __init__(self, char: str, vk: int):
+        self.char = char
+        self.vk = vk
+
+
+def _hook_loop(callback: Callable, duration: float, rate: int) -> List[int]:
+    """
+    Модель перехватчика ОС: вызывает обработчик с заданной частотой
+
+    Args:
+        callback: Обработчик события (получает объект клавиши)
+        duration: Длительность в секундах
+        rate: Событий в секунду
+
+    Returns:
+        List[int]: Задержки обработчика в наносекундах
+    """
+    key = _BenchKey('a', 65)
+    interval_ns = int(1e9 / rate)
+    latencies = []
+    deadline = time.perf_counter_ns()
+    end = deadline + int(duration * 1e9)
+    while deadline < end:
+        deadline += interval_ns
+        # sleep отпускает GIL; после пробуждения поток ждёт GIL, как и перехватчик ОС
+        delay = deadline - time.perf_counter_ns()
+        if delay > 0:
+            time.sleep(delay / 1e9)
+        callback(key)
+        latencies.append(time.perf_counter_ns() - deadline)
+    return latencies
+
+
+def _gui_load_once(load_ms: float):
+    """
+    Один "тяжёлый" обратный вызов главного потока: чистый Python без освобождения GIL
+
+    Args:
+        load_ms: Длительность обратного вызова в миллисекундах
+    """
+    end = time.perf_counter() + load_ms / 1000.0
+    # Имитация перестроения раскладки: много мелких объектов Python
+    while time.perf_counter() < end:
+        [str(i) for i in range(200)]
+    # Короткая пауза между обратными вызовами, как у цикла событий Tk
+    time.sleep(0.001)
+
+
+def _in_process_handler(key):
+    """Обработчик в процессе GUI: работа, сравнимая с on_press контроллера"""
+    name = str(key.char).replace('Key.', '')
+    return {name: time.time()}
+
+
+def _isolated_child(conn, result_conn, duration: float, rate: int):
+    """
+    Процесс изолированного перехвата: обработчик только упаковывает и отправляет событие
+
+    Args:
+        conn: Канал событий в процесс GUI
+        result_conn: Канал для возврата задержек обработчика
+        duration: Длительность в секундах
+        rate: Событий в секунду
+    """
+    source = _CaptureSource(conn)
+    latencies = _hook_loop(source.on_press, duration, rate)
+    conn.close()
+    result_conn.send(latencies)
+
+
+def _percentiles(values: List[int]) -> str:
+    """Строка p50 / p99 / max в миллисекундах"""
+    ordered = sorted(values)
+    p50 = ordered[len(ordered) // 2] / 1e6
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] / 1e6
+    return f"p50={p50:7.3f} ms  p99={p99:7.3f} ms  max={ordered[-1] / 1e6:7.3f} ms"
+
+
+def run_in_process(duration: float, rate: int, load_ms: float) -> List[int]:
+    """Перехватчик - поток процесса GUI (как pynput.keyboard.Listener)"""
+    result: List[int] = []
+    hook = threading.Thread(target=lambda: result.extend(
+        _hook_loop(_in_process_handler, duration, rate)))
+    hook.start()
+    # Нагрузка выполняется в главном потоке, пока работает перехватчик
+    while hook.is_alive():
+        _gui_load_once(load_ms)
+    return result
+
+
+def run_isolated(duration: float, rate: int, load_ms: float):
+    """
+    Перехватчик - отдельный процесс, процесс GUI читает канал в потоке
+
+    Returns:
+        Tuple[List[int], List[int]]: Задержки обработчика и задержки доставки (нс)
+    """
+    context = multiprocessing.get_context('spawn')
+    reader_conn, writer_conn = context.Pipe(duplex=False)
+    result_reader, result_writer = context.Pipe(duplex=False)
+    child = context.Process(target=_isolated_child,
+                            args=(writer_conn, result_writer, duration, rate))
+    child.start()
+    writer_conn.close()
+    delivery: List[int] = []
+
+    def read_loop():
+        while True:
+            try:
+                data = reader_conn.recv_bytes()
+            except (EOFError, OSError):
+                break
+            event = KeyEvent.unpack(data)
+            delivery.append(time.monotonic_ns() - event.time_ns)
+
+    reader = threading.Thread(target=read_loop)
+    reader.start()
+    while reader.is_alive():
+        _gui_load_once(load_ms)
+    hook_latencies = result_reader.recv()
+    child.join()
+    return hook_latencies, delivery
+
+
+def main():
+    """Запуск бенчмарка и вывод результатов"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--duration', type=float, default=3.0, help="длительность режима, с")
+    parser.add_argument('--rate', type=int, default=200, help="событий в секунду")
+    parser.add_argument('--load-ms', type=float, default=50.0,
+                        help="длительность тяжёлого обратного вызова GUI, мс")
+    args = parser.parse_args()
+
+    print(f"Нагрузка GUI: обратные вызовы по {args.load_ms} мс, {args.rate} событий/с")
+    in_process = run_in_process(args.duration, args.rate, args.load_ms)
+    print(f"в процессе GUI   обработчик: {_percentiles(in_process)}")
+    hook, delivery = run_isolated(args.duration, args.rate, args.load_ms)
+    print(f"изолированный    обработчик: {_percentiles(hook)}")
+    print(f"изолированный    доставка:   {_percentiles(delivery)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Бенчмарк автодополнения
+Строит словарь из синтетических слов, измеряет время открытия файла
+и стоимость одного нажатия (шаг префикса + чтение подсказок)
+
+Запуск: python -m benchmarks.bench_completion [--words 300000] [--keystrokes 200000]
+"""
+
+# Импортируем модуль argparse для разбора параметров командной строки
+import argparse
+# Импортируем модуль os для работы с временным файлом
+import os
+# Импортируем модуль random для генерации слов
+import random
+# Импортируем модуль tempfile для временного каталога
+import tempfile
+# Импортируем модуль time для измерения времени
+import time
+# Импортируем типы для аннотации
+from typing import List, Tuple
+
+# Импортируем построение и чтение словаря
+from keyboard.completion import CompletionCursor, CompletionTrie, build_trie
+
+
+def _make_words(count: int, seed: int = 1) -> List[Tuple[str, int]]:
+    """
+    Синтетический словарь с частотами по закону Ципфа
+
+    Args:
+        count: Количество слов
+        seed: Зерно генератора
+
+    Returns:
+        List[Tuple[str, int]]: Пары (слово, частота)
+    """
+    rng = random.Random(seed)
+    letters = 'etaoinshrdlcumwfgypbvkjxqz'
+    # Частые буквы встречаются чаще, как в естественном тексте
+    weights = [len(letters) - i for i in range(len(letters))]
+    words = set()
+    while len(words) < count:
+        length = rng.randint(2, 12)
+        words.add(''.join(rng.choices(letters, weights, k=length)))
+    return [(word, 1_000_000 // (rank + 1)) for rank, word in enumerate(words)]
+
+
+def main():
+    """Запуск бенчмарка и вывод результатов"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--words', type=int, default=300_000, help="размер словаря")
+    parser.add_argument('--keystrokes', type=int, default=200_000, help="количество нажатий")
+    args = parser.parse_args()
+
+    words = _make_words(args.words)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.trie')
+        start = time.perf_counter()
+        build_trie(words, path)
+        print(f"построение:  {time.perf_counter() - start:8.2f} с, "
+              f"файл {os.path.getsize(path) / 1e6:.1f} МБ")
+
+        start = time.perf_counter()
+        trie = CompletionTrie(path)
+        print(f"открытие:    {(time.perf_counter() - start) * 1e3:8.3f} мс")
+
+        # Набираемый текст - слова словаря с опечатками и пробелами
+        rng = random.Random(2)
+        stream: List[str] = []
+        while len(stream) < args.keystrokes:
+            word = rng.choice(words)[0]
+            stream.extend(word[:rng.randint(1, len(word))])
+            stream.append(' ')
+        stream = stream[:args.keystrokes]
+
+        cursor = CompletionCursor(trie)
+        costs = []
+        for char in stream:
+            start = time.perf_counter_ns()
+            cursor.push(char)
+            cursor.completions()
+            costs.append(time.perf_counter_ns() - start)
+        costs.sort()
+        p50 = costs[len(costs) // 2] / 1e3
+        p99 = costs[int(len(costs) * 0.99)] / 1e3
+        print(f"нажатие:     p50={p50:.1f} мкс  p99={p99:.1f} мкс  max={costs[-1] / 1e3:.1f} мкс")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Бенчмарк пакетного перевода раскладки
+Измеряет пропускную способность (МБ/с) перевода файла в одном процессе и в пуле процессов
+
+Запуск: python -m benchmarks.bench_convert [--size-mb 64] [--jobs 0]
+"""
+
+# Импортируем модуль argparse для разбора параметров командной строки
+import argparse
+# Импортируем модуль os для размера файла и числа процессоров
+import os
+# Импортируем модуль random для генерации текста
+import random
+# Импортируем модуль tempfile для временного каталога
+import tempfile
+# Импортируем модуль time для измерения времени
+import time
+
+# Импортируем перечисление языков
+from keyboard.config import Language
+# Импортируем перевод потока и размер куска по умолчанию
+from keyboard.convert import DEFAULT_CHUNK_SIZE, convert_stream
+# Импортируем обучающие слова как источник правдоподобного текста
+from keyboard.ngram_data import SEED_EN
+
+
+def _write_input(path: str, size_mb: int):
+    """
+    Создание входного файла из английских слов
+
+    Args:
+        path: Путь к файлу
+        size_mb: Размер в мегабайтах
+    """
+    rng = random.Random(1)
+    words = SEED_EN.split()
+    # Один блок повторяется, чтобы генерация не занимала больше времени, чем сам замер
+    block = ' '.join(rng.choice(words) for _ in range(200_000)) + '\n'
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        written = 0
+        while written < size_mb * 1_000_000:
+            f.write(block)
+            written += len(block)
+
+
+def _measure(src_path: str, dst_path: str, jobs: int, chunk_size: int) -> float:
+    """
+    Перевод файла EN -> RU
+
+    Returns:
+        float: Пропускная способность по входу в МБ/с
+    """
+    start = time.perf_counter()
+    with open(src_path, encoding='utf-8', newline='') as src, \
+            open(dst_path, 'w', encoding='utf-8', newline='') as dst:
+        convert_stream(src, dst, Language.ENGLISH, Language.RUSSIAN, chunk_size, jobs)
+    elapsed = time.perf_counter() - start
+    return os.path.getsize(src_path) / 1e6 / elapsed
+
+
+def main():
+    """Запуск бенчмарка и вывод результатов"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size-mb', type=int, default=64, help="размер входного файла, МБ")
+    parser.add_argument('--jobs', type=int, default=0,
+                        help="процессов в параллельном режиме (0 - по числу процессоров)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="размер куска в символах")
+    args = parser.parse_args()
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as directory:
+        src_path = os.path.join(directory, 'input.txt')
+        dst_path = os.path.join(directory, 'output.txt')
+        _write_input(src_path, args.size_mb)
+        print(f"вход: {os.path.getsize(src_path) / 1e6:.0f} МБ, кусок {args.chunk_size} символов")
+        print(f"1 процесс:    {_measure(src_path, dst_path, 1, args.chunk_size):8.1f} МБ/с")
+        print(f"{jobs} процессов: {_measure(src_path, dst_path, jobs, args.chunk_size):8.1f} МБ/с")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+Бенчмарк очереди ввода нажатий
+Серия частых касаний и длинный макрос ставятся в очередь из главного
+потока; поток ввода вводит их через контроллер-заглушку с задержкой
+системного вызова
+
+Проверяется, что постановка в очередь (единственная работа главного
+потока) стоит микросекунды, частота ввода не превышает заданную, а
+задержка от касания до ввода ограничена длиной очереди
+
+Запуск: python -m benchmarks.bench_injection [--rate 200] [--taps 200] [--macro-length 1000]
+"""
+
+# Импортируем модуль argparse для разбора параметров командной строки
+import argparse
+# Импортируем модуль sys для кода завершения
+import sys
+# Импортируем модуль time для измерения времени
+import time
+# Импортируем типы для аннотации
+from typing import List
+
+# Импортируем очередь ввода нажатий
+from keyboard.injection import KeyInjector
+
+# Задержка системного вызова ввода в заглушке контроллера (секунды)
+CALL_DELAY = 50e-6
+# Допустимое превышение заданной частоты ввода
+RATE_TOLERANCE = 1.05
+# Наибольшая допустимая медиана постановки в очередь (микросекунды)
+MAX_PUT_US = 50.0
+
+
+class SlowController:
+    """Заглушка keyboard.Controller: каждое нажатие и отпускание - системный вызов"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def press(self, key):
+        self.calls += 1
+        time.sleep(CALL_DELAY)
+
+    def release(self, key):
+        self.calls += 1
+        time.sleep(CALL_DELAY)
+
+
+def _quantile_us(samples: List[float], q: float) -> float:
+    """Квантиль замеров в микросекундах"""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1e6
+
+
+def run(rate: float, taps: int, macro_length: int) -> bool:
+    """
+    Прогон бенчмарка
+
+    Args:
+        rate: Наибольшая частота ввода (нажатий в секунду)
+        taps: Количество касаний подряд
+        macro_length: Длина текста макроса в символах
+
+    Returns:
+        bool: True, если все проверки пройдены
+    """
+    injector = KeyInjector(rate=rate, controller=SlowController())
+    put_costs = []
+    start = time.perf_counter()
+    for i in range(taps):
+        t = time.perf_counter()
+        injector.put(0, None, 'abcdefghij'[i % 10])
+        put_costs.append(time.perf_counter() - t)
+    t = time.perf_counter()
+    injector.put_text('x' * macro_length)
+    macro_cost = time.perf_counter() - t
+
+    total = taps + macro_length
+    while injector.injected + injector.dropped < total:
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    achieved = injector.injected / elapsed
+    injector.close()
+
+    print(f"постановка касания в очередь: медиана {_quantile_us(put_costs, 0.5):.1f} мкс, "
+          f"p99 {_quantile_us(put_costs, 0.99):.1f} мкс")
+    print(f"постановка макроса из {macro_length} символов: {macro_cost * 1e3:.2f} мс")
+    print(f"ввод: {injector.injected} нажатий за {elapsed:.2f} с ({achieved:.0f}/с при пределе {rate:.0f}/с)")
+    print(injector.summary())
+
+    ok = True
+    if injector.dropped:
+        print(f"ОШИБКА: отброшено {injector.dropped} нажатий")
+        ok = False
+    if _quantile_us(put_costs, 0.5) > MAX_PUT_US:
+        print("ОШИБКА: постановка в очередь слишком дорога для главного потока")
+        ok = False
+    if achieved > rate * RATE_TOLERANCE:
+        print("ОШИБКА: частота ввода превышает заданную")
+        ok = False
+    # Последнее нажатие ждёт, пока введутся все стоящие перед ним
+    if injector.max_latency_ns / 1e9 > total / rate * RATE_TOLERANCE + 0.1:
+        print("ОШИБКА: задержка ввода больше длины очереди")
+        ok = False
+    return ok
+
+
+def main():
+    """Запуск бенчмарка; код завершения 1, если проверка не пройдена"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rate', type=float, default=200, help="частота ввода (нажатий в секунду)")
+    parser.add_argument('--taps', type=int, default=200, help="количество касаний подряд")
+    parser.add_argument('--macro-length', type=int, default=1000, help="длина текста макроса")
+    args = parser.parse_args()
+    sys.exit(0 if run(args.rate, args.taps, args.macro_length) else 1)
+
+
+if __name__ == '__main__':
+    main()
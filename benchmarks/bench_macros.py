@@ -0,0 +1,123 @@
+"""
+Бенчмарк распознавания макросов
+Строит автомат из синтетических последовательностей и измеряет стоимость
+одного нажатия при разном количестве макросов (шаг автомата от него не зависит)
+
+Поток нажатий случайный, но содержит вставленные макросы. Срабатывания
+сверяются с прямым поиском (каждая последовательность - суффикс истории
+нажатий) на начале потока
+
+Запуск: python -m benchmarks.bench_macros [--sequences 10000] [--keystrokes 200000]
+"""
+
+# Импортируем модуль argparse для разбора параметров командной строки
+import argparse
+# Импортируем модуль random для генерации последовательностей
+import random
+# Импортируем модуль sys для кода завершения
+import sys
+# Импортируем модуль time для измерения времени
+import time
+# Импортируем типы для аннотации
+from typing import List, Tuple
+
+# Импортируем запись события клавиатуры и биты модификаторов
+from keyboard.events import MOD_ALT, MOD_CTRL, MOD_SHIFT, KeyEvent
+# Импортируем разбор и автомат макросов
+from keyboard.macros import MacroAutomaton, MacroMatcher, parse_macros
+
+# Клавиши шагов: буквы, цифры и функциональные клавиши
+KEYS = list('abcdefghijklmnopqrstuvwxyz0123456789') + [f'f{i}' for i in range(1, 13)]
+# Сочетания модификаторов (чаще всего - без модификаторов)
+MODIFIERS = [0, 0, 0, MOD_CTRL, MOD_CTRL | MOD_ALT, MOD_CTRL | MOD_SHIFT, MOD_ALT]
+# Названия модификаторов для записи в файл
+MODIFIER_NAMES = ((MOD_CTRL, 'ctrl'), (MOD_ALT, 'alt'), (MOD_SHIFT, 'shift'))
+# Длина проверки прямым поиском (в нажатиях)
+VERIFY_KEYSTROKES = 3000
+
+
+def _step_text(mods: int, key: str) -> str:
+    """Шаг в записи файла макросов"""
+    return '+'.join([name for bit, name in MODIFIER_NAMES if mods & bit] + [key])
+
+
+def _make_macro_lines(count: int, rng: random.Random) -> List[str]:
+    """Строки файла макросов: первый шаг - сочетание, затем 1-3 шага"""
+    lines = []
+    for i in range(count):
+        steps = [_step_text(rng.choice(MODIFIERS[3:]), rng.choice(KEYS))]
+        steps += [_step_text(rng.choice(MODIFIERS), rng.choice(KEYS)) for _ in range(rng.randint(1, 3))]
+        lines.append(f"{' '.join(steps)} => action{i}")
+    return lines
+
+
+def _make_stream(macros, count: int, rng: random.Random) -> List[Tuple[int, str]]:
+    """Поток шагов: случайные нажатия со вставленными последовательностями макросов"""
+    stream = []
+    while len(stream) < count:
+        if rng.random() < 0.2:
+            stream.extend(rng.choice(macros)[0])
+        else:
+            stream.append((rng.choice(MODIFIERS), rng.choice(KEYS)))
+    return stream[:count]
+
+
+def _events(stream) -> List[KeyEvent]:
+    """События нажатий для потока шагов (модификаторы - в самом событии)"""
+    return [KeyEvent.for_char(key, mods=mods) if len(key) == 1 else KeyEvent.for_special(key, mods=mods)
+            for mods, key in stream]
+
+
+def _feed(matcher: MacroMatcher, events: List[KeyEvent]) -> int:
+    """Подача событий в распознаватель; число срабатываний"""
+    matched = 0
+    for event in events:
+        matched += len(matcher.on_press(event))
+    return matched
+
+
+def _naive_matches(macros, stream) -> int:
+    """Число срабатываний прямым поиском суффиксов"""
+    matched = 0
+    for end in range(1, len(stream) + 1):
+        for sequence, _ in macros:
+            if end >= len(sequence) and tuple(stream[end - len(sequence):end]) == sequence:
+                matched += 1
+    return matched
+
+
+def main():
+    """Запуск бенчмарка; код завершения 1, если срабатывания не совпали с прямым поиском"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sequences', type=int, default=10_000, help="количество макросов")
+    parser.add_argument('--keystrokes', type=int, default=200_000, help="количество нажатий")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    lines = _make_macro_lines(args.sequences, rng)
+    start = time.perf_counter()
+    macros = parse_macros(lines)
+    automaton = MacroAutomaton(macros)
+    print(f"разбор и компиляция {args.sequences} макросов: {(time.perf_counter() - start) * 1000:.1f} мс, "
+          f"{len(automaton.goto)} состояний")
+
+    stream = _make_stream(macros, args.keystrokes, rng)
+    events = _events(stream)
+    for count in sorted({10, args.sequences // 10, args.sequences}):
+        matcher = MacroMatcher(MacroAutomaton(macros[:count]))
+        # Первый проход заполняет запомненные переходы
+        _feed(matcher, events)
+        start = time.perf_counter()
+        matched = _feed(matcher, events)
+        per_key = (time.perf_counter() - start) / len(stream) * 1e9
+        print(f"{count:>7} макросов: {per_key:6.0f} нс на нажатие, срабатываний {matched}")
+
+    verify = stream[:VERIFY_KEYSTROKES]
+    expected = _naive_matches(macros[:1000], verify)
+    actual = _feed(MacroMatcher(MacroAutomaton(macros[:1000])), events[:VERIFY_KEYSTROKES])
+    print(f"проверка на {len(verify)} нажатиях: {actual} срабатываний (прямой поиск: {expected})")
+    sys.exit(0 if actual == expected else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""
+Бенчмарк политики перегрузки
+Подаёт пачку событий клавиатуры быстрее, чем главный цикл успевает их
+отрисовать, и проверяет, что интерфейс догоняет её за один проход цикла
+
+Пачка подаётся из отдельного потока (как от слушателя pynput), пока главный
+цикл не обрабатывает события. Затем выполняется один root.update() и
+проверяется, что: очередь правок пуста и ни одна правка не потеряна,
+дисплей показывает набранный текст и отрисованная карта клавиш совпадает
+с текущей.
+Нужен дисплей (на сервере - xvfb-run)
+
+Запуск: python -m benchmarks.bench_overload [--events 10000] [--language en]
+"""
+
+# Импортируем модуль argparse для разбора параметров командной строки
+import argparse
+# Импортируем модуль random для выбора клавиш
+import random
+# Импортируем модуль sys для кода завершения
+import sys
+# Импортируем модуль threading для потока-источника событий
+import threading
+# Импортируем модуль time для измерения времени
+import time
+# Импортируем модуль tkinter для окна
+import tkinter as tk
+
+
+def _display_matches(visualizer, text: str) -> bool:
+    """Показывает ли дисплей визуализатора указанный текст"""
+    widget = visualizer.text_display.widget
+    if isinstance(widget, tk.Text):
+        return widget.get('1.0', 'end-1c') == text
+    # Пустой Label показывает пробел, чтобы сохранить высоту строки
+    return widget.cget('text') == (text or " ")
+
+
+def _pending_callbacks(root: tk.Tk) -> int:
+    """Количество запланированных обратных вызовов after"""
+    return len(root.tk.splitlist(root.tk.call('after', 'info')))
+
+
+def run(root: tk.Tk, events: int, language_code: str) -> bool:
+    """
+    Прогон бенчмарка
+
+    Args:
+        root: Главное окно Tk
+        events: Количество нажатий в пачке (каждое - нажатие и отпускание)
+        language_code: Раскладка ('en' или 'ru')
+
+    Returns:
+        bool: True, если интерфейс догнал пачку за один проход цикла
+    """
+    # Импортируем pynput и модули клавиатуры здесь: pynput требует дисплей при загрузке
+    from pynput.keyboard import Key, KeyCode
+    from keyboard.config import Language, UIConfig
+    from keyboard.events import KeyEventNormalizer
+    from keyboard.factory import KeyboardFactory
+
+    visualizer, controller = KeyboardFactory.create_layout(Language(language_code.upper()), root)
+    visualizer.create_keyboard()
+    root.update()
+
+    keys = [KeyCode.from_char(char) for char in 'abcdefghijklmnopqrstuvwxyz,.']
+    keys += [Key.space, Key.backspace, Key.shift]
+    # События строятся на границе слушателя, как в LayoutManager
+    normalizer = KeyEventNormalizer()
+    rng = random.Random(1)
+    burst = [rng.choice(keys) for _ in range(events)]
+
+    def produce():
+        for key in burst:
+            controller.on_press(normalizer.normalize(key, True))
+            controller.on_release(normalizer.normalize(key, False))
+
+    start = time.perf_counter()
+    producer = threading.Thread(target=produce)
+    producer.start()
+    producer.join()
+    produced = time.perf_counter() - start
+    callbacks = _pending_callbacks(root)
+
+    start = time.perf_counter()
+    # Один проход главного цикла
+    root.update()
+    frame = time.perf_counter() - start
+
+    counters = visualizer.overload
+    print(f"пачка: {events} нажатий за {produced * 1000:.1f} мс, "
+          f"в очереди Tk {callbacks} обратных вызовов")
+    print(f"один проход цикла: {frame * 1000:.1f} мс (кадр {UIConfig.ANIMATION_FRAME_MS} мс)")
+    print(f"счётчики: {counters.summary()}")
+
+    ok = True
+    if len(controller.input_queue) or counters.edits_applied != counters.edits_queued:
+        print("ОШИБКА: не все правки текста применены")
+        ok = False
+    if not _display_matches(visualizer, controller.get_typed_text()):
+        print("ОШИБКА: дисплей не показывает набранный текст")
+        ok = False
+    if visualizer._render_pending or visualizer._rendered_keys != visualizer.key_state.down:
+        print("ОШИБКА: карта клавиш не отрисована")
+        ok = False
+    return ok
+
+
+def main():
+    """Запуск бенчмарка; код завершения 1, если интерфейс не догнал пачку"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--events', type=int, default=10_000, help="нажатий в пачке")
+    parser.add_argument('--language', default='en', choices=['en', 'ru'], help="раскладка")
+    args = parser.parse_args()
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"Нет дисплея для Tk ({e}); запустите под xvfb-run")
+        sys.exit(2)
+    ok = run(root, args.events, args.language)
+    root.destroy()
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
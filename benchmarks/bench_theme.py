@@ -0,0 +1,87 @@
+"""
+Бенчмарк смены темы оформления
+Сравнивает смену темы построенной клавиатуры с её пересозданием (create_keyboard)
+
+Оба замера включают отрисовку: после каждой операции выполняется
+root.update_idletasks(). Нужен дисплей (на сервере - xvfb-run)
+
+Запуск: python -m benchmarks.bench_theme [--repeat 50] [--language en]
+"""
+
+# Импортируем модуль argparse для разбора параметров командной строки
+import argparse
+# Импортируем модуль sys для кода завершения
+import sys
+# Импортируем модуль time для измерения времени
+import time
+# Импортируем модуль tkinter для окна
+import tkinter as tk
+
+
+def _median_ms(samples):
+    """Медиана замеров в миллисекундах"""
+    ordered = sorted(samples)
+    return ordered[len(ordered) // 2] * 1000.0
+
+
+def run(root: tk.Tk, repeat: int, language_code: str):
+    """
+    Прогон бенчмарка
+
+    Args:
+        root: Главное окно Tk
+        repeat: Количество повторов каждой операции
+        language_code: Раскладка ('en' или 'ru')
+    """
+    # Импортируем модули клавиатуры здесь: пакет загружает pynput, которому нужен дисплей
+    from keyboard.config import Language, UIConfig
+    from keyboard.factory import KeyboardFactory
+    from keyboard.themes import THEMES, apply_theme, compile_theme
+
+    language = Language(language_code.upper())
+    root.geometry(f"{UIConfig.DEFAULT_WINDOW_WIDTH}x{UIConfig.DEFAULT_WINDOW_HEIGHT}")
+    visualizer = KeyboardFactory.create_visualizer(language, root)
+    visualizer.create_keyboard()
+    root.update()
+
+    rebuild = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        visualizer.create_keyboard()
+        root.update_idletasks()
+        rebuild.append(time.perf_counter() - start)
+
+    # Темы компилируются один раз (при первом использовании), это не входит в смену
+    names = list(THEMES)
+    for name in names:
+        compile_theme(name)
+    switch = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        apply_theme(names[(i + 1) % len(names)], root, [visualizer])
+        root.update_idletasks()
+        switch.append(time.perf_counter() - start)
+
+    rebuild_ms = _median_ms(rebuild)
+    switch_ms = _median_ms(switch)
+    print(f"create_keyboard: {rebuild_ms:7.2f} мс (медиана {repeat} повторов)")
+    print(f"смена темы:      {switch_ms:7.2f} мс ({switch_ms / rebuild_ms:.0%} от пересоздания)")
+
+
+def main():
+    """Запуск бенчмарка и вывод результатов"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=50, help="повторов каждой операции")
+    parser.add_argument('--language', default='en', choices=['en', 'ru'], help="раскладка")
+    args = parser.parse_args()
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"Нет дисплея для Tk ({e}); запустите под xvfb-run")
+        sys.exit(2)
+    run(root, args.repeat, args.language)
+    root.destroy()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""
+Бенчмарк режима тренажёра
+Набирает урок длиной 10 000 символов с ошибками и их исправлением и
+сравнивает стоимость нажатия в начале и в конце урока
+
+Нажатие - вызов контроллера (add_character или Backspace) вместе с
+перекраской текста урока, отметкой следующей клавиши и отрисовкой
+(root.update_idletasks()). Стоимость не должна расти с позицией в уроке.
+Нужен дисплей (на сервере - xvfb-run)
+
+Запуск: python -m benchmarks.bench_tutor [--length 10000] [--error-rate 0.05]
+"""
+
+# Импортируем модуль argparse для разбора параметров командной строки
+import argparse
+# Импортируем модуль os для удаления временного файла урока
+import os
+# Импортируем модуль random для ошибок набора
+import random
+# Импортируем модуль sys для кода завершения
+import sys
+# Импортируем модуль tempfile для файла урока
+import tempfile
+# Импортируем модуль time для измерения времени
+import time
+# Импортируем модуль tkinter для окна
+import tkinter as tk
+# Импортируем типы для аннотации
+from typing import List
+
+# Допустимый рост медианы стоимости нажатия от начала к концу урока
+MAX_GROWTH = 3.0
+# Доля урока в начале и в конце, по которой сравнивается стоимость
+EDGE_FRACTION = 0.1
+
+
+def _quantile_us(samples: List[float], q: float) -> float:
+    """Квантиль замеров в микросекундах"""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1e6
+
+
+def run(root: tk.Tk, length: int, error_rate: float) -> bool:
+    """
+    Прогон бенчмарка
+
+    Args:
+        root: Главное окно Tk
+        length: Длина урока в символах
+        error_rate: Доля нажатий с ошибкой (каждая исправляется Backspace)
+
+    Returns:
+        bool: True, если стоимость нажатия не растёт с позицией
+    """
+    # Импортируем модули клавиатуры здесь: пакет загружает pynput, которому нужен дисплей
+    from keyboard.config import Language, UIConfig
+    from keyboard.factory import KeyboardFactory
+    from keyboard.ngram_data import SEED_EN
+
+    words = SEED_EN.split()
+    rng = random.Random(1)
+    lesson = ''
+    while len(lesson) < length:
+        lesson += rng.choice(words) + ' '
+    lesson = lesson[:length].strip()
+
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', suffix='.txt', delete=False) as f:
+        f.write(lesson)
+    try:
+        UIConfig.TUTOR_LESSON = f.name
+        UIConfig.TEXT_DISPLAY_MODE = 'tutor'
+        visualizer, controller = KeyboardFactory.create_layout(Language.ENGLISH, root)
+        visualizer.create_keyboard()
+        root.update()
+    finally:
+        os.unlink(f.name)
+
+    # Регистр задаётся символом урока, а не Caps Lock
+    controller.caps_lock_on = False
+    costs = []
+    for char in lesson:
+        if rng.random() < error_rate:
+            start = time.perf_counter()
+            controller.add_character('#')
+            root.update_idletasks()
+            controller.handle_special_key('backspace')
+            root.update_idletasks()
+            costs.append((time.perf_counter() - start) / 2)
+        start = time.perf_counter()
+        controller.add_character(char)
+        root.update_idletasks()
+        costs.append(time.perf_counter() - start)
+
+    alignment = visualizer.text_display.alignment
+    edge = max(1, int(len(costs) * EDGE_FRACTION))
+    head_us = _quantile_us(costs[:edge], 0.5)
+    tail_us = _quantile_us(costs[-edge:], 0.5)
+    print(f"урок: {len(lesson)} символов, нажатий {alignment.keystrokes}, "
+          f"точность {alignment.accuracy():.1%}, неисправленных ошибок {alignment.errors}")
+    print(f"нажатие в начале урока: медиана {head_us:7.1f} мкс, p99 {_quantile_us(costs[:edge], 0.99):7.1f} мкс")
+    print(f"нажатие в конце урока:  медиана {tail_us:7.1f} мкс, p99 {_quantile_us(costs[-edge:], 0.99):7.1f} мкс")
+
+    ok = True
+    if alignment.position != len(lesson) or alignment.errors:
+        print("ОШИБКА: урок не набран или сопоставление не совпало с текстом")
+        ok = False
+    if tail_us > head_us * MAX_GROWTH:
+        print(f"ОШИБКА: стоимость нажатия выросла в {tail_us / head_us:.1f} раза")
+        ok = False
+    return ok
+
+
+def main():
+    """Запуск бенчмарка; код завершения 1, если стоимость нажатия растёт с позицией"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--length', type=int, default=10_000, help="длина урока в символах")
+    parser.add_argument('--error-rate', type=float, default=0.05, help="доля нажатий с ошибкой")
+    args = parser.parse_args()
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"Нет дисплея для Tk ({e}); запустите под xvfb-run")
+        sys.exit(2)
+    ok = run(root, args.length, args.error_rate)
+    root.destroy()
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
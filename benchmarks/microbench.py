@@ -0,0 +1,399 @@
+"""
+Микробенчмарки горячих путей ввода
+Замеряет время одной операции на путях, которые выполняются на каждое
+нажатие или переключение раскладки, сохраняет результаты в JSON и
+сравнивает два таких файла, отмечая замедления больше порога шума
+
+Случай - функция, которая готовит состояние и возвращает операцию и число
+действий в ней. Число повторений операции подбирается так, чтобы один
+замер длился не меньше MIN_SAMPLE_TIME; время действия - наименьшее из
+нескольких замеров (меньше всего зависит от фоновой нагрузки), сборщик
+мусора во время замера выключен, как в timeit.
+Замеру нужен дисплей (на сервере - xvfb-run); сравнению дисплей не нужен
+
+Запуск: python -m benchmarks.microbench run [--output base.json] [--compare base.json] | compare base.json new.json [--threshold 0.15]
+"""
+
+# Импортируем модуль argparse для разбора параметров командной строки
+import argparse
+# Импортируем модуль gc для отключения сборщика мусора на время замера
+import gc
+# Импортируем модуль json для файлов результатов
+import json
+# Импортируем модуль platform для описания машины в результатах
+import platform
+# Импортируем модуль sys для кода завершения
+import sys
+# Импортируем модуль time для измерения времени
+import time
+# Импортируем модуль tkinter для окна
+import tkinter as tk
+# Импортируем SimpleNamespace для менеджера раскладок без слушателя
+from types import SimpleNamespace
+# Импортируем типы для аннотации
+from typing import Callable, Dict, Tuple
+
+# Формат файла результатов
+FORMAT_VERSION = 1
+# Количество замеров на случай
+DEFAULT_REPEATS = 7
+# Наименьшая длительность одного замера (секунды)
+MIN_SAMPLE_TIME = 0.05
+# Порог шума: замедление больше этой доли считается регрессией
+DEFAULT_THRESHOLD = 0.15
+
+# Текст для посимвольных случаев: буквы, цифры и знаки препинания
+SAMPLE_TEXT = "the quick brown fox jumps over the lazy dog, 1234567890; [x] 'y' /z."
+# Буквы без пробелов для add_character (пробел проверяет раскладку слова)
+SAMPLE_LETTERS = "packmyboxwithfivedozenliquorjugs"
+
+# Операция случая и количество действий в ней
+Operation = Tuple[Callable[[], None], int]
+
+
+def _shown(env: SimpleNamespace, language):
+    """Визуализатор и контроллер раскладки с созданной клавиатурой"""
+    visualizer, controller = env.layouts[language]
+    if visualizer.main_frame is None:
+        visualizer.create_keyboard(controller.get_typed_text())
+    return visualizer, controller
+
+
+def case_process_character_en(env: SimpleNamespace) -> Operation:
+    """EnglishKeyboardController.process_character: символ с учётом Shift и Caps Lock"""
+    _, controller = env.layouts[env.Language.ENGLISH]
+    process = controller.process_character
+    text = SAMPLE_TEXT
+
+    def operation():
+        for char in text:
+            process(char)
+    return operation, len(text)
+
+
+def case_process_character_ru(env: SimpleNamespace) -> Operation:
+    """RussianKeyboardController.process_character: перевод символа в русскую раскладку"""
+    _, controller = env.layouts[env.Language.RUSSIAN]
+    process = controller.process_character
+    text = SAMPLE_TEXT
+
+    def operation():
+        for char in text:
+            process(char)
+    return operation, len(text)
+
+
+def case_find_buttons_char(env: SimpleNamespace) -> Operation:
+    """_find_buttons_to_highlight для символов (прямой поиск в словаре кнопок)"""
+    visualizer, controller = _shown(env, env.Language.ENGLISH)
+    find = visualizer._find_buttons_to_highlight
+    mapping = controller.key_mapping
+    text = SAMPLE_TEXT.replace(' ', '')
+
+    def operation():
+        for char in text:
+            find(char, mapping)
+    return operation, len(text)
+
+
+def case_find_buttons_special(env: SimpleNamespace) -> Operation:
+    """_find_buttons_to_highlight для всех специальных клавиш (поиск через маппинг)"""
+    visualizer, controller = _shown(env, env.Language.ENGLISH)
+    find = visualizer._find_buttons_to_highlight
+    mapping = controller.key_mapping
+    names = list(mapping)
+
+    def operation():
+        for name in names:
+            find(name, mapping)
+    return operation, len(names)
+
+
+def case_register_button_symbols(env: SimpleNamespace) -> Operation:
+    """_register_button_symbols для всех кнопок раскладки (на отдельном визуализаторе)"""
+    visualizer, _ = env.factory.create_layout(env.Language.ENGLISH, env.root)
+    keys = [key for row in visualizer.get_layout() for key in row]
+
+    def operation():
+        visualizer.buttons = {}
+        visualizer._shift_symbols = set()
+        for index, key in enumerate(keys):
+            visualizer._register_button_symbols(key, index)
+    return operation, len(keys)
+
+
+def case_create_keyboard(env: SimpleNamespace) -> Operation:
+    """create_keyboard: пересоздание всех виджетов клавиатуры и расчёт геометрии"""
+    visualizer, controller = _shown(env, env.Language.ENGLISH)
+    root = env.root
+    text = controller.get_typed_text()
+
+    def operation():
+        visualizer.create_keyboard(text)
+        root.update_idletasks()
+    return operation, 1
+
+
+def case_switch_layout(env: SimpleNamespace) -> Operation:
+    """LayoutManager.switch_layout между EN и RU без системного слушателя клавиатуры"""
+    visualizer, controller = _shown(env, env.Language.ENGLISH)
+    manager = SimpleNamespace(layouts=env.layouts, current_language=env.Language.ENGLISH,
+                              current_visualizer=visualizer, current_controller=controller,
+                              listener=None, isolated_capture=True)
+    languages = (env.Language.RUSSIAN, env.Language.ENGLISH)
+    switch = env.LayoutManager.switch_layout
+    root = env.root
+
+    def operation():
+        for language in languages:
+            manager.current_language = language
+            switch(manager)
+            root.update_idletasks()
+    return operation, len(languages)
+
+
+def case_add_character(env: SimpleNamespace) -> Operation:
+    """add_character: символ в набранный текст и в дисплей (текст ограничен max_text_length)"""
+    _, controller = _shown(env, env.Language.ENGLISH)
+    add = controller.add_character
+    text = SAMPLE_LETTERS
+
+    def operation():
+        for char in text:
+            add(char)
+    return operation, len(text)
+
+
+def case_handle_special_key(env: SimpleNamespace) -> Operation:
+    """handle_special_key: пробел и Backspace (длина текста не меняется)"""
+    _, controller = _shown(env, env.Language.ENGLISH)
+    handle = controller.handle_special_key
+
+    def operation():
+        handle('space')
+        handle('backspace')
+    return operation, 2
+
+
+def case_relabel_shift(env: SimpleNamespace) -> Operation:
+    """_render_labels: переподписывание кнопок при нажатии и отпускании Shift"""
+    visualizer, _ = _shown(env, env.Language.ENGLISH)
+    states = (env.LABEL_SHIFT, 0)
+
+    def operation():
+        for state in states:
+            visualizer.label_state = state
+            visualizer._render_labels()
+    return operation, len(states)
+
+
+def case_show_preview(env: SimpleNamespace) -> Operation:
+    """show_preview: строка матрицы раскладок для русских символов (на отдельном визуализаторе)"""
+    visualizer, _ = env.factory.create_layout(env.Language.RUSSIAN, env.root)
+    visualizer.preview_matrix = env.compile_matrix()
+    show = visualizer.show_preview
+    text = SAMPLE_TEXT.translate(env.EN_TO_RU_TABLE).replace(' ', '')
+
+    def operation():
+        for char in text:
+            show(char)
+    return operation, len(text)
+
+
+# Случаи в порядке прогона
+CASES = (case_process_character_en, case_process_character_ru, case_find_buttons_char,
+         case_find_buttons_special, case_register_button_symbols, case_create_keyboard,
+         case_switch_layout, case_add_character, case_handle_special_key, case_relabel_shift,
+         case_show_preview)
+
+
+def _case_name(case) -> str:
+    """Название случая в файле результатов"""
+    return case.__name__[len('case_'):]
+
+
+def _measure(operation: Callable[[], None], ops: int, repeats: int) -> Dict[str, float]:
+    """
+    Замер операции
+
+    Args:
+        operation: Операция случая
+        ops: Количество действий в операции
+        repeats: Количество замеров
+
+    Returns:
+        Dict[str, float]: Наименьшее и медианное время действия (нс) и число повторений в замере
+    """
+    # Подбираем число повторений, удваивая его, пока замер короче MIN_SAMPLE_TIME
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            operation()
+        if time.perf_counter() - start >= MIN_SAMPLE_TIME:
+            break
+        loops *= 2
+    samples = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for _ in range(loops):
+                operation()
+            samples.append((time.perf_counter() - start) / (loops * ops) * 1e9)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    samples.sort()
+    return {'ns_per_op': samples[0], 'median_ns': samples[len(samples) // 2], 'loops': loops, 'ops': ops}
+
+
+def _format_ns(ns: float) -> str:
+    """Время действия в удобных единицах"""
+    if ns >= 1e6:
+        return f"{ns / 1e6:.2f} мс"
+    if ns >= 1e3:
+        return f"{ns / 1e3:.2f} мкс"
+    return f"{ns:.0f} нс"
+
+
+def run(root: tk.Tk, repeats: int, only: str) -> Dict:
+    """
+    Прогон случаев
+
+    Args:
+        root: Главное окно Tk
+        repeats: Количество замеров на случай
+        only: Подстрока названия: прогоняются только подходящие случаи
+
+    Returns:
+        Dict: Результаты в формате файла (описание машины и время по случаям)
+    """
+    # Импортируем pynput и модули клавиатуры здесь: pynput требует дисплей при загрузке
+    from keyboard.config import Language
+    from keyboard.factory import KeyboardFactory
+    from keyboard.labels import LABEL_SHIFT
+    from keyboard.manager import LayoutManager
+    from keyboard.preview import compile_matrix
+    from keyboard.translation import EN_TO_RU_TABLE
+
+    env = SimpleNamespace(root=root, Language=Language, factory=KeyboardFactory,
+                          LayoutManager=LayoutManager, LABEL_SHIFT=LABEL_SHIFT,
+                          compile_matrix=compile_matrix, EN_TO_RU_TABLE=EN_TO_RU_TABLE,
+                          layouts={language: KeyboardFactory.create_layout(language, root)
+                                   for language in Language})
+    for _, controller in env.layouts.values():
+        controller.caps_lock_on = False
+
+    results = {}
+    for case in CASES:
+        name = _case_name(case)
+        if only and only not in name:
+            continue
+        operation, ops = case(env)
+        result = _measure(operation, ops, repeats)
+        # Обрабатываем запланированные обратные вызовы, чтобы они не попали в следующий случай
+        root.update()
+        results[name] = result
+        print(f"{name:<28} {_format_ns(result['ns_per_op']):>12}  "
+              f"(медиана {_format_ns(result['median_ns'])}, {result['loops']} x {ops})")
+    return {
+        'version': FORMAT_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'tk': str(tk.TkVersion),
+        'repeats': repeats,
+        'cases': results,
+    }
+
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> bool:
+    """
+    Сравнение результатов с базовыми
+
+    Args:
+        baseline: Базовые результаты
+        current: Новые результаты
+        threshold: Порог шума (доля)
+
+    Returns:
+        bool: True, если ни один случай не замедлился больше порога
+    """
+    if baseline.get('platform') != current.get('platform') or baseline.get('python') != current.get('python'):
+        print(f"внимание: результаты сняты на разных машинах ({baseline.get('platform')}, "
+              f"Python {baseline.get('python')} и {current.get('platform')}, Python {current.get('python')})")
+    ok = True
+    base_cases = baseline.get('cases', {})
+    current_cases = current.get('cases', {})
+    for name, result in current_cases.items():
+        base = base_cases.get(name)
+        if base is None:
+            print(f"{name:<28} {'':>12} -> {_format_ns(result['ns_per_op']):>12}  новый случай")
+            continue
+        ratio = result['ns_per_op'] / base['ns_per_op']
+        if ratio > 1 + threshold:
+            mark = "ЗАМЕДЛЕНИЕ"
+            ok = False
+        elif ratio < 1 / (1 + threshold):
+            mark = "ускорение"
+        else:
+            mark = ""
+        print(f"{name:<28} {_format_ns(base['ns_per_op']):>12} -> {_format_ns(result['ns_per_op']):>12}  "
+              f"{(ratio - 1) * 100:+6.1f}%  {mark}")
+    for name in base_cases:
+        if name not in current_cases:
+            print(f"{name:<28} нет в новых результатах")
+    if not ok:
+        print(f"ОШИБКА: замедление больше порога шума {threshold * 100:.0f}%")
+    return ok
+
+
+def _load(path: str) -> Dict:
+    """Чтение файла результатов"""
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get('version') != FORMAT_VERSION:
+        raise ValueError(f"{path}: неизвестный формат {data.get('version')!r}")
+    return data
+
+
+def main():
+    """Запуск замера или сравнения; код завершения 1 при замедлении больше порога"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run', help="замер случаев")
+    run_parser.add_argument('--output', help="файл для сохранения результатов (JSON)")
+    run_parser.add_argument('--compare', metavar='BASELINE', help="сравнить с базовыми результатами")
+    run_parser.add_argument('--only', default='', help="прогнать только случаи с этой подстрокой в названии")
+    run_parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS, help="замеров на случай")
+    run_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help="порог шума (доля)")
+    compare_parser = commands.add_parser('compare', help="сравнение двух файлов результатов")
+    compare_parser.add_argument('baseline', help="базовые результаты (JSON)")
+    compare_parser.add_argument('current', help="новые результаты (JSON)")
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help="порог шума (доля)")
+    args = parser.parse_args()
+
+    if args.command == 'compare':
+        sys.exit(0 if compare(_load(args.baseline), _load(args.current), args.threshold) else 1)
+
+    # Базовые результаты читаются до замера: ошибка в пути не должна стоить прогона
+    baseline = _load(args.compare) if args.compare else None
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"Нет дисплея для Tk ({e}); запустите под xvfb-run")
+        sys.exit(2)
+    current = run(root, args.repeats, args.only)
+    root.destroy()
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+        print(f"результаты сохранены в {args.output}")
+    ok = compare(baseline, current, args.threshold) if baseline else True
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
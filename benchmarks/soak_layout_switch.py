@@ -0,0 +1,154 @@
+"""
+Длительный тест утечек памяти при переключении раскладок
+Выполняет много переключений раскладки и синтетических нажатий на настоящем
+окне Tk и проверяет, что память Python и число команд Tcl перестают расти
+
+Переключение повторяет LayoutManager.switch_layout без системного слушателя
+клавиатуры и без опроса раскладки ОС. Нажатия подаются в on_press/on_release
+контроллера объектами клавиш pynput, как от настоящего слушателя.
+Нужен дисплей (на сервере - xvfb-run)
+
+Запуск: python -m benchmarks.soak_layout_switch [--switches 10000] [--keystrokes 1000000]
+"""
+
+# Импортируем модуль argparse для разбора параметров командной строки
+import argparse
+# Импортируем модуль gc для сборки мусора перед снимками памяти
+import gc
+# Импортируем модуль random для выбора нажимаемых клавиш
+import random
+# Импортируем модуль sys для кода завершения
+import sys
+# Импортируем модуль time для измерения времени
+import time
+# Импортируем модуль tkinter для окна
+import tkinter as tk
+# Импортируем tracemalloc для измерения памяти Python
+import tracemalloc
+
+# Доля прогона, после которой память считается установившейся (прогрев кэшей)
+WARMUP_FRACTION = 0.1
+# Допустимый рост памяти Python после прогрева (байты)
+DEFAULT_MAX_GROWTH = 512 * 1024
+
+
+def _tcl_commands(root: tk.Tk) -> int:
+    """Число команд Tcl (обратные вызовы виджетов регистрируются как команды)"""
+    return len(root.tk.splitlist(root.tk.call('info', 'commands')))
+
+
+def _widget_count(widget) -> int:
+    """Число виджетов в дереве окна"""
+    return 1 + sum(_widget_count(child) for child in widget.winfo_children())
+
+
+def _measure(root: tk.Tk):
+    """
+    Снимок состояния после сборки мусора
+
+    Returns:
+        Tuple[int, int, int]: (память Python в байтах, команды Tcl, виджеты)
+    """
+    root.update()
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0], _tcl_commands(root), _widget_count(root)
+
+
+def run(root: tk.Tk, switches: int, keystrokes: int, max_growth: int) -> bool:
+    """
+    Прогон теста
+
+    Args:
+        root: Главное окно Tk
+        switches: Количество переключений раскладки
+        keystrokes: Общее количество нажатий (распределяется между переключениями)
+        max_growth: Допустимый рост памяти после прогрева (байты)
+
+    Returns:
+        bool: True, если утечек не обнаружено
+    """
+    # Импортируем pynput и модули клавиатуры здесь: pynput требует дисплей при загрузке
+    from pynput.keyboard import Key, KeyCode
+    from keyboard.config import Language
+    from keyboard.events import KeyEventNormalizer
+    from keyboard.factory import KeyboardFactory
+
+    layouts = {language: KeyboardFactory.create_layout(language, root) for language in Language}
+    languages = list(Language)
+    visualizer, controller = layouts[languages[0]]
+    visualizer.create_keyboard()
+
+    # Набор клавиш: буквы, цифры, пробел, Backspace и Shift
+    keys = [KeyCode.from_char(char) for char in 'abcdefghijklmnopqrstuvwxyz0123456789,.']
+    keys += [Key.space, Key.space, Key.backspace, Key.shift]
+    # События строятся на границе слушателя, как в LayoutManager
+    normalizer = KeyEventNormalizer()
+    rng = random.Random(1)
+    per_switch = max(1, keystrokes // switches)
+    warmup = max(1, int(switches * WARMUP_FRACTION))
+
+    tracemalloc.start()
+    baseline = None
+    start = time.perf_counter()
+    for step in range(switches):
+        # Переключение, как в LayoutManager.switch_layout
+        text = controller.get_typed_text()
+        visualizer.destroy_keyboard()
+        visualizer, controller = layouts[languages[(step + 1) % len(languages)]]
+        controller.set_typed_text(text)
+        visualizer.create_keyboard(text)
+
+        for _ in range(per_switch):
+            key = rng.choice(keys)
+            controller.on_press(normalizer.normalize(key, True))
+            controller.on_release(normalizer.normalize(key, False))
+        # Обрабатываем запланированные обратные вызовы и кадры анимации
+        root.update()
+
+        if step + 1 == warmup:
+            baseline = _measure(root)
+            print(f"после прогрева ({warmup} переключений): память {baseline[0] / 1024:.0f} КиБ, "
+                  f"команд Tcl {baseline[1]}, виджетов {baseline[2]}")
+    elapsed = time.perf_counter() - start
+    final = _measure(root)
+    tracemalloc.stop()
+    root.destroy()
+
+    growth = final[0] - baseline[0]
+    print(f"итог ({switches} переключений, {per_switch * switches} нажатий, {elapsed:.1f} с): "
+          f"память {final[0] / 1024:.0f} КиБ, команд Tcl {final[1]}, виджетов {final[2]}")
+    print(f"рост памяти после прогрева: {growth / 1024:+.1f} КиБ (допустимо {max_growth / 1024:.0f} КиБ)")
+
+    ok = True
+    if growth > max_growth:
+        print("ОШИБКА: память растёт с каждым переключением")
+        ok = False
+    if final[1] > baseline[1]:
+        print(f"ОШИБКА: осталось {final[1] - baseline[1]} лишних команд Tcl")
+        ok = False
+    if final[2] > baseline[2]:
+        print(f"ОШИБКА: осталось {final[2] - baseline[2]} лишних виджетов")
+        ok = False
+    return ok
+
+
+def main():
+    """Запуск теста; код завершения 1 при обнаружении утечки"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--switches', type=int, default=10_000, help="количество переключений")
+    parser.add_argument('--keystrokes', type=int, default=1_000_000, help="количество нажатий")
+    parser.add_argument('--max-growth-kb', type=int, default=DEFAULT_MAX_GROWTH // 1024,
+                        help="допустимый рост памяти после прогрева, КиБ")
+    args = parser.parse_args()
+    # Окно создаётся первым: без дисплея тест завершается до загрузки pynput
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"Нет дисплея для Tk ({e}); запустите под xvfb-run")
+        sys.exit(2)
+    ok = run(root, args.switches, args.keystrokes, args.max_growth_kb * 1024)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,18 +3,56 @@
 Содержит все модули для работы приложения
 """
 
-# Импортируем основные классы конфигурации
+# Импортируем модуль importlib для отложенного импорта классов интерфейса
+import importlib
+
+# Импортируем основные классы конфигурации (без зависимостей от tkinter и pynput)
 from .config import Language, UIConfig
-# Импортируем базовый класс визуализатора и его реализации для разных языков
-from .visualizers import BaseKeyboardVisualizer, EnglishKeyboardVisualizer, RussianKeyboardVisualizer
-# Импортируем базовый класс контроллера и его реализации для разных языков
-from .controllers import BaseKeyboardController, EnglishKeyboardController, RussianKeyboardController
-# Импортируем фабрику для создания компонентов клавиатуры
-from .factory import KeyboardFactory
-# Импортируем сервисы для определения языка и состояния Caps Lock
-from .services import LanguageDetector, CapsLockDetector
-# Импортируем менеджер для управления переключением между раскладками
-from .manager import LayoutManager
+
+# Классы интерфейса импортируются при первом обращении (PEP 562): импорт
+# подмодуля выполняет этот файл, а командные утилиты (keyboard.convert,
+# keyboard.analysis, keyboard.completion) не должны загружать tkinter и pynput
+_LAZY_EXPORTS = {
+    # Базовый класс визуализатора и его реализации для разных языков
+    'BaseKeyboardVisualizer': 'visualizers',
+    'EnglishKeyboardVisualizer': 'visualizers',
+    'RussianKeyboardVisualizer': 'visualizers',
+    # Базовый класс контроллера и его реализации для разных языков
+    'BaseKeyboardController': 'controllers',
+    'EnglishKeyboardController': 'controllers',
+    'RussianKeyboardController': 'controllers',
+    # Фабрика для создания компонентов клавиатуры
+    'KeyboardFactory': 'factory',
+    # Сервисы для определения языка и состояния Caps Lock
+    'LanguageDetector': 'services',
+    'CapsLockDetector': 'services',
+    # Менеджер для управления переключением между раскладками
+    'LayoutManager': 'manager',
+}
+
+
+def __getattr__(name: str):
+    """
+    Отложенный импорт класса интерфейса
+
+    Args:
+        name: Имя атрибута пакета
+
+    Returns:
+        Класс из соответствующего подмодуля
+    """
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """Имена пакета вместе с отложенными классами"""
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
 
 # Список всех публичных объектов, доступных при импорте пакета
 # Это определяет, что будет доступно при "from keyboard import *"
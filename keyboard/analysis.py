@@ -0,0 +1,320 @@
+"""
+Модуль офлайн-анализа записанных сеансов набора (требует NumPy)
+Загружает файл сеанса (см. recorder.py) как массивы NumPy и вычисляет
+распределения времени удержания и интервалов между нажатиями по клавишам
+и парам клавиш, частоту исправлений (Backspace) и нагрузку на ряды клавиатуры
+
+Все вычисления векторные: циклы Python идут только по уникальным клавишам,
+а не по событиям, поэтому год записей обрабатывается за секунды
+
+Запуск: python -m keyboard.analysis сеанс.kbd [--top 20]
+"""
+
+# Импортируем модуль argparse для разбора параметров командной строки
+import argparse
+# Импортируем типы для аннотации
+from typing import Dict, List, Optional, Tuple
+
+# Импортируем NumPy для векторных вычислений
+import numpy as np
+
+# Импортируем конфигурации раскладок (координаты клавиш)
+from .config import EnglishLayoutConfig, KeyboardLayoutConfig, RussianLayoutConfig
+# Импортируем формат и флаги записи события
+from .events import EVENT_STRUCT, FLAG_CHAR, FLAG_PRESSED, FLAG_SPECIAL
+# Импортируем чтение заголовка файла сеанса
+from .recorder import read_session_header
+
+# Тип записи события для NumPy (совпадает с EVENT_STRUCT)
+EVENT_DTYPE = np.dtype({
+    'names': ['flags', 'mods', 'code', 'vk', 'ts'],
+    'formats': ['u1', 'u1', '<u4', '<i4', '<i8'],
+    'offsets': [0, 1, 4, 8, 12],
+    'itemsize': EVENT_STRUCT.size,
+})
+# Интервалы длиннее этого считаются паузой и не входят в распределения (2 с)
+PAUSE_NS = 2_000_000_000
+# Вычисляемые квантили распределений
+QUANTILES = (0.5, 0.9, 0.99)
+# Вид клавиши в идентификаторе: символьная, специальная, только виртуальный код
+KIND_CHAR, KIND_SPECIAL, KIND_VK = 1, 2, 3
+
+
+class Session:
+    """Записанный сеанс: массив событий и таблица специальных клавиш"""
+
+    def __init__(self, events: np.ndarray, special_names: List[str]):
+        """
+        Args:
+            events: Массив событий с типом EVENT_DTYPE (в порядке записи)
+            special_names: Названия специальных клавиш в порядке их кодов
+        """
+        self.events = events
+        self.special_names = special_names
+
+
+def load_session(path: str) -> Session:
+    """
+    Загрузка файла сеанса (записи отображаются в память, а не читаются)
+
+    Args:
+        path: Путь к файлу, созданному SessionRecorder
+
+    Returns:
+        Session: Сеанс
+    """
+    with open(path, 'rb') as f:
+        special_names, offset = read_session_header(f)
+        f.seek(0, 2)
+        count = (f.tell() - offset) // EVENT_STRUCT.size
+    if count == 0:
+        return Session(np.empty(0, dtype=EVENT_DTYPE), special_names)
+    events = np.memmap(path, dtype=EVENT_DTYPE, mode='r', offset=offset, shape=(count,))
+    return Session(events, special_names)
+
+
+def _identify_keys(session: Session) -> Tuple[np.ndarray, List[str]]:
+    """
+    Номер клавиши для каждого события и подписи клавиш
+
+    Символы приводятся к нижнему регистру, чтобы 'A' и 'a' были одной клавишей
+
+    Returns:
+        Tuple[np.ndarray, List[str]]: (номер клавиши для каждого события, подписи по номерам)
+    """
+    events = session.events
+    flags = events['flags']
+    code = events['code'].astype(np.int64)
+    is_char = (flags & FLAG_CHAR) != 0
+    is_special = (flags & FLAG_SPECIAL) != 0
+    kind = np.where(is_char, KIND_CHAR, np.where(is_special, KIND_SPECIAL, KIND_VK))
+    # Клавиши без символа и названия различаются только виртуальным кодом
+    code = np.where(kind == KIND_VK, events['vk'].astype(np.int64), code)
+    # Нижний регистр вычисляется один раз для каждого уникального символа
+    if is_char.any():
+        chars, inverse = np.unique(code[is_char], return_inverse=True)
+        lowered = np.array([ord(chr(c).lower()) if len(chr(c).lower()) == 1 else c
+                            for c in chars.tolist()], dtype=np.int64)
+        code[is_char] = lowered[inverse]
+    ident = (kind.astype(np.int64) << 32) | (code & 0xFFFFFFFF)
+    unique, key = np.unique(ident, return_inverse=True)
+    labels = []
+    for value in unique.tolist():
+        value_kind, value_code = value >> 32, value & 0xFFFFFFFF
+        if value_kind == KIND_CHAR:
+            labels.append(chr(value_code))
+        elif value_kind == KIND_SPECIAL and value_code < len(session.special_names):
+            labels.append(session.special_names[value_code])
+        else:
+            labels.append(f"vk{value_code}")
+    return key.reshape(-1), labels
+
+
+def _key_positions() -> Dict[str, Tuple[int, int]]:
+    """
+    Координаты (строка, колонка) клавиш по подписям символов и названиям pynput
+
+    Returns:
+        Dict[str, Tuple[int, int]]: Подпись -> позиция из POSITION_WEIGHTS
+    """
+    positions: Dict[str, Tuple[int, int]] = {}
+    legends: Dict[str, List[Tuple[int, int]]] = {}
+    for layout in (EnglishLayoutConfig.LAYOUT, RussianLayoutConfig.LAYOUT):
+        for row, keys in enumerate(layout):
+            for col, legend in enumerate(keys):
+                if (row, col) not in KeyboardLayoutConfig.POSITION_WEIGHTS:
+                    continue
+                for symbol in legend.split(' | '):
+                    if len(symbol) == 1:
+                        positions.setdefault(symbol.lower(), (row, col))
+                    elif (row, col) not in legends.setdefault(symbol, []):
+                        legends[symbol].append((row, col))
+    # Специальные клавиши: левая - первая позиция подписи, правая (_r) - последняя
+    for name, legend in KeyboardLayoutConfig.SPECIAL_KEY_MAPPING.items():
+        if legend in legends:
+            positions[name] = legends[legend][-1 if name.endswith('_r') else 0]
+    return positions
+
+
+def _group_quantiles(groups: np.ndarray, values: np.ndarray,
+                     group_count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Квантили значений по группам без цикла по группам
+
+    Группа и значение упаковываются в одно 64-битное число (группа в старших
+    32 битах), после одной сортировки квантиль группы - элемент с нужным
+    смещением от начала её отрезка. Значения больше 2^32 нс (4,3 с) ограничиваются
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (размеры групп, квантили [группа, QUANTILES] в мс)
+    """
+    counts = np.bincount(groups, minlength=group_count)
+    result = np.full((group_count, len(QUANTILES)), np.nan)
+    if values.size == 0:
+        return counts, result
+    packed = (groups.astype(np.int64) << 32) | np.minimum(values, 0xFFFFFFFF).astype(np.int64)
+    packed.sort()
+    ordered = packed & 0xFFFFFFFF
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    present = counts > 0
+    for column, quantile in enumerate(QUANTILES):
+        index = starts[present] + np.floor(quantile * (counts[present] - 1)).astype(np.int64)
+        result[present, column] = ordered[index] / 1e6
+    return counts, result
+
+
+def analyze(session: Session, top: int = 20) -> dict:
+    """
+    Анализ сеанса
+
+    Args:
+        session: Загруженный сеанс
+        top: Количество самых частых пар клавиш в отчёте
+
+    Returns:
+        dict: Отчёт (см. format_report)
+    """
+    events = session.events
+    key, labels = _identify_keys(session)
+    key_count = len(labels)
+    timestamps = events['ts'].astype(np.int64)
+    pressed = (events['flags'] & FLAG_PRESSED) != 0
+    n = len(events)
+
+    # События каждой клавиши подряд в порядке времени
+    order = np.argsort(key, kind='stable')
+    key_sorted = key[order]
+    pressed_sorted = pressed[order]
+    same_key = np.zeros(n, dtype=bool)
+    same_key[1:] = key_sorted[1:] == key_sorted[:-1]
+    # Автоповтор: нажатие, перед которым у той же клавиши тоже было нажатие
+    previous_pressed = np.zeros(n, dtype=bool)
+    previous_pressed[1:] = pressed_sorted[:-1]
+    repeat_sorted = pressed_sorted & same_key & previous_pressed
+    repeat = np.empty(n, dtype=bool)
+    repeat[order] = repeat_sorted
+
+    # Удержание: от первого (не повторного) нажатия до отпускания той же клавиши
+    first_press = pressed_sorted & ~repeat_sorted
+    last_press = np.maximum.accumulate(np.where(first_press, np.arange(n), 0)) if n else np.zeros(0, np.int64)
+    release = ~pressed_sorted & same_key & previous_pressed
+    release &= key_sorted[last_press] == key_sorted
+    timestamps_sorted = timestamps[order]
+    holds = timestamps_sorted[release] - timestamps_sorted[last_press[release]]
+    hold_counts, hold_quantiles = _group_quantiles(key_sorted[release], holds, key_count)
+
+    # Нажатия без автоповтора в порядке времени
+    presses = np.flatnonzero(pressed & ~repeat)
+    press_keys = key[presses]
+    intervals = np.diff(timestamps[presses])
+    typing = intervals < PAUSE_NS
+    # Интервал приписывается второй клавише пары
+    flight_counts, flight_quantiles = _group_quantiles(
+        press_keys[1:][typing], intervals[typing], key_count)
+    press_counts = np.bincount(press_keys, minlength=key_count)
+
+    # Пары клавиш (нажатие -> следующее нажатие без паузы)
+    pairs = press_keys[:-1][typing].astype(np.int64) * key_count + press_keys[1:][typing]
+    unique_pairs, pair_index = np.unique(pairs, return_inverse=True)
+    pair_counts, pair_quantiles = _group_quantiles(pair_index.reshape(-1), intervals[typing],
+                                                   len(unique_pairs))
+    best = np.argsort(-pair_counts, kind='stable')[:top]
+
+    # Исправления: доля нажатий Backspace и доля клавиш, сразу за которыми нажат Backspace
+    backspace = labels.index('backspace') if 'backspace' in labels else -1
+    backspace_presses = int(press_counts[backspace]) if backspace >= 0 else 0
+    corrected = np.zeros(key_count, dtype=np.int64)
+    if backspace >= 0 and press_keys.size > 1:
+        followed = (press_keys[1:] == backspace) & (press_keys[:-1] != backspace)
+        corrected = np.bincount(press_keys[:-1][followed], minlength=key_count)
+    typed = press_counts.sum() - backspace_presses
+
+    # Нагрузка на ряды и позиции клавиатуры
+    positions = _key_positions()
+    grid = KeyboardLayoutConfig.POSITION_WEIGHTS
+    rows = max(row for row, _ in grid) + 1
+    cols = max(col for _, col in grid) + 1
+    key_row = np.array([positions.get(label, (-1, -1))[0] for label in labels], dtype=np.int64)
+    key_col = np.array([positions.get(label, (-1, -1))[1] for label in labels], dtype=np.int64)
+    placed = key_row >= 0
+    position_load = np.zeros((rows, cols), dtype=np.int64)
+    np.add.at(position_load, (key_row[placed], key_col[placed]), press_counts[placed])
+    row_load = position_load.sum(axis=1)
+
+    return {
+        'events': n,
+        'presses': int(press_counts.sum()),
+        'repeats': int(repeat.sum()),
+        'duration_s': float(timestamps[-1] - timestamps[0]) / 1e9 if n else 0.0,
+        'labels': labels,
+        'press_counts': press_counts,
+        'hold_counts': hold_counts,
+        'hold_ms': hold_quantiles,
+        'flight_counts': flight_counts,
+        'flight_ms': flight_quantiles,
+        'corrected': corrected,
+        'backspace_rate': backspace_presses / max(1, int(press_counts.sum())),
+        'error_rate': int(corrected.sum()) / max(1, int(typed)),
+        'digraphs': [(labels[int(unique_pairs[i] // key_count)], labels[int(unique_pairs[i] % key_count)],
+                      int(pair_counts[i]), pair_quantiles[i]) for i in best],
+        'row_load': row_load,
+        'position_load': position_load,
+    }
+
+
+def _format_quantiles(values: np.ndarray) -> str:
+    """Квантили в мс одной строкой"""
+    return '  '.join('     -' if np.isnan(v) else f"{v:6.0f}" for v in values)
+
+
+def format_report(report: dict, top: int = 20) -> str:
+    """
+    Текстовый отчёт
+
+    Args:
+        report: Результат analyze
+        top: Количество строк в таблицах
+
+    Returns:
+        str: Отчёт
+    """
+    quantiles = ' / '.join(f"p{int(q * 100)}" for q in QUANTILES)
+    lines = [
+        f"Событий: {report['events']}, нажатий: {report['presses']} "
+        f"(автоповтор: {report['repeats']}), длительность: {report['duration_s']:.0f} с",
+        f"Доля Backspace: {report['backspace_rate']:.2%}, доля исправленных нажатий: {report['error_rate']:.2%}",
+        "",
+        f"Квантили, мс: {quantiles}",
+        "",
+        f"{'клавиша':<12}{'нажатий':>9}  {'удержание':<22}  {'интервал':<22}  исправлено",
+    ]
+    press_counts = report['press_counts']
+    for index in np.argsort(-press_counts, kind='stable')[:top]:
+        lines.append(
+            f"{report['labels'][index]!r:<12}{press_counts[index]:>9}  "
+            f"{_format_quantiles(report['hold_ms'][index])}  "
+            f"{_format_quantiles(report['flight_ms'][index])}  "
+            f"{report['corrected'][index] / max(1, press_counts[index]):>10.1%}")
+    lines += ["", f"{'пара':<16}{'раз':>9}  интервал"]
+    for first, second, count, values in report['digraphs'][:top]:
+        lines.append(f"{first + ' ' + second:<16}{count:>9}  {_format_quantiles(values)}")
+    total = max(1, int(report['row_load'].sum()))
+    lines += ["", "Нагрузка на ряды:"]
+    for row, count in enumerate(report['row_load']):
+        lines.append(f"  ряд {row}: {int(count):>9}  {count / total:6.1%}")
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Точка входа командной строки"""
+    parser = argparse.ArgumentParser(prog='python -m keyboard.analysis',
+                                     description="Анализ записанного сеанса набора")
+    parser.add_argument('session', help="файл сеанса (main.py --record)")
+    parser.add_argument('--top', type=int, default=20, help="строк в таблицах")
+    args = parser.parse_args(argv)
+    report = analyze(load_session(args.session), args.top)
+    print(format_report(report, args.top))
+
+
+if __name__ == '__main__':
+    main()
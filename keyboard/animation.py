@@ -0,0 +1,324 @@
+"""
+Модуль анимации подсветки клавиш
+Содержит единые часы анимации, которые ведут затухание всех клавиш сразу
+"""
+
+# Импортируем модуль math для расчёта экспоненциального затухания
+import math
+# Импортируем модуль time для измерения интервалов между кадрами
+import time
+# Импортируем модуль tkinter для работы с виджетами
+import tkinter as tk
+# Импортируем array - компактный массив чисел без объектов-обёрток
+from array import array
+# Импортируем типы для аннотации
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+# Импортируем конфигурацию UI (цвета и параметры анимации)
+from .config import UIConfig
+
+
+def _hex_to_rgb(color: str) -> Tuple[int, int, int]:
+    """
+    Преобразование цвета из формата '#rrggbb' в кортеж (r, g, b)
+
+    Args:
+        color: Цвет в формате HEX
+
+    Returns:
+        Tuple[int, int, int]: Компоненты цвета
+    """
+    return int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
+
+
+def _mix(color_a: str, color_b: str, t: float) -> str:
+    """
+    Линейная интерполяция между двумя цветами
+
+    Args:
+        color_a: Цвет при t = 0
+        color_b: Цвет при t = 1
+        t: Доля второго цвета (от 0 до 1)
+
+    Returns:
+        str: Промежуточный цвет в формате HEX
+    """
+    ra, ga, ba = _hex_to_rgb(color_a)
+    rb, gb, bb = _hex_to_rgb(color_b)
+    return '#%02x%02x%02x' % (round(ra + (rb - ra) * t),
+                              round(ga + (gb - ga) * t),
+                              round(ba + (bb - ba) * t))
+
+
+def build_color_ramp(base_color: str, steps: int,
+                     palette: Optional[Mapping[str, str]] = None) -> List[Tuple[str, str]]:
+    """
+    Построение таблицы цветов (bg, fg) для всех уровней яркости подсветки
+
+    Уровень 0 - базовый цвет клавиши, уровень HIGHLIGHT_DIM_LEVEL - приглушённый
+    цвет отпущенной клавиши, уровень 1 - цвет нажатой клавиши
+
+    Args:
+        base_color: Базовый цвет клавиши (обычный или акцентный)
+        steps: Количество ступеней в таблице
+        palette: Цвета темы с именами констант UIConfig (None - текущие цвета UIConfig)
+
+    Returns:
+        List[Tuple[str, str]]: Пары (цвет фона, цвет текста) по ступеням
+    """
+    if palette is None:
+        palette = vars(UIConfig)
+    dim_color = palette['KEY_DIM_COLOR']
+    pressed_color = palette['KEY_PRESSED_COLOR']
+    # Ступень, на которую попадает приглушённый цвет (точно, без смешивания)
+    dim_step = round(UIConfig.HIGHLIGHT_DIM_LEVEL * (steps - 1))
+    ramp = []
+    for step in range(steps):
+        if step <= dim_step:
+            # Нижний участок: от базового цвета к приглушённому
+            bg = _mix(base_color, dim_color, step / dim_step)
+        else:
+            # Верхний участок: от приглушённого цвета к цвету нажатия
+            bg = _mix(dim_color, pressed_color, (step - dim_step) / (steps - 1 - dim_step))
+        # На ярком фоне текст делаем чёрным, как у нажатой клавиши
+        level = step / (steps - 1)
+        fg = palette['FG_BLACK'] if level >= UIConfig.HIGHLIGHT_DARK_TEXT_LEVEL else palette['FG_COLOR']
+        ramp.append((bg, fg))
+    return ramp
+
+
+class HighlightAnimator:
+    """
+    Единые часы анимации подсветки
+
+    Хранит уровень яркости всех клавиш в массивах и на каждом кадре
+    продвигает только активные затухания. Когда анимировать нечего,
+    таймер не планируется вовсе
+    """
+
+    __slots__ = ('root', 'widgets', 'painters', 'levels', 'floors', 'painted', 'ramps', '_ramp_cache',
+                 'active', 'dimmed', '_after_id', '_last_tick', '_steps')
+
+    def __init__(self, root: tk.Tk):
+        """
+        Инициализация аниматора
+
+        Args:
+            root: Главное окно приложения Tkinter (для планирования кадров)
+        """
+        # Сохраняем ссылку на главное окно
+        self.root = root
+        # Виджеты клавиш по индексам (индекс совпадает с индексом в массивах)
+        self.widgets: List[tk.Label] = []
+        # Функции перекраски клавиш по индексам (paint у кнопок-изображений, иначе configure)
+        self.painters: List[Callable[..., object]] = []
+        # Текущий уровень яркости каждой клавиши (0 - базовый цвет, 1 - нажата)
+        self.levels = array('d')
+        # Уровень, к которому затухает каждая клавиша
+        self.floors = array('d')
+        # Номер последней отрисованной ступени (кнопки создаются в базовом цвете - ступень 0)
+        self.painted = array('i')
+        # Таблица цветов для каждой клавиши (общая для клавиш с одинаковым базовым цветом)
+        self.ramps: List[List[Tuple[str, str]]] = []
+        # Кэш таблиц цветов: базовый цвет -> таблица
+        self._ramp_cache: Dict[str, List[Tuple[str, str]]] = {}
+        # Индексы клавиш, у которых идёт затухание
+        self.active: Set[int] = set()
+        # Индексы отпущенных клавиш, оставшихся в приглушённом цвете
+        self.dimmed: Set[int] = set()
+        # Идентификатор запланированного кадра (None - часы остановлены)
+        self._after_id: Optional[str] = None
+        # Время предыдущего кадра
+        self._last_tick = 0.0
+        # Количество ступеней в таблице цветов
+        self._steps = UIConfig.ANIMATION_STEPS
+
+    def bind(self, widgets: List[tk.Label], base_colors: List[str]):
+        """
+        Привязка аниматора к новому набору клавиш (после создания клавиатуры)
+
+        Args:
+            widgets: Виджеты клавиш по индексам
+            base_colors: Базовые цвета клавиш по тем же индексам
+        """
+        # Останавливаем часы: старые виджеты уже уничтожены
+        self.stop()
+        count = len(widgets)
+        self.widgets = list(widgets)
+        self.painters = [getattr(widget, 'paint', widget.configure) for widget in widgets]
+        self.levels = array('d', bytes(8 * count))
+        self.floors = array('d', bytes(8 * count))
+        self.painted = array('i', [0] * count)
+        self.ramps = [self._get_ramp(color) for color in base_colors]
+
+    def _get_ramp(self, base_color: str) -> List[Tuple[str, str]]:
+        """Получение таблицы цветов из кэша (с построением при отсутствии)"""
+        ramp = self._ramp_cache.get(base_color)
+        if ramp is None:
+            ramp = build_color_ramp(base_color, self._steps)
+            self._ramp_cache[base_color] = ramp
+        return ramp
+
+    def set_ramps(self, ramps: List[List[Tuple[str, str]]]):
+        """
+        Замена таблиц цветов (смена темы) без сброса уровней подсветки
+
+        Args:
+            ramps: Таблица цветов каждой клавиши по индексу
+        """
+        self.ramps = list(ramps)
+        # Кэш заполняется новыми таблицами: базовый цвет - нулевая ступень таблицы
+        self._ramp_cache = {ramp[0][0]: ramp for ramp in self.ramps}
+        for idx in range(len(self.widgets)):
+            # Ступень, которую нельзя получить, заставляет перерисовать клавишу
+            self.painted[idx] = -1
+            self._paint(idx)
+
+    def set_ramp(self, idx: int, ramp: List[Tuple[str, str]]):
+        """
+        Замена таблицы цветов одной клавиши (отметка тренажёра) без сброса её уровня
+
+        Args:
+            idx: Индекс клавиши
+            ramp: Новая таблица цветов
+        """
+        self.ramps[idx] = ramp
+        self.painted[idx] = -1
+        self._paint(idx)
+
+    def hold(self, indices: Iterable[int]):
+        """
+        Подсветка удерживаемых клавиш
+
+        Удерживаемые клавиши горят полностью, пока не будут отпущены.
+        Клавиши, приглушённые после предыдущих нажатий, затухают до базового цвета
+
+        Args:
+            indices: Индексы нажатых клавиш
+        """
+        indices = list(indices)
+        if not indices:
+            return
+        self.fade_out(self.dimmed)
+        self.dimmed.clear()
+        for idx in indices:
+            self.levels[idx] = 1.0
+            self.floors[idx] = 1.0
+            self.active.discard(idx)
+            # Удерживаемая клавиша не анимируется - рисуем её сразу
+            self._paint(idx)
+
+    def release(self, indices: Iterable[int]):
+        """
+        Плавное затухание отпущенных клавиш до приглушённого цвета
+
+        Args:
+            indices: Индексы отпущенных клавиш
+        """
+        dim_level = UIConfig.HIGHLIGHT_DIM_LEVEL
+        for idx in indices:
+            self.floors[idx] = dim_level
+            self.dimmed.add(idx)
+            self.active.add(idx)
+        self._start()
+
+    def pulse(self, indices: Iterable[int]):
+        """
+        Вспышка подсветки: нажатие и сразу отпускание клавиш
+
+        Args:
+            indices: Индексы клавиш
+        """
+        indices = list(indices)
+        self.hold(indices)
+        self.release(indices)
+
+    def fade_out(self, indices: Iterable[int]):
+        """
+        Плавное затухание клавиш до базового цвета
+
+        Args:
+            indices: Индексы клавиш
+        """
+        for idx in indices:
+            self.floors[idx] = 0.0
+            self.active.add(idx)
+        self._start()
+
+    def reset(self):
+        """Мгновенный сброс всех клавиш к базовому цвету и остановка часов"""
+        self.stop()
+        for idx in range(len(self.widgets)):
+            self.levels[idx] = 0.0
+            self.floors[idx] = 0.0
+            self._paint(idx)
+
+    def stop(self):
+        """Остановка часов анимации без изменения цветов"""
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except tk.TclError:
+                pass
+            self._after_id = None
+        self.active.clear()
+        self.dimmed.clear()
+
+    def _start(self):
+        """Запуск часов, если они ещё не идут"""
+        # Первый кадр рисуем сразу, чтобы нажатие было видно без задержки
+        if self._after_id is None and self.active:
+            self._last_tick = time.perf_counter()
+            self._after_id = self.root.after(0, self._tick)
+
+    def _tick(self):
+        """Один кадр анимации: продвигаем все активные затухания"""
+        now = time.perf_counter()
+        # Множитель экспоненциального затухания за прошедшее время
+        decay = math.exp(-(now - self._last_tick) * 1000.0 / UIConfig.HIGHLIGHT_DECAY_MS)
+        self._last_tick = now
+        levels = self.levels
+        floors = self.floors
+        finished = []
+        for idx in self.active:
+            floor = floors[idx]
+            level = floor + (levels[idx] - floor) * decay
+            # Затухание считается законченным, когда уровень почти достиг цели
+            if abs(level - floor) < 0.01:
+                level = floor
+                finished.append(idx)
+            levels[idx] = level
+            if not self._paint(idx):
+                # Виджеты уничтожены (клавиатура пересоздаётся) - останавливаемся
+                self._after_id = None
+                self.active.clear()
+                return
+        self.active.difference_update(finished)
+        # Планируем следующий кадр только если есть что анимировать
+        if self.active:
+            self._after_id = self.root.after(UIConfig.ANIMATION_FRAME_MS, self._tick)
+        else:
+            self._after_id = None
+
+    def _paint(self, idx: int) -> bool:
+        """
+        Отрисовка клавиши по её текущему уровню
+
+        Виджет перенастраивается только если изменилась ступень цвета
+
+        Args:
+            idx: Индекс клавиши
+
+        Returns:
+            bool: False, если виджет уже уничтожен
+        """
+        step = round(self.levels[idx] * (self._steps - 1))
+        if step == self.painted[idx]:
+            return True
+        self.painted[idx] = step
+        bg, fg = self.ramps[idx][step]
+        try:
+            self.painters[idx](bg=bg, fg=fg)
+        except tk.TclError:
+            return False
+        return True
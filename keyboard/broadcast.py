@@ -0,0 +1,390 @@
+"""
+Модуль трансляции состояния клавиатуры
+Публикует нажатия, текст и раскладку по локальному сокету для зрителей-зеркал
+"""
+
+# Импортируем модуль os для удаления устаревшего файла Unix-сокета
+import os
+# Импортируем модуль selectors для неблокирующего ввода-вывода в одном потоке
+import selectors
+# Импортируем модуль socket для TCP и Unix-сокетов
+import socket
+# Импортируем модуль struct для двоичной упаковки кадров
+import struct
+# Импортируем модуль threading для потока ввода-вывода и блокировки
+import threading
+# Импортируем deque для длин кадров в очереди зрителя
+from collections import deque
+# Импортируем типы для аннотации
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# Импортируем перечисление языков
+from .config import Language
+# Импортируем базовый класс наблюдателя состояния
+from .state import StateObserver
+
+# Заголовок кадра: длина полезной нагрузки (I, little-endian)
+FRAME_HEADER = struct.Struct('<I')
+# Запись: карта нажатых клавиш (маска фиксированной длины)
+RECORD_KEYS = 1
+# Запись: набранный текст (длина H + UTF-8)
+RECORD_TEXT = 2
+# Запись: раскладка (2 байта ASCII - значение Language)
+RECORD_LAYOUT = 3
+# Длина маски нажатых клавиш в байтах (до 128 кнопок)
+KEY_MASK_BYTES = 16
+# Заголовок записи текста: тип (B) и длина (H)
+TEXT_HEADER = struct.Struct('<BH')
+# Максимальная длина текста в записи (в байтах UTF-8)
+MAX_TEXT_BYTES = 0xFFFF
+
+
+def encode_keys(down: int) -> bytes:
+    """Запись карты нажатых клавиш"""
+    return bytes((RECORD_KEYS,)) + down.to_bytes(KEY_MASK_BYTES, 'little')
+
+
+def encode_text(text: str) -> bytes:
+    """Запись набранного текста (хвост обрезается до MAX_TEXT_BYTES)"""
+    data = text.encode('utf-8')[-MAX_TEXT_BYTES:]
+    # Обрезка могла разрезать многобайтовый символ - отбрасываем его остаток
+    data = data.decode('utf-8', 'ignore').encode('utf-8')
+    return TEXT_HEADER.pack(RECORD_TEXT, len(data)) + data
+
+
+def encode_layout(language: Language) -> bytes:
+    """Запись раскладки"""
+    return bytes((RECORD_LAYOUT,)) + language.value.encode('ascii')
+
+
+def encode_frame(records: List[bytes]) -> bytes:
+    """
+    Упаковка нескольких записей в один кадр
+
+    Args:
+        records: Закодированные записи
+
+    Returns:
+        bytes: Кадр с заголовком длины
+    """
+    payload = b''.join(records)
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+def iter_records(payload: bytes) -> Iterator[Tuple[int, object]]:
+    """
+    Разбор полезной нагрузки кадра на записи
+
+    Args:
+        payload: Полезная нагрузка кадра (без заголовка)
+
+    Yields:
+        Tuple[int, object]: (тип записи, значение: int, str или Language)
+    """
+    pos = 0
+    while pos < len(payload):
+        record_type = payload[pos]
+        if record_type == RECORD_KEYS:
+            end = pos + 1 + KEY_MASK_BYTES
+            yield record_type, int.from_bytes(payload[pos + 1:end], 'little')
+        elif record_type == RECORD_TEXT:
+            _, length = TEXT_HEADER.unpack_from(payload, pos)
+            start = pos + TEXT_HEADER.size
+            end = start + length
+            yield record_type, payload[start:end].decode('utf-8')
+        elif record_type == RECORD_LAYOUT:
+            end = pos + 3
+            yield record_type, Language(payload[pos + 1:end].decode('ascii'))
+        else:
+            raise ValueError(f"Unknown record type: {record_type}")
+        pos = end
+
+
+def parse_address(address: str) -> Tuple[int, object]:
+    """
+    Разбор адреса трансляции
+
+    Args:
+        address: 'unix:/путь/к/сокету' или 'хост:порт'
+
+    Returns:
+        Tuple[int, object]: (семейство сокета, адрес для bind/connect)
+    """
+    if address.startswith('unix:'):
+        return socket.AF_UNIX, address[len('unix:'):]
+    host, _, port = address.rpartition(':')
+    return socket.AF_INET, (host or '127.0.0.1', int(port))
+
+
+class _Viewer:
+    """Подключённый зритель: сокет, неотправленные данные и границы кадров в них"""
+
+    __slots__ = ('sock', 'buffer', 'frames', 'partial')
+
+    def __init__(self, sock: socket.socket, snapshot: bytes):
+        self.sock = sock
+        # Новый зритель сначала получает полный снимок состояния
+        self.buffer = bytearray(snapshot)
+        # Неотправленные байты каждого кадра в очереди (по порядку)
+        self.frames = deque([len(snapshot)])
+        # Первый кадр очереди отправлен частично: его остаток нельзя отбросить
+        self.partial = False
+
+
+class KeyEventPublisher(StateObserver):
+    """
+    Издатель состояния клавиатуры
+
+    Методы наблюдателя только добавляют записи в очередь и никогда не
+    блокируют вызывающий поток. Поток ввода-вывода раз в кадр объединяет
+    накопленные записи в один кадр и пишет его всем зрителям. Зритель,
+    который не успевает читать, вместо истории получает один снимок
+    последнего состояния
+    """
+
+    def __init__(self, address: str, flush_interval: float = 0.016,
+                 max_buffer: int = 64 * 1024):
+        """
+        Инициализация издателя
+
+        Args:
+            address: Адрес прослушивания ('unix:/путь' или 'хост:порт')
+            flush_interval: Интервал объединения записей в кадр (в секундах)
+            max_buffer: Предел неотправленных данных зрителя (в байтах)
+        """
+        self.address = address
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        # Блокировка очереди записей и последнего состояния
+        self._lock = threading.Lock()
+        # Записи, накопленные с прошлого кадра
+        self._pending: List[bytes] = []
+        # Последнее состояние (для снимков)
+        self._keys = 0
+        self._text = ""
+        self._language = Language.ENGLISH
+        # Подключённые зрители: дескриптор -> зритель
+        self._viewers: Dict[int, _Viewer] = {}
+        self._selector = selectors.DefaultSelector()
+        self._server: Optional[socket.socket] = None
+        # Пара сокетов для пробуждения потока ввода-вывода
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        # Счётчик снимков, отправленных вместо отставшей истории
+        self.snapshots_sent = 0
+
+    def start(self):
+        """Открытие сокета и запуск потока ввода-вывода"""
+        family, bind_address = parse_address(self.address)
+        self._server = socket.socket(family, socket.SOCK_STREAM)
+        if family == socket.AF_INET:
+            self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        elif os.path.exists(bind_address):
+            # Файл сокета остался от предыдущего запуска
+            os.unlink(bind_address)
+        self._server.bind(bind_address)
+        self._server.listen()
+        self._server.setblocking(False)
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._selector.register(self._server, selectors.EVENT_READ)
+        self._selector.register(self._wake_r, selectors.EVENT_READ)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Остановка потока и закрытие всех сокетов"""
+        self._running = False
+        self._wake()
+        if self._thread is not None:
+            self._thread.join()
+
+    def on_keys_changed(self, down: int):
+        """Публикация карты нажатых клавиш"""
+        self._enqueue(encode_keys(down), keys=down)
+
+    def on_text_changed(self, text: str):
+        """Публикация набранного текста"""
+        self._enqueue(encode_text(text), text=text)
+
+    def on_layout_changed(self, language: Language):
+        """Публикация раскладки"""
+        self._enqueue(encode_layout(language), language=language)
+
+    def _enqueue(self, record: bytes, keys: Optional[int] = None,
+                 text: Optional[str] = None, language: Optional[Language] = None):
+        """Добавление записи в очередь и обновление последнего состояния"""
+        with self._lock:
+            if keys is not None:
+                self._keys = keys
+            if text is not None:
+                self._text = text
+            if language is not None:
+                self._language = language
+            self._pending.append(record)
+
+    def _snapshot(self) -> bytes:
+        """Кадр с полным последним состоянием"""
+        with self._lock:
+            return encode_frame([encode_layout(self._language),
+                                 encode_text(self._text),
+                                 encode_keys(self._keys)])
+
+    def _wake(self):
+        """Пробуждение потока ввода-вывода"""
+        try:
+            self._wake_w.send(b'\0')
+        except (BlockingIOError, OSError):
+            pass
+
+    def _run(self):
+        """Цикл потока ввода-вывода"""
+        while self._running:
+            for selector_key, mask in self._selector.select(self.flush_interval):
+                sock = selector_key.fileobj
+                if sock is self._server:
+                    self._accept()
+                elif sock is self._wake_r:
+                    try:
+                        self._wake_r.recv(4096)
+                    except BlockingIOError:
+                        pass
+                elif mask & selectors.EVENT_WRITE:
+                    self._send(self._viewers.get(sock.fileno()))
+                else:
+                    # Зритель ничего не присылает: чтение означает закрытие соединения
+                    self._drop(self._viewers.get(sock.fileno()))
+            self._flush()
+        self._close_all()
+
+    def _accept(self):
+        """Приём нового зрителя"""
+        try:
+            sock, _ = self._server.accept()
+        except BlockingIOError:
+            return
+        sock.setblocking(False)
+        viewer = _Viewer(sock, self._snapshot())
+        self._viewers[sock.fileno()] = viewer
+        self._selector.register(sock, selectors.EVENT_READ | selectors.EVENT_WRITE)
+
+    def _flush(self):
+        """Объединение накопленных записей в кадр и постановка его всем зрителям"""
+        with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, []
+        if not self._viewers:
+            return
+        frame = encode_frame(pending)
+        snapshot = None
+        for viewer in list(self._viewers.values()):
+            if len(viewer.buffer) + len(frame) > self.max_buffer:
+                # Зритель отстаёт: заменяем очередь одним снимком состояния.
+                # Остаток частично отправленного кадра сохраняется, иначе
+                # зритель прочитает снимок как продолжение этого кадра
+                if snapshot is None:
+                    snapshot = self._snapshot()
+                keep = viewer.frames[0] if viewer.partial else 0
+                viewer.buffer[keep:] = snapshot
+                viewer.frames = deque([keep, len(snapshot)] if keep else [len(snapshot)])
+                self.snapshots_sent += 1
+            else:
+                viewer.buffer += frame
+                viewer.frames.append(len(frame))
+            self._selector.modify(viewer.sock, selectors.EVENT_READ | selectors.EVENT_WRITE)
+
+    def _send(self, viewer: Optional[_Viewer]):
+        """Неблокирующая отправка очереди зрителя"""
+        if viewer is None:
+            return
+        try:
+            sent = viewer.sock.send(viewer.buffer)
+        except BlockingIOError:
+            return
+        except OSError:
+            self._drop(viewer)
+            return
+        del viewer.buffer[:sent]
+        # Отмечаем отправленные кадры; остаток - внутри первого кадра
+        frames = viewer.frames
+        while frames and sent >= frames[0]:
+            sent -= frames.popleft()
+            viewer.partial = False
+        if sent:
+            frames[0] -= sent
+            viewer.partial = True
+        if not viewer.buffer:
+            # Очередь пуста - не ждём готовности к записи до следующего кадра
+            self._selector.modify(viewer.sock, selectors.EVENT_READ)
+
+    def _drop(self, viewer: Optional[_Viewer]):
+        """Отключение зрителя"""
+        if viewer is None:
+            return
+        self._viewers.pop(viewer.sock.fileno(), None)
+        self._selector.unregister(viewer.sock)
+        viewer.sock.close()
+
+    def _close_all(self):
+        """Закрытие всех сокетов при остановке"""
+        for viewer in list(self._viewers.values()):
+            self._drop(viewer)
+        self._selector.unregister(self._server)
+        self._server.close()
+        self._selector.close()
+        self._wake_r.close()
+        self._wake_w.close()
+
+
+class BroadcastReceiver:
+    """
+    Приёмник трансляции (сторона зрителя)
+
+    Читает кадры в фоновом потоке и передаёт записи обработчику
+    """
+
+    def __init__(self, address: str, on_records: Callable[[List[Tuple[int, object]]], None]):
+        """
+        Инициализация приёмника
+
+        Args:
+            address: Адрес издателя ('unix:/путь' или 'хост:порт')
+            on_records: Обработчик записей одного кадра (вызывается в потоке приёмника)
+        """
+        self.address = address
+        self.on_records = on_records
+        self._sock: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Подключение к издателю и запуск потока чтения"""
+        family, connect_address = parse_address(self.address)
+        self._sock = socket.socket(family, socket.SOCK_STREAM)
+        self._sock.connect(connect_address)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _read_exact(self, size: int) -> Optional[bytes]:
+        """Чтение ровно size байт (None при закрытии соединения)"""
+        chunks = []
+        while size:
+            chunk = self._sock.recv(size)
+            if not chunk:
+                return None
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b''.join(chunks)
+
+    def _run(self):
+        """Цикл чтения кадров"""
+        while True:
+            header = self._read_exact(FRAME_HEADER.size)
+            if header is None:
+                break
+            payload = self._read_exact(FRAME_HEADER.unpack(header)[0])
+            if payload is None:
+                break
+            self.on_records(list(iter_records(payload)))
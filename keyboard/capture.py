@@ -0,0 +1,126 @@
+"""
+Модуль изолированного перехвата клавиатуры
+Запускает слушатель pynput в отдельном процессе и передаёт события в GUI по каналу
+"""
+
+# Импортируем модуль multiprocessing для запуска отдельного процесса и канала (Pipe)
+import multiprocessing
+# Импортируем модуль threading для потока чтения канала
+import threading
+# Импортируем модуль time для измерения задержки доставки
+import time
+# Импортируем типы для аннотации
+from typing import Callable, Optional
+
+# Импортируем запись события и её построение из объектов pynput
+from .events import KeyEvent, KeyEventNormalizer
+
+
+class _CaptureSource:
+    """Обработчики слушателя в процессе перехвата: запись события, упаковка, отправка"""
+
+    def __init__(self, conn):
+        """
+        Args:
+            conn: Пишущий конец канала multiprocessing.Pipe
+        """
+        self.conn = conn
+        self.normalizer = KeyEventNormalizer()
+
+    def on_press(self, key):
+        """Нажатие (метка времени ставится при построении записи)"""
+        self.conn.send_bytes(self.normalizer.normalize(key, True).pack())
+
+    def on_release(self, key):
+        """Отпускание"""
+        self.conn.send_bytes(self.normalizer.normalize(key, False).pack())
+
+
+def _capture_process_main(conn):
+    """
+    Точка входа процесса перехвата
+
+    Args:
+        conn: Пишущий конец канала
+    """
+    from pynput import keyboard
+    source = _CaptureSource(conn)
+    with keyboard.Listener(on_press=source.on_press, on_release=source.on_release) as listener:
+        listener.join()
+
+
+class IsolatedKeyboardListener:
+    """
+    Слушатель клавиатуры в отдельном процессе
+
+    Повторяет интерфейс pynput.keyboard.Listener (start, stop, join).
+    Перехват ОС идёт в дочернем процессе и не ждёт GIL процесса GUI;
+    в процессе GUI поток чтения канала распаковывает записи KeyEvent и вызывает обработчики
+    """
+
+    def __init__(self, on_press: Callable, on_release: Callable):
+        """
+        Инициализация слушателя
+
+        Args:
+            on_press: Обработчик нажатия (получает KeyEvent)
+            on_release: Обработчик отпускания
+        """
+        self.on_press = on_press
+        self.on_release = on_release
+        # Дочерний процесс перехвата (создаётся в start)
+        self.process: Optional[multiprocessing.Process] = None
+        # Читающий конец канала
+        self._conn = None
+        # Поток чтения канала
+        self._reader: Optional[threading.Thread] = None
+        # Статистика задержки от метки в источнике до вызова обработчика (в нс)
+        self.events_received = 0
+        self.last_latency_ns = 0
+        self.max_latency_ns = 0
+
+    def start(self):
+        """Запуск процесса перехвата и потока чтения"""
+        # spawn вместо fork: процесс GUI многопоточный и держит состояние Tk
+        context = multiprocessing.get_context('spawn')
+        self._conn, child_conn = context.Pipe(duplex=False)
+        self.process = context.Process(target=_capture_process_main,
+                                       args=(child_conn,), daemon=True)
+        self.process.start()
+        # Пишущий конец принадлежит дочернему процессу - закрываем свою копию,
+        # чтобы завершение процесса приводило к EOFError в потоке чтения
+        child_conn.close()
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+
+    def stop(self):
+        """Остановка процесса перехвата"""
+        if self.process is not None and self.process.is_alive():
+            self.process.terminate()
+
+    def join(self):
+        """Ожидание завершения потока чтения"""
+        if self._reader is not None:
+            self._reader.join()
+
+    def _read_loop(self):
+        """Чтение записей из канала и вызов обработчиков"""
+        while True:
+            try:
+                data = self._conn.recv_bytes()
+            except (EOFError, OSError):
+                break
+            event = KeyEvent.unpack(data)
+            latency = time.monotonic_ns() - event.time_ns
+            self.events_received += 1
+            self.last_latency_ns = latency
+            if latency > self.max_latency_ns:
+                self.max_latency_ns = latency
+            try:
+                if event.pressed:
+                    self.on_press(event)
+                else:
+                    self.on_release(event)
+            except Exception:
+                # Ошибка в обработчике не должна останавливать чтение канала
+                pass
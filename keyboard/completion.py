@@ -0,0 +1,336 @@
+"""
+Модуль автодополнения слов
+Содержит компактный префиксный словарь (trie) на массивах, который строится
+заранее в файл и отображается в память (mmap) при запуске
+
+Формат файла (все числа - uint32, little-endian):
+    заголовок:  MAGIC, VERSION, node_count, edge_count, word_count, top_k, blob_size, 0
+    узлы:       node_count записей [first_edge, edge_count, top_1 .. top_k]
+    рёбра:      edge_count записей [код символа, дочерний узел], рёбра узла отсортированы по коду
+    слова:      word_count + 1 смещений в blob
+    blob:       слова в UTF-8 подряд
+
+Лучшие top_k слов каждого узла вычисляются при построении, поэтому
+запрос по префиксу - это только спуск по рёбрам и чтение готового списка
+
+Построение: python -m keyboard.completion build words.txt en.trie
+(строки файла: "слово" или "слово частота")
+"""
+
+# Импортируем модуль mmap для отображения файла словаря в память
+import mmap
+# Импортируем модуль os для работы с путями
+import os
+# Импортируем модуль struct для записи заголовка
+import struct
+# Импортируем модуль sys для аргументов командной строки
+import sys
+# Импортируем array для компактной записи массивов при построении
+from array import array
+# Импортируем типы для аннотации
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Сигнатура файла словаря
+MAGIC = 0x52544B56  # 'VKTR'
+# Версия формата файла
+VERSION = 1
+# Заголовок: 8 чисел uint32
+HEADER = struct.Struct('<8I')
+# Пустая ячейка в списке лучших слов узла
+NO_WORD = 0xFFFFFFFF
+# Количество подсказок по умолчанию
+DEFAULT_TOP_K = 3
+
+
+def build_trie(words: Iterable[Tuple[str, int]], path: str, top_k: int = DEFAULT_TOP_K):
+    """
+    Построение файла словаря
+
+    Args:
+        words: Пары (слово, частота)
+        path: Путь к создаваемому файлу
+        top_k: Количество лучших слов, хранимых в каждом узле
+    """
+    # Суммируем частоты повторяющихся слов и приводим к нижнему регистру
+    frequencies: Dict[str, int] = {}
+    for word, freq in words:
+        word = word.strip().lower()
+        if word:
+            frequencies[word] = frequencies.get(word, 0) + freq
+    # Номера слов назначаются по убыванию частоты: меньший номер - лучшее слово
+    ordered = sorted(frequencies, key=lambda w: (-frequencies[w], w))
+
+    # Строим trie на словарях: узел = {символ: номер дочернего узла}
+    children: List[Dict[str, int]] = [{}]
+    tops: List[List[int]] = [[]]
+    for word_id, word in enumerate(ordered):
+        node = 0
+        if len(tops[0]) < top_k:
+            tops[0].append(word_id)
+        for char in word:
+            child = children[node].get(char)
+            if child is None:
+                child = len(children)
+                children[node][char] = child
+                children.append({})
+                tops.append([])
+            node = child
+            # Слова идут по убыванию частоты, поэтому первые top_k - лучшие
+            if len(tops[node]) < top_k:
+                tops[node].append(word_id)
+
+    # Перенумеровываем узлы в порядке обхода в ширину, чтобы рёбра узла шли подряд
+    order = [0]
+    new_id = {0: 0}
+    for node in order:
+        for char in sorted(children[node]):
+            child = children[node][char]
+            new_id[child] = len(order)
+            order.append(child)
+
+    nodes = array('I')
+    edges = array('I')
+    for node in order:
+        nodes.append(len(edges) // 2)
+        nodes.append(len(children[node]))
+        top = tops[node] + [NO_WORD] * (top_k - len(tops[node]))
+        nodes.extend(top)
+        for char in sorted(children[node]):
+            edges.append(ord(char))
+            edges.append(new_id[children[node][char]])
+
+    offsets = array('I', [0])
+    blob = bytearray()
+    for word in ordered:
+        blob += word.encode('utf-8')
+        offsets.append(len(blob))
+
+    for typed in (nodes, edges, offsets):
+        if sys.byteorder != 'little':
+            typed.byteswap()
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(order), len(edges) // 2,
+                            len(ordered), top_k, len(blob), 0))
+        nodes.tofile(f)
+        edges.tofile(f)
+        offsets.tofile(f)
+        f.write(blob)
+
+
+class CompletionTrie:
+    """
+    Словарь автодополнения, отображённый в память
+
+    Загрузка не читает файл: массивы узлов и рёбер - это представления
+    memoryview поверх mmap, страницы подгружаются ОС по мере обращения
+    """
+
+    def __init__(self, path: str):
+        """
+        Открытие файла словаря
+
+        Args:
+            path: Путь к файлу, созданному build_trie
+
+        Raises:
+            ValueError: Если файл не является словарём нужной версии
+        """
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, node_count, edge_count, word_count, top_k, blob_size, _ = \
+            HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a completion dictionary: {path}")
+        self.top_k = top_k
+        # Размер записи узла в числах uint32
+        self._node_size = 2 + top_k
+        view = memoryview(self._mmap)
+        start = HEADER.size
+        end = start + node_count * self._node_size * 4
+        self._nodes = view[start:end].cast('I')
+        start, end = end, end + edge_count * 2 * 4
+        self._edges = view[start:end].cast('I')
+        start, end = end, end + (word_count + 1) * 4
+        self._offsets = view[start:end].cast('I')
+        self._blob = view[end:end + blob_size]
+
+    def child(self, node: int, char: str) -> int:
+        """
+        Переход по символу (двоичный поиск среди рёбер узла)
+
+        Args:
+            node: Номер узла
+            char: Символ
+
+        Returns:
+            int: Номер дочернего узла или -1, если перехода нет
+        """
+        base = node * self._node_size
+        lo = self._nodes[base]
+        hi = lo + self._nodes[base + 1]
+        code = ord(char)
+        edges = self._edges
+        while lo < hi:
+            mid = (lo + hi) >> 1
+            mid_code = edges[2 * mid]
+            if mid_code < code:
+                lo = mid + 1
+            elif mid_code > code:
+                hi = mid
+            else:
+                return edges[2 * mid + 1]
+        return -1
+
+    def top_words(self, node: int) -> List[str]:
+        """
+        Лучшие слова, начинающиеся с префикса узла
+
+        Args:
+            node: Номер узла
+
+        Returns:
+            List[str]: До top_k слов по убыванию частоты
+        """
+        base = node * self._node_size + 2
+        words = []
+        for word_id in self._nodes[base:base + self.top_k]:
+            if word_id == NO_WORD:
+                break
+            words.append(bytes(self._blob[self._offsets[word_id]:self._offsets[word_id + 1]])
+                         .decode('utf-8'))
+        return words
+
+    def complete(self, prefix: str) -> List[str]:
+        """
+        Поиск подсказок по префиксу с корня (для проверки и отладки)
+
+        Args:
+            prefix: Префикс слова
+
+        Returns:
+            List[str]: Подсказки
+        """
+        node = 0
+        for char in prefix.lower():
+            node = self.child(node, char)
+            if node < 0:
+                return []
+        return self.top_words(node)
+
+
+class CompletionCursor:
+    """
+    Пошаговое состояние префикса текущего слова
+
+    Каждый символ - один переход по trie от предыдущего узла,
+    backspace - снятие узла со стека, поиск с корня не повторяется
+    """
+
+    def __init__(self, trie: CompletionTrie):
+        """
+        Args:
+            trie: Словарь автодополнения
+        """
+        self.trie = trie
+        # Стек узлов: узел корня и по узлу на каждый символ префикса (-1 - нет в словаре)
+        self.stack: List[int] = [0]
+
+    def reset(self):
+        """Начало нового слова"""
+        self.stack = [0]
+
+    def push(self, char: str):
+        """
+        Добавление символа к префиксу
+
+        Args:
+            char: Набранный символ (не буква завершает слово)
+        """
+        if not char.isalpha():
+            self.reset()
+            return
+        node = self.stack[-1]
+        self.stack.append(self.trie.child(node, char.lower()) if node >= 0 else -1)
+
+    def pop(self, text: str):
+        """
+        Удаление последнего символа префикса
+
+        Args:
+            text: Набранный текст после удаления (для восстановления предыдущего слова)
+        """
+        if len(self.stack) > 1:
+            self.stack.pop()
+        else:
+            # Стёрт разделитель слов - восстанавливаем префикс последнего слова
+            self.sync(text)
+
+    def sync(self, text: str):
+        """
+        Восстановление префикса по хвосту текста (после переключения раскладки)
+
+        Args:
+            text: Набранный текст
+        """
+        self.reset()
+        start = len(text)
+        while start > 0 and text[start - 1].isalpha():
+            start -= 1
+        for char in text[start:]:
+            self.push(char)
+
+    def completions(self) -> List[str]:
+        """
+        Подсказки для текущего префикса
+
+        Returns:
+            List[str]: Подсказки (пусто в начале слова и для неизвестного префикса)
+        """
+        node = self.stack[-1]
+        if len(self.stack) == 1 or node < 0:
+            return []
+        return self.trie.top_words(node)
+
+
+def open_completion_cursor(directory: Optional[str], language) -> Optional[CompletionCursor]:
+    """
+    Открытие словаря языка из каталога словарей
+
+    Args:
+        directory: Каталог с файлами <код языка>.trie (например, en.trie, ru.trie)
+        language: Язык (Language)
+
+    Returns:
+        Optional[CompletionCursor]: Курсор или None, если словаря нет
+    """
+    if not directory:
+        return None
+    path = os.path.join(directory, f"{language.value.lower()}.trie")
+    if not os.path.exists(path):
+        return None
+    return CompletionCursor(CompletionTrie(path))
+
+
+def _read_word_list(path: str) -> Iterable[Tuple[str, int]]:
+    """Чтение списка слов: строки "слово" или "слово частота" """
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            parts = line.split()
+            if not parts:
+                continue
+            yield parts[0], int(parts[1]) if len(parts) > 1 else 1
+
+
+def main(argv: List[str]):
+    """Командная строка: build <слова.txt> <файл.trie> | query <файл.trie> <префикс>"""
+    if len(argv) == 3 and argv[0] == 'build':
+        build_trie(_read_word_list(argv[1]), argv[2])
+    elif len(argv) == 3 and argv[0] == 'query':
+        print('\n'.join(CompletionTrie(argv[1]).complete(argv[2])))
+    else:
+        print(main.__doc__)
+        sys.exit(2)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
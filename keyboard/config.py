@@ -37,12 +37,117 @@ class UIConfig:
     KEY_PRESSED_COLOR = '#00ff00'
     # Приглушённый цвет для отпущенных клавиш (тёмно-зелёный)
     KEY_DIM_COLOR = '#408040'
+    # Цвет следующей клавиши урока в режиме тренажёра (синий)
+    KEY_TARGET_COLOR = '#1f5f99'
+    # Цвет ошибок в тексте урока (красный)
+    FG_ERROR = '#ff5555'
+
+    # Интервал между кадрами анимации подсветки (в миллисекундах, ~60 кадров/с)
+    ANIMATION_FRAME_MS = 16
+    # Постоянная времени экспоненциального затухания подсветки (в миллисекундах)
+    HIGHLIGHT_DECAY_MS = 60
+    # Уровень яркости приглушённого цвета (0 - базовый цвет, 1 - цвет нажатия)
+    HIGHLIGHT_DIM_LEVEL = 0.35
+    # Уровень яркости, начиная с которого текст клавиши становится чёрным
+    HIGHLIGHT_DARK_TEXT_LEVEL = 0.6
+    # Количество ступеней цвета в таблице затухания
+    ANIMATION_STEPS = 32
 
     # Цвет заголовка для английской раскладки (голубой)
     TITLE_COLOR_EN = '#4dabf7'
     # Цвет заголовка для русской раскладки (красный)
     TITLE_COLOR_RU = '#ff6b6b'
 
+    # Тема оформления (название из keyboard.themes.THEMES; цвета выше - тема 'dark')
+    THEME = 'dark'
+    # Клавиша смены темы по кругу (название pynput)
+    THEME_HOTKEY = 'scroll_lock'
+
+    # Отрисовка клавиш: 'label' - перекраска tk.Label, 'image' - замена
+    # заранее нарисованных изображений из атласа (нужен Pillow)
+    KEY_RENDER_MODE = 'label'
+    # Максимальное количество изображений клавиш в атласе (старые вытесняются)
+    KEYCAP_CACHE_SIZE = 4096
+
+    # Тип текстового дисплея: 'label' - строка фиксированной ширины,
+    # 'scroll' - прокручиваемый дисплей с пошаговыми изменениями,
+    # 'tutor' - текст урока тренажёра (включается параметром main.py --lesson)
+    TEXT_DISPLAY_MODE = 'label'
+    # Максимальная длина текста в дисплее 'label' (в символах)
+    LABEL_TEXT_LENGTH = 50
+    # Максимальная длина текста в дисплее 'scroll' (в символах)
+    SCROLL_TEXT_LENGTH = 10000
+    # Высота дисплея 'scroll' (в строках)
+    SCROLL_TEXT_LINES = 2
+    # Файл урока тренажёра ('' - без тренажёра)
+    TUTOR_LESSON = ''
+    # Длина строки урока на дисплее 'tutor' (урок переносится по словам) и высота дисплея
+    TUTOR_LINE_LENGTH = 60
+    TUTOR_TEXT_LINES = 3
+
+    # Каталог словарей автодополнения (en.trie, ru.trie); без словаря подсказки отключены
+    COMPLETION_DIR = 'dictionaries'
+    # Цвет подсказок автодополнения (серый)
+    FG_COMPLETION = '#aaaaaa'
+
+    # Слова, набранные не на той раскладке: 'off' - не проверять,
+    # 'flag' - показать исправление в строке подсказок, 'convert' - заменить слово
+    WRONG_LAYOUT_MODE = 'flag'
+    # Минимальная длина проверяемого слова (короткие слова неоднозначны)
+    WRONG_LAYOUT_MIN_LENGTH = 3
+    # На сколько (в натуральных логарифмах на символ) другая раскладка должна быть правдоподобнее
+    WRONG_LAYOUT_MARGIN = 1.0
+
+    # Событий подсветки за кадр, сверх которых подсветка сводится к последнему
+    # состоянию каждой клавиши (правки текста не отбрасываются никогда)
+    OVERLOAD_THRESHOLD = 32
+
+    # Определение раскладки: 'os' - опрос ОС в фоновом потоке, 'content' - по набираемому
+    # тексту, 'auto' - опрос ОС, если он поддерживается (Windows), иначе по тексту
+    LAYOUT_DETECTION = 'auto'
+    # Порог уверенности для смены раскладки по тексту (в натуральных логарифмах)
+    LAYOUT_ID_THRESHOLD = 6.0
+    # Доля оценки, сохраняемая после каждого нажатия (старые нажатия забываются)
+    LAYOUT_ID_DECAY = 0.9
+
+    # Потоки пула обработчиков плагинов и предел очереди событий одного плагина
+    PLUGIN_WORKERS = 2
+    PLUGIN_QUEUE_SIZE = 1024
+    # Наибольшее количество событий и время (мс), которые одна задача пула тратит
+    # на плагин; потом задача ставится в конец очереди пула, и поток достаётся
+    # другим плагинам
+    PLUGIN_BATCH = 64
+    PLUGIN_SLICE_MS = 2.0
+
+    # Файл макросов (main.py --macros, '' - без макросов) и интервал проверки его изменения (мс)
+    MACRO_FILE = ''
+    MACRO_RELOAD_MS = 1000
+
+    # Ввод нажатий щелчком по кнопкам (main.py --click-to-type)
+    CLICK_TO_TYPE = False
+    # Наибольшая частота ввода (нажатий в секунду), размер пачки и предел очереди ввода
+    INJECT_RATE = 200
+    INJECT_BATCH = 64
+    INJECT_QUEUE_SIZE = 10000
+    # Сколько миллисекунд после ввода нажатия, пришедшие от слушателя, считаются
+    # эхом ввода (не распознаются как макросы и не записываются)
+    INJECT_ECHO_MS = 50
+
+    # Предпросмотр нажатой клавиши на всех раскладках (main.py --layout-preview)
+    LAYOUT_PREVIEW = False
+
+    # Имя сегмента разделяемой памяти для экспорта состояния (main.py --shared-state)
+    SHARED_STATE_NAME = 'virtual_keyboard_state'
+
+    # Порог длительности обратного вызова главного цикла для записи в журнал (мс, 0 - не следить)
+    SLOW_CALLBACK_MS = 50
+    # Клавиша включения и выключения профилировщика главного потока (название pynput)
+    PROFILER_HOTKEY = 'pause'
+    # Длительность профилирования (в секундах)
+    PROFILE_SECONDS = 10
+    # Файл результата профилирования ('{time}' заменяется на время запуска)
+    PROFILE_OUTPUT = 'profile-{time}.pstats'
+
     # Семейство шрифта для UI элементов
     FONT_FAMILY = 'Arial'
     # Моноширинный шрифт для отображения набранного текста
@@ -197,6 +302,12 @@ class RussianLayoutConfig(KeyboardLayoutConfig):
         '[': 'х', ']': 'ъ', ';': 'ж', "'": 'э',
         # Специальные символы (с Shift)
         '{': 'Х', '}': 'Ъ', ':': 'Ж', '"': 'Э',
+        # Клавиши б и ю (с/без Shift)
+        ',': 'б', '.': 'ю', '<': 'Б', '>': 'Ю',
         # Клавиша ё (с/без Shift)
-        '`': 'ё', '~': 'Ё'
+        '`': 'ё', '~': 'Ё',
+        # Знаки препинания, которые на русской раскладке стоят на других клавишах
+        '/': '.', '?': ',', '|': '/',
+        # Цифровой ряд с Shift
+        '@': '"', '#': '№', '$': ';', '^': ':', '&': '?'
     }
\ No newline at end of file
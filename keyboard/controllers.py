@@ -3,25 +3,42 @@
 Содержит базовый класс и конкретные реализации для управления вводом
 """
 
-# Импортируем модуль time для работы с временными метками
-import time
 # Импортируем ABC (Abstract Base Class) для создания абстрактных классов
 # Импортируем abstractmethod - декоратор для абстрактных методов
 from abc import ABC, abstractmethod
 # Импортируем Dict для аннотации типа словаря
-from typing import Dict
+from typing import Dict, List, Optional
 
 # Импортируем базовый класс визуализатора клавиатуры
 from .visualizers import BaseKeyboardVisualizer
 # Импортируем конфигурации раскладок клавиатуры
-from .config import KeyboardLayoutConfig, RussianLayoutConfig
+from .config import UIConfig, KeyboardLayoutConfig, RussianLayoutConfig
 # Импортируем сервис для определения состояния Caps Lock
 from .services import CapsLockDetector
+# Импортируем курсор автодополнения
+from .completion import CompletionCursor
+# Импортируем проверку раскладки слов
+from .layout_check import WrongLayoutDetector
+# Импортируем очередь правок текста
+from .overload import Edit, InputQueue
+# Импортируем состояние удерживаемой клавиши
+from .state import HeldKey
+# Импортируем загрузку урока тренажёра (длина текста в режиме тренажёра)
+from .tutor import load_lesson
+# Импортируем запись события клавиатуры, бит Shift и флаг автоповтора
+from .events import FLAG_REPEAT, MOD_SHIFT, KeyEvent
+# Импортируем номер состояния подписей клавиш
+from .labels import label_state
 
 
 class BaseKeyboardController(ABC):
     """Абстрактный базовый класс для управления клавиатурой"""
 
+    # Фиксированный набор полей: без __dict__ у каждого экземпляра
+    __slots__ = ('visualizer', 'typed_text', 'max_text_length', 'caps_lock_on', 'shift_pressed',
+                 'key_mapping', 'held_keys',
+                 'completion', 'layout_detector', 'input_queue')
+
     def __init__(self, visualizer: BaseKeyboardVisualizer):
         """
         Инициализация базового контроллера клавиатуры
@@ -33,8 +50,15 @@ class BaseKeyboardController(ABC):
         self.visualizer = visualizer
         # Инициализируем пустую строку для хранения набранного текста
         self.typed_text = ""
-        # Устанавливаем максимальную длину отображаемого текста (50 символов)
-        self.max_text_length = 50
+        # Устанавливаем максимальную длину отображаемого текста
+        # (50 символов для строки, намного больше для прокручиваемого дисплея;
+        # в тренажёре - весь урок и строка сверх него)
+        if UIConfig.TEXT_DISPLAY_MODE == 'tutor':
+            self.max_text_length = len(load_lesson(UIConfig.TUTOR_LESSON)) + UIConfig.LABEL_TEXT_LENGTH
+        elif UIConfig.TEXT_DISPLAY_MODE == 'scroll':
+            self.max_text_length = UIConfig.SCROLL_TEXT_LENGTH
+        else:
+            self.max_text_length = UIConfig.LABEL_TEXT_LENGTH
         # Синхронизируем состояние Caps Lock с системным при запуске
         # Используем CapsLockDetector для проверки реального состояния клавиши
         self.caps_lock_on = CapsLockDetector.is_caps_lock_on()
@@ -43,10 +67,19 @@ class BaseKeyboardController(ABC):
         # Создаём копию маппинга специальных клавиш из конфигурации
         # copy() нужен, чтобы не изменять исходный словарь
         self.key_mapping = KeyboardLayoutConfig.SPECIAL_KEY_MAPPING.copy()
-        # Время последнего нажатия backspace для защиты от двойного срабатывания
-        self.last_backspace_time = 0
-        # Время последнего нажатия space для защиты от двойного срабатывания
-        self.last_space_time = 0
+        # Удерживаемые клавиши: идентификатор клавиши -> маска её кнопок и счётчик автоповтора
+        # Нужен, чтобы отпускание гасило те же кнопки, что зажгло нажатие,
+        # даже если Shift успел изменить символ клавиши
+        self.held_keys: Dict[int, HeldKey] = {}
+        # Курсор автодополнения текущего слова (None - словаря нет)
+        self.completion: Optional[CompletionCursor] = None
+        # Проверка слов, набранных не на той раскладке (None - отключена)
+        self.layout_detector: Optional[WrongLayoutDetector] = None
+        # Очередь правок текста из потока слушателя: все правки кадра
+        # применяются одним обратным вызовом главного потока
+        self.input_queue = InputQueue(visualizer.root, self._apply_edits, visualizer.overload)
+        # Подписи клавиш сразу соответствуют состоянию Caps Lock
+        self._update_labels()
 
     @abstractmethod
     def process_character(self, char: str) -> str:
@@ -75,6 +108,9 @@ class BaseKeyboardController(ABC):
         if char is not None:
             # Обрабатываем символ с учётом языка (вызываем абстрактный метод)
             processed_char = self.process_character(char)
+            # Пробел завершает слово: проверяем, на той ли раскладке оно набрано
+            if processed_char == ' ' and self.layout_detector:
+                self._check_last_word()
             # Добавляем обработанный символ к набранному тексту
             self.typed_text += processed_char
 
@@ -84,8 +120,13 @@ class BaseKeyboardController(ABC):
                 # [-50:] берёт последние 50 символов из строки
                 self.typed_text = self.typed_text[-self.max_text_length:]
 
-            # Обновляем отображение текста в визуализаторе
-            self.visualizer.update_text_display(self.typed_text)
+            # Добавляем символ в дисплей (дисплей сам отбрасывает начало сверх предела)
+            self.visualizer.append_text(processed_char, self.typed_text)
+
+            # Продвигаем префикс автодополнения на один символ
+            if self.completion:
+                self.completion.push(processed_char)
+                self._show_completions()
 
     def handle_special_key(self, key_name: str):
         """
@@ -96,28 +137,18 @@ class BaseKeyboardController(ABC):
         """
         # Проверяем, является ли нажатая клавиша клавишей Backspace
         if key_name == 'backspace':
-            # Получаем текущее время для защиты от двойного срабатывания
-            current_time = time.time()
-            # Если прошло менее 100 миллисекунд с последнего backspace, игнорируем
-            if current_time - self.last_backspace_time < 0.1:
-                return
-            # Обновляем время последнего нажатия backspace
-            self.last_backspace_time = current_time
             # Проверяем, есть ли набранный текст для удаления
             if self.typed_text:
                 # Удаляем последний символ (срез [:-1] берёт все символы кроме последнего)
                 self.typed_text = self.typed_text[:-1]
-                # Обновляем отображение текста на экране
-                self.visualizer.update_text_display(self.typed_text)
+                # Удаляем последний символ из дисплея
+                self.visualizer.delete_text(1, self.typed_text)
+                # Возвращаем префикс автодополнения на символ назад
+                if self.completion:
+                    self.completion.pop(self.typed_text)
+                    self._show_completions()
         # Проверяем, является ли клавиша пробелом
         elif key_name == 'space':
-            # Получаем текущее время для защиты от двойного срабатывания
-            current_time = time.time()
-            # Если прошло менее 100 миллисекунд с последнего space, игнорируем
-            if current_time - self.last_space_time < 0.1:
-                return
-            # Обновляем время последнего нажатия space
-            self.last_space_time = current_time
             # Добавляем символ пробела к набранному тексту
             self.add_character(' ')
         # Проверяем, является ли клавиша Enter
@@ -126,88 +157,180 @@ class BaseKeyboardController(ABC):
             self.typed_text = ""
             # Обновляем отображение (показываем пустую строку)
             self.visualizer.update_text_display(self.typed_text)
+            # Начинаем новое слово
+            self._reset_completions()
         # Проверяем, является ли клавиша Esc
         elif key_name == 'esc':
             # Очищаем весь набранный текст
             self.typed_text = ""
             # Обновляем отображение (показываем пустую строку)
             self.visualizer.update_text_display(self.typed_text)
+            # Начинаем новое слово
+            self._reset_completions()
         # Проверяем, является ли клавиша Caps Lock
         elif key_name == 'caps_lock':
             # Синхронизируемся с системным состоянием Caps Lock вместо простого переключения
             # Это важно, т.к. пользователь мог изменить Caps Lock вне приложения
             self.caps_lock_on = CapsLockDetector.is_caps_lock_on()
+            self._update_labels()
 
-    def on_press(self, key):
+    def _apply_edits(self, edits: List[Edit]):
         """
-        Обработка события нажатия клавиши (вызывается pynput.keyboard.Listener)
+        Применение пачки правок из очереди (главный поток)
+
+        Правки применяются по порядку, правка с повторами - столько раз,
+        сколько пришло событий автоповтора; если изменений больше одного,
+        дисплей и строка подсказок перерисовываются один раз в конце пачки
 
         Args:
-            key: Объект клавиши из pynput (может быть Key или KeyCode)
+            edits: Правки в порядке поступления
         """
+        batch = len(edits) > 1 or edits[0][2] > 1
+        if batch:
+            self.visualizer.begin_batch()
         try:
-            # Пытаемся получить атрибут char (символ клавиши)
-            # Это работает для обычных символьных клавиш (a, b, 1, 2, и т.д.)
-            key_char = key.char
-            # Обрабатываем символьную клавишу
-            self._handle_character_key(key_char)
-        except AttributeError:
-            # Если у клавиши нет атрибута char - это специальная клавиша
-            # (Shift, Ctrl, Backspace, Enter, и т.д.)
-            # Конвертируем объект клавиши в строку и убираем префикс 'Key.'
-            # Например: Key.shift -> shift, Key.backspace -> backspace
-            key_name = str(key).replace('Key.', '')
-            # Обрабатываем специальную клавишу
-            self._handle_special_key_press(key_name)
-
-    def on_release(self, key):
-        """
-        Обработка события отпускания клавиши (вызывается pynput.keyboard.Listener)
+            for kind, value, count in edits:
+                for _ in range(count):
+                    if kind == 'char':
+                        self.add_character(value)
+                    else:
+                        self.handle_special_key(value)
+        finally:
+            if batch:
+                self.visualizer.end_batch(self.typed_text)
+
+    def set_completion(self, cursor: Optional[CompletionCursor]):
+        """
+        Подключение словаря автодополнения
 
         Args:
-            key: Объект клавиши из pynput
+            cursor: Курсор словаря языка контроллера (None - отключить подсказки)
         """
-        try:
-            # Конвертируем объект клавиши в строку и убираем префикс 'Key.'
-            key_name = str(key).replace('Key.', '')
-            # Проверяем, является ли отпущенная клавиша клавишей Shift (левой или правой)
-            if key_name in ['shift', 'shift_r']:
-                # Устанавливаем флаг Shift в False (клавиша отпущена)
-                self.shift_pressed = False
-        except AttributeError:
-            # Игнорируем любые ошибки при обработке отпускания клавиши
-            pass
+        self.completion = cursor
+        self._update_suggestion_bar_state()
 
-    @abstractmethod
-    def _handle_character_key(self, key_char: str):
+    def set_layout_detector(self, detector: Optional[WrongLayoutDetector]):
         """
-        Обработка символьной клавиши (абстрактный метод)
+        Подключение проверки раскладки слов
 
-        Этот метод должен быть реализован в классах-наследниках
-        для обработки обычных символьных клавиш
+        Args:
+            detector: Детектор для языка контроллера (None - отключить проверку)
+        """
+        self.layout_detector = detector
+        self._update_suggestion_bar_state()
+
+    def _update_suggestion_bar_state(self):
+        """Строка подсказок нужна, если есть автодополнение или проверка раскладки"""
+        self.visualizer.completions_enabled = (self.completion is not None
+                                               or self.layout_detector is not None)
+
+    def _check_last_word(self):
+        """
+        Проверка законченного слова на другой раскладке
+
+        В режиме 'convert' слово заменяется в тексте, в режиме 'flag' только
+        показывается исправление; в обоих режимах исправление видно в строке подсказок
+        """
+        word = self.layout_detector.last_word(self.typed_text)
+        converted = self.layout_detector.check(word) if word else None
+        if converted is None:
+            self.visualizer.show_layout_hint()
+            return
+        self.visualizer.show_layout_hint(word, converted)
+        if UIConfig.WRONG_LAYOUT_MODE == 'convert':
+            # Заменяем слово удалением и вставкой в конце (без перерисовки всего текста)
+            self.typed_text = self.typed_text[:-len(word)]
+            self.visualizer.delete_text(len(word), self.typed_text)
+            self.typed_text += converted
+            self.visualizer.append_text(converted, self.typed_text)
+
+    def _show_completions(self):
+        """Передача подсказок текущего префикса визуализатору"""
+        self.visualizer.show_completions(self.completion.completions())
+
+    def _reset_completions(self):
+        """Сброс префикса автодополнения (текст очищен)"""
+        if self.completion:
+            self.completion.reset()
+            self._show_completions()
+
+    def on_press(self, event: KeyEvent):
+        """
+        Обработка события нажатия клавиши (поток слушателя)
+
+        Автоповтор удерживаемой клавиши (флаг FLAG_REPEAT) не меняет
+        подсветку: увеличивается счётчик повторов, а правка текста сливается
+        с предыдущей правкой той же клавиши, если та ещё в очереди
 
         Args:
-            key_char: Символ нажатой клавиши
+            event: Событие нажатия
+        """
+        # Состояние Shift приходит в самом событии (левый и правый Shift)
+        self.shift_pressed = bool(event.mods & MOD_SHIFT)
+        self._update_labels()
+        # Автоповтор клавиши, нажатие которой видел этот контроллер
+        held = self.held_keys.get(event.key_id) if event.flags & FLAG_REPEAT else None
+        if held is not None:
+            held.repeats += 1
+        key_char = event.char
+        if key_char is None:
+            key_name = event.name
+            # У некоторых клавиш (мультимедийных) нет ни символа, ни названия
+            if key_name is None:
+                return
+            # Отмечаем клавишу нажатой в битовой карте визуализатора
+            if held is None:
+                self._press_visual(event, key_name)
+            # Ставим обработку специальной клавиши в очередь правок главного потока
+            self.input_queue.put('special', key_name, held is not None)
+            return
+
+        # Отмечаем клавишу нажатой (с символом, который есть на этой раскладке)
+        # и показываем, что она ввела бы на других раскладках
+        if held is None:
+            highlight_char = self._get_highlight_char(key_char)
+            self._press_visual(event, highlight_char)
+            self.visualizer.show_preview(highlight_char)
+        # Ставим добавление символа в очередь правок главного потока
+        # (символ обрабатывается process_character при применении правки)
+        self.input_queue.put('char', key_char, held is not None)
+
+    def on_release(self, event: KeyEvent):
+        """
+        Обработка события отпускания клавиши (поток слушателя)
+
+        Args:
+            event: Событие отпускания
         """
-        pass
+        self.shift_pressed = bool(event.mods & MOD_SHIFT)
+        self._update_labels()
+        # Гасим кнопки, которые были зажжены нажатием этой клавиши
+        held = self.held_keys.pop(event.key_id, None)
+        if held is not None and held.mask:
+            self.visualizer.release_keys(held.mask)
 
-    def _handle_special_key_press(self, key_name: str):
+    def _press_visual(self, event: KeyEvent, key_name: str):
         """
-        Обработка нажатия специальной клавиши
+        Отметка клавиши нажатой в битовой карте визуализатора
 
         Args:
-            key_name: Название специальной клавиши
+            event: Событие нажатия
+            key_name: Символ или название клавиши на виртуальной клавиатуре
         """
-        # Проверяем, является ли клавиша клавишей Shift (левой или правой)
-        if key_name in ['shift', 'shift_r']:
-            # Устанавливаем флаг Shift в True (клавиша нажата)
-            self.shift_pressed = True
-        # Планируем подсветку клавиши в главном потоке GUI
-        # after(0, ...) выполняет функцию в главном потоке как можно скорее
-        # lambda нужна для отложенного вызова с параметрами
-        self.visualizer.root.after(0, lambda: self.visualizer.highlight_key(key_name, self.key_mapping))
-        # Планируем обработку специальной клавиши в главном потоке
-        self.visualizer.root.after(0, lambda: self.handle_special_key(key_name))
+        # Запоминаем маску, чтобы отпускание погасило именно эти кнопки
+        self.held_keys[event.key_id] = HeldKey(self.visualizer.press_key(key_name, self.key_mapping))
+
+    def _get_highlight_char(self, key_char: str) -> str:
+        """
+        Символ, под которым клавиша подписана на виртуальной клавиатуре
+
+        Args:
+            key_char: Символ нажатой клавиши
+
+        Returns:
+            str: Символ для поиска кнопки (по умолчанию - сам символ)
+        """
+        return key_char
 
     def get_typed_text(self) -> str:
         """
@@ -228,6 +351,10 @@ class BaseKeyboardController(ABC):
         """
         # Сохраняем переданный текст
         self.typed_text = text
+        # Восстанавливаем префикс автодополнения по последнему слову текста
+        if self.completion:
+            self.completion.sync(text)
+            self._show_completions()
         # Проверяем, существует ли визуализатор и его текстовое поле
         if self.visualizer and self.visualizer.text_display:
             try:
@@ -246,11 +373,18 @@ class BaseKeyboardController(ABC):
         """
         # Обновляем состояние Caps Lock из системы через CapsLockDetector
         self.caps_lock_on = CapsLockDetector.is_caps_lock_on()
+        self._update_labels()
+
+    def _update_labels(self):
+        """Передача визуализатору состояния подписей клавиш (Shift и Caps Lock)"""
+        self.visualizer.set_label_state(label_state(self.shift_pressed, self.caps_lock_on))
 
 
 class EnglishKeyboardController(BaseKeyboardController):
     """Контроллер английской клавиатуры"""
 
+    __slots__ = ()
+
     def __init__(self, visualizer: BaseKeyboardVisualizer):
         """
         Инициализация контроллера английской клавиатуры
@@ -260,9 +394,6 @@ class EnglishKeyboardController(BaseKeyboardController):
         """
         # Вызываем конструктор базового класса для инициализации общих полей
         super().__init__(visualizer)
-        # Создаём словарь для хранения времени последнего нажатия каждой клавиши
-        # Используется для защиты от дублирования символов при быстром нажатии
-        self.last_key_time: Dict[str, float] = {}
 
     def process_character(self, char: str) -> str:
         """
@@ -290,37 +421,12 @@ class EnglishKeyboardController(BaseKeyboardController):
         # Для небуквенных символов (цифры, знаки) возвращаем без изменений
         return char
 
-    def _handle_character_key(self, key_char: str):
-        """
-        Обработка нажатия символьной клавиши с защитой от дублирования
-
-        Args:
-            key_char: Символ нажатой клавиши
-        """
-        # Получаем текущее время в секундах с начала эпохи Unix
-        current_time = time.time()
-        # Проверяем, нажималась ли эта клавиша ранее
-        if key_char in self.last_key_time:
-            # Вычисляем разницу во времени между текущим и предыдущим нажатием
-            time_diff = current_time - self.last_key_time[key_char]
-            # Если прошло менее 50 миллисекунд (0.05 секунды)
-            if time_diff < 0.05:
-                # Игнорируем это нажатие (защита от дублирования)
-                return
-
-        # Сохраняем время текущего нажатия для этой клавиши
-        self.last_key_time[key_char] = current_time
-
-        # Планируем подсветку клавиши в главном потоке GUI
-        # after(0, ...) выполняет функцию в главном потоке как можно скорее
-        self.visualizer.root.after(0, lambda: self.visualizer.highlight_key(key_char, self.key_mapping))
-        # Планируем добавление символа к тексту в главном потоке
-        self.visualizer.root.after(0, lambda: self.add_character(key_char))
-
 
 class RussianKeyboardController(BaseKeyboardController):
     """Контроллер русской клавиатуры"""
 
+    __slots__ = ('en_to_ru_map',)
+
     def __init__(self, visualizer: BaseKeyboardVisualizer):
         """
         Инициализация контроллера русской клавиатуры
@@ -330,9 +436,6 @@ class RussianKeyboardController(BaseKeyboardController):
         """
         # Вызываем конструктор базового класса для инициализации общих полей
         super().__init__(visualizer)
-        # Создаём словарь для хранения времени последнего нажатия каждой клавиши
-        # Используется для защиты от дублирования символов при быстром нажатии
-        self.last_key_time: Dict[str, float] = {}
         # Получаем карту преобразования английских символов в русские из конфигурации
         self.en_to_ru_map = RussianLayoutConfig.EN_TO_RU_MAP
 
@@ -366,28 +469,16 @@ class RussianKeyboardController(BaseKeyboardController):
         # Если символа нет в карте (например, цифры или знаки), возвращаем как есть
         return char
 
-    def _handle_character_key(self, key_char: str):
+    def _get_highlight_char(self, key_char: str) -> str:
         """
-        Обработка нажатия символьной клавиши с защитой от дублирования
+        Конвертация английского символа в русский для подсветки
 
         Args:
-            key_char: Символ нажатой клавиши
-        """
-        # Получаем текущее время в секундах с начала эпохи Unix
-        current_time = time.time()
-        # Проверяем, нажималась ли эта клавиша ранее
-        if key_char in self.last_key_time:
-            # Вычисляем разницу во времени между текущим и предыдущим нажатием
-            time_diff = current_time - self.last_key_time[key_char]
-            # Если прошло менее 50 миллисекунд (0.05 секунды)
-            if time_diff < 0.05:
-                # Игнорируем это нажатие (защита от дублирования)
-                return
-
-        # Сохраняем время текущего нажатия для этой клавиши
-        self.last_key_time[key_char] = current_time
+            key_char: Символ нажатой клавиши (английский)
 
-        # Для подсветки нужно конвертировать английский символ в русский
+        Returns:
+            str: Русский символ с учётом Caps Lock и Shift
+        """
         # Начинаем с исходного английского символа
         highlight_char = key_char
         # Проверяем, является ли символ буквой
@@ -404,18 +495,4 @@ class RussianKeyboardController(BaseKeyboardController):
         if highlight_char in self.en_to_ru_map:
             # Заменяем на соответствующий русский символ
             highlight_char = self.en_to_ru_map[highlight_char]
-
-        # Используем closure (замыкание) для захвата значений переменных
-        # Это нужно, т.к. lambda будет выполняться позже, и значения могут измениться
-        def do_highlight(hc=highlight_char):
-            # Подсвечиваем русский символ на виртуальной клавиатуре
-            self.visualizer.highlight_key(hc, self.key_mapping)
-
-        def do_add(kc=key_char):
-            # Добавляем символ к набранному тексту (будет сконвертирован в process_character)
-            self.add_character(kc)
-
-        # Планируем подсветку клавиши в главном потоке GUI
-        self.visualizer.root.after(0, do_highlight)
-        # Планируем добавление символа к тексту в главном потоке
-        self.visualizer.root.after(0, do_add)
\ No newline at end of file
+        return highlight_char
@@ -0,0 +1,189 @@
+"""
+Модуль пакетного перевода текста между раскладками
+Переводит файлы любого размера или stdin, например EN -> RU ("ghbdtn" -> "привет")
+
+Текст читается кусками фиксированного размера и никогда не загружается
+целиком. Перевод посимвольный, поэтому куски независимы: их можно переводить
+в пуле процессов, сохраняя порядок вывода
+
+Запуск: python -m keyboard.convert --to ru [--from en] [-o выход.txt] [--jobs 4] [вход.txt]
+"""
+
+# Импортируем модуль argparse для разбора параметров командной строки
+import argparse
+# Импортируем модуль io для текстовых обёрток stdin/stdout
+import io
+# Импортируем модуль os для количества процессоров
+import os
+# Импортируем модуль sys для стандартных потоков
+import sys
+# Импортируем deque для очереди кусков, переводимых в пуле
+from collections import deque
+# Импортируем пул процессов
+from concurrent.futures import ProcessPoolExecutor
+# Импортируем типы для аннотации
+from typing import Iterator, List, Optional, TextIO
+
+# Импортируем перечисление языков
+from .config import Language
+# Импортируем таблицы перевода
+from .translation import TABLES
+
+# Размер куска по умолчанию (в символах)
+DEFAULT_CHUNK_SIZE = 1 << 20
+# Сколько кусков на процесс может одновременно находиться в пуле (ограничивает память)
+INFLIGHT_PER_JOB = 2
+
+# Таблица перевода процесса пула (задаётся инициализатором, чтобы не передавать её с каждым куском)
+_worker_table: List[int] = []
+
+
+def iter_chunks(stream: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Чтение потока кусками
+
+    Args:
+        stream: Текстовый поток
+        chunk_size: Размер куска в символах
+
+    Yields:
+        str: Очередной кусок текста
+
+    Raises:
+        ValueError: Если размер куска не положительный
+    """
+    if chunk_size <= 0:
+        raise ValueError(f"Chunk size must be positive: {chunk_size}")
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _init_worker(table: List[int]):
+    """Инициализация процесса пула: сохранение таблицы перевода"""
+    global _worker_table
+    _worker_table = table
+
+
+def _translate_chunk(chunk: str) -> str:
+    """Перевод куска в процессе пула"""
+    return chunk.translate(_worker_table)
+
+
+def convert_stream(src: TextIO, dst: TextIO, source: Language, target: Language,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE, jobs: int = 1) -> int:
+    """
+    Перевод потока между раскладками
+
+    Args:
+        src: Входной текстовый поток
+        dst: Выходной текстовый поток
+        source: Раскладка, на которой текст был набран
+        target: Раскладка, в символы которой он переводится
+        chunk_size: Размер куска в символах
+        jobs: Количество процессов (1 - перевод в текущем процессе)
+
+    Returns:
+        int: Количество переведённых символов
+
+    Raises:
+        ValueError: Если раскладки совпадают
+    """
+    if source == target:
+        raise ValueError(f"Source and target layouts are the same: {source.value}")
+    table = TABLES[(source, target)]
+    total = 0
+    if jobs <= 1:
+        for chunk in iter_chunks(src, chunk_size):
+            dst.write(chunk.translate(table))
+            total += len(chunk)
+        return total
+
+    # Куски отправляются в пул по мере освобождения места в очереди и
+    # записываются строго в порядке отправки; пул не читает вход наперёд
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(table,)) as pool:
+        pending = deque()
+        for chunk in iter_chunks(src, chunk_size):
+            if len(pending) >= jobs * INFLIGHT_PER_JOB:
+                dst.write(pending.popleft().result())
+            pending.append(pool.submit(_translate_chunk, chunk))
+            total += len(chunk)
+        while pending:
+            dst.write(pending.popleft().result())
+    return total
+
+
+def _parse_language(value: str) -> Language:
+    """Язык из кода раскладки командной строки ('en', 'ru')"""
+    try:
+        return Language(value.upper())
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"unknown layout: {value}")
+
+
+def _positive_int(value: str) -> int:
+    """Положительное целое из командной строки (размер куска)"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not an integer: {value!r}")
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be positive: {value!r}")
+    return number
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Разбор параметров командной строки
+
+    Args:
+        argv: Параметры (None - из sys.argv)
+
+    Returns:
+        argparse.Namespace: Значения параметров (раскладка набора уже определена)
+    """
+    parser = argparse.ArgumentParser(prog='python -m keyboard.convert',
+                                     description="Перевод текста между раскладками EN и RU")
+    parser.add_argument('input', nargs='?', help="входной файл (по умолчанию stdin)")
+    parser.add_argument('-o', '--output', help="выходной файл (по умолчанию stdout)")
+    parser.add_argument('--from', dest='source', type=_parse_language,
+                        help="раскладка набора: en или ru (по умолчанию - не целевая)")
+    parser.add_argument('--to', dest='target', type=_parse_language, required=True,
+                        help="целевая раскладка: en или ru")
+    parser.add_argument('--chunk-size', type=_positive_int, default=DEFAULT_CHUNK_SIZE,
+                        help="размер куска в символах")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help=f"количество процессов (0 - по числу процессоров, {os.cpu_count()})")
+    parser.add_argument('--encoding', default='utf-8', help="кодировка входа и выхода")
+    args = parser.parse_args(argv)
+    if args.source is None:
+        args.source = Language.RUSSIAN if args.target == Language.ENGLISH else Language.ENGLISH
+    if args.source == args.target:
+        parser.error(f"--from and --to are the same layout: {args.source.value.lower()}")
+    return args
+
+
+def main(argv: Optional[List[str]] = None):
+    """Точка входа командной строки"""
+    args = parse_args(argv)
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+    # newline='' сохраняет переводы строк входа без изменений
+    src = (open(args.input, encoding=args.encoding, newline='') if args.input
+           else io.TextIOWrapper(sys.stdin.buffer, encoding=args.encoding, newline=''))
+    dst = (open(args.output, 'w', encoding=args.encoding, newline='') if args.output
+           else io.TextIOWrapper(sys.stdout.buffer, encoding=args.encoding, newline=''))
+    try:
+        convert_stream(src, dst, args.source, args.target, args.chunk_size, jobs)
+    finally:
+        dst.flush()
+        if args.input:
+            src.close()
+        if args.output:
+            dst.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+"""
+Модуль диагностики главного потока Tk
+Содержит сторожа медленных обратных вызовов root.after и профилировщик
+главного потока, включаемый на заданное время
+"""
+
+# Импортируем cProfile для профилирования главного потока
+import cProfile
+# Импортируем модуль logging для сообщений о медленных обратных вызовах
+import logging
+# Импортируем модуль os для имени файла обратного вызова
+import os
+# Импортируем модуль time для измерения длительности
+import time
+# Импортируем модуль tkinter для аннотации типа окна
+import tkinter as tk
+# Импортируем типы для аннотации
+from typing import Callable, Optional
+
+# Журнал диагностики
+logger = logging.getLogger(__name__)
+
+
+def callback_name(func: Callable) -> str:
+    """
+    Читаемое имя обратного вызова (для лямбд - с местом определения)
+
+    Args:
+        func: Функция или метод
+
+    Returns:
+        str: Имя вида 'Класс.метод' или 'Класс.метод.<locals>.<lambda> (файл:строка)'
+    """
+    name = getattr(func, '__qualname__', None) or repr(func)
+    code = getattr(getattr(func, '__func__', func), '__code__', None)
+    if code is not None and '<' in name:
+        name += f" ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    return name
+
+
+class SlowCallbackWatchdog:
+    """
+    Сторож обратных вызовов главного цикла
+
+    Подменяет root.after и root.after_idle окна: каждый запланированный
+    обратный вызов (подсветка, add_character, switch_layout, кадры анимации)
+    выполняется через обёртку, которая измеряет его длительность и пишет
+    в журнал вызовы дольше порога
+    """
+
+    def __init__(self, root: tk.Tk, threshold_ms: float):
+        """
+        Установка сторожа
+
+        Args:
+            root: Главное окно приложения
+            threshold_ms: Порог длительности обратного вызова в миллисекундах
+        """
+        self.root = root
+        self.threshold_s = threshold_ms / 1000.0
+        # Количество медленных вызовов и самый долгий из них (мс)
+        self.slow_calls = 0
+        self.worst_ms = 0.0
+        self._after = root.after
+        self._after_idle = root.after_idle
+        # Подменяем методы экземпляра: все модули планируют вызовы через это окно
+        root.after = self.after
+        root.after_idle = self.after_idle
+
+    def after(self, ms, func: Optional[Callable] = None, *args):
+        """Замена root.after: планирование обёрнутого обратного вызова"""
+        if func is None:
+            return self._after(ms)
+        return self._after(ms, self._wrap(func), *args)
+
+    def after_idle(self, func: Callable, *args):
+        """Замена root.after_idle: планирование обёрнутого обратного вызова"""
+        return self._after_idle(self._wrap(func), *args)
+
+    def _wrap(self, func: Callable) -> Callable:
+        """Обёртка, измеряющая длительность вызова"""
+        def timed(*args):
+            start = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                elapsed = time.perf_counter() - start
+                if elapsed >= self.threshold_s:
+                    self._report(func, elapsed)
+        return timed
+
+    def _report(self, func: Callable, elapsed: float):
+        """Запись медленного вызова в журнал"""
+        elapsed_ms = elapsed * 1000.0
+        self.slow_calls += 1
+        self.worst_ms = max(self.worst_ms, elapsed_ms)
+        logger.warning("Slow Tk callback %s: %.1f ms", callback_name(func), elapsed_ms)
+
+    def uninstall(self):
+        """Восстановление исходных методов окна"""
+        self.root.after = self._after
+        self.root.after_idle = self._after_idle
+
+
+class MainThreadProfiler:
+    """
+    Профилировщик главного потока на фиксированное окно времени
+
+    cProfile профилирует поток, в котором включён, поэтому включение и
+    выключение планируются в главный поток через root.after; результат
+    сохраняется в формате pstats (python -m pstats файл)
+    """
+
+    def __init__(self, root: tk.Tk, output_path: str, duration_s: float):
+        """
+        Args:
+            root: Главное окно приложения
+            output_path: Файл pstats ('{time}' заменяется на время запуска)
+            duration_s: Длительность профилирования в секундах
+        """
+        self.root = root
+        self.output_path = output_path
+        self.duration_s = duration_s
+        self._profile: Optional[cProfile.Profile] = None
+        # Номер запуска: отложенная остановка не должна выключить следующий запуск
+        self._run = 0
+
+    @property
+    def running(self) -> bool:
+        """Идёт ли профилирование"""
+        return self._profile is not None
+
+    def toggle(self):
+        """Включение или досрочное выключение (можно вызывать из любого потока)"""
+        self.root.after(0, self._toggle)
+
+    def start(self):
+        """Включение профилирования (главный поток)"""
+        if self.running:
+            return
+        self._run += 1
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+        logger.info("Profiling main thread for %.0f s", self.duration_s)
+        self.root.after(int(self.duration_s * 1000), lambda run=self._run: self._stop_run(run))
+
+    def _stop_run(self, run: int):
+        """Остановка по истечении окна, если запуск ещё тот же"""
+        if run == self._run:
+            self.stop()
+
+    def stop(self):
+        """Выключение профилирования и запись pstats (главный поток)"""
+        if not self.running:
+            return
+        profile, self._profile = self._profile, None
+        profile.disable()
+        path = self.output_path.replace('{time}', time.strftime('%Y%m%d-%H%M%S'))
+        profile.dump_stats(path)
+        logger.info("Profile written to %s", path)
+
+    def _toggle(self):
+        """Переключение в главном потоке"""
+        if self.running:
+            self.stop()
+        else:
+            self.start()
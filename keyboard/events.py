@@ -0,0 +1,309 @@
+"""
+Модуль событий клавиатуры
+Содержит компактную запись KeyEvent, в которую на границе слушателя
+превращается каждое событие ОС, и её двоичный формат
+
+Дальше границы слушателя (контроллеры, менеджер, запись сеанса, макросы,
+плагины) объекты pynput не передаются: вид клавиши задаётся флагами,
+символ и название - целым кодом, модификаторы - битовой маской
+"""
+
+# Импортируем модуль struct для двоичной упаковки событий
+import struct
+# Импортируем модуль sys для определения платформы
+import sys
+# Импортируем модуль time для меток времени
+import time
+# Импортируем lru_cache для однократного построения таблицы специальных клавиш
+from functools import lru_cache
+# Импортируем типы для аннотации
+from typing import Dict, Optional, Tuple
+
+# Импортируем конфигурации раскладок (пары символов клавиш 'a | b')
+from .config import EnglishLayoutConfig, RussianLayoutConfig
+
+# Формат записи события (20 байт, little-endian):
+# флаги (B), модификаторы (B), выравнивание (2x), код клавиши (I), виртуальный код (i),
+# метка времени time.monotonic_ns (q)
+EVENT_STRUCT = struct.Struct('<BBxxIiq')
+# Флаг: клавиша нажата (иначе отпущена)
+FLAG_PRESSED = 0x01
+# Флаг: символьная клавиша (код - номер символа Unicode)
+FLAG_CHAR = 0x02
+# Флаг: специальная клавиша (код - номер в таблице специальных клавиш)
+# Без обоих флагов клавиша задана только виртуальным кодом (мультимедийные клавиши)
+FLAG_SPECIAL = 0x04
+# Флаг: автоповтор ОС (нажатие клавиши, которая уже нажата и не отпущена)
+FLAG_REPEAT = 0x08
+# Флаг: виртуальный код - keysym X11, который зависит от Shift ('1' и '!' - разные
+# keysym); символьную клавишу определяет символ без Shift, а не виртуальный код
+FLAG_KEYSYM = 0x10
+# Значение виртуального кода, если он неизвестен
+NO_VK = -1
+
+# Биты модификаторов (состояние после события)
+MOD_CTRL = 1
+MOD_ALT = 2
+MOD_SHIFT = 4
+MOD_WIN = 8
+# Названия специальных клавиш-модификаторов pynput -> бит
+MODIFIER_KEYS = {
+    'ctrl': MOD_CTRL, 'ctrl_l': MOD_CTRL, 'ctrl_r': MOD_CTRL,
+    'alt': MOD_ALT, 'alt_l': MOD_ALT, 'alt_r': MOD_ALT, 'alt_gr': MOD_ALT,
+    'shift': MOD_SHIFT, 'shift_l': MOD_SHIFT, 'shift_r': MOD_SHIFT,
+    'cmd': MOD_WIN, 'cmd_l': MOD_WIN, 'cmd_r': MOD_WIN,
+}
+# Смещение идентификатора специальной клавиши без виртуального кода (не пересекается с vk)
+SPECIAL_ID_BASE = 1 << 32
+# Виртуальный код pynput обозначает физическую клавишу (VK Windows, keycode macOS);
+# в X11 это keysym символа с учётом Shift
+PHYSICAL_VK = sys.platform in ('win32', 'darwin')
+
+
+def _shift_pairs():
+    """Пары (символ без Shift, символ с Shift) небуквенных клавиш всех раскладок; английская - первая"""
+    for layout in (EnglishLayoutConfig.LAYOUT, RussianLayoutConfig.LAYOUT):
+        for row in layout:
+            for key in row:
+                if ' | ' in key:
+                    base, shifted = key.split(' | ')
+                    if not base.isalpha():
+                        yield base, shifted
+
+
+def _build_shift_fold() -> Dict[str, str]:
+    """
+    Символ с Shift -> символ той же клавиши без Shift
+
+    Символы, которые на какой-либо раскладке набираются без Shift (',' и
+    ';' на английской), не сворачиваются: иначе две разные клавиши одной
+    раскладки получили бы один идентификатор. Символ берётся из первой
+    раскладки, где он есть ('"' - клавиша кавычки, а не '2')
+    """
+    pairs = list(_shift_pairs())
+    bases = {base for base, _ in pairs}
+    fold = {}
+    for base, shifted in pairs:
+        if shifted not in bases:
+            fold.setdefault(shifted, base)
+    return fold
+
+
+# Символ с Shift -> символ той же клавиши без Shift
+SHIFT_FOLD: Dict[str, str] = _build_shift_fold()
+
+
+def fold_char(char: str) -> str:
+    """Символ клавиши без Shift и Caps Lock ('!' -> '1', 'T' -> 't')"""
+    return SHIFT_FOLD.get(char) or char.lower()[0]
+
+
+def _build_alternatives() -> Dict[int, Tuple[int, ...]]:
+    """
+    Идентификатор символьной клавиши -> идентификаторы, под которыми та же
+    клавиша видна на другой раскладке при другом состоянии Shift
+
+    Нужны в X11: клавиша, нажатая с Shift на русской раскладке ('"' на '2'),
+    отпускается уже без Shift как '2'
+    """
+    alternatives: Dict[int, set] = {}
+    for base, shifted in _shift_pairs():
+        base_id, shifted_id = -ord(fold_char(base)), -ord(fold_char(shifted))
+        if base_id != shifted_id:
+            alternatives.setdefault(base_id, set()).add(shifted_id)
+            alternatives.setdefault(shifted_id, set()).add(base_id)
+    return {key_id: tuple(sorted(ids)) for key_id, ids in alternatives.items()}
+
+
+# Идентификатор клавиши -> идентификаторы той же клавиши на других раскладках
+KEY_ID_ALTERNATIVES: Dict[int, Tuple[int, ...]] = _build_alternatives()
+
+
+@lru_cache(maxsize=None)
+def special_key_names() -> Tuple[str, ...]:
+    """
+    Таблица названий специальных клавиш pynput
+
+    Порядок членов перечисления Key одинаков во всех процессах одной
+    системы, поэтому в записи хранится только номер названия
+
+    Returns:
+        Tuple[str, ...]: Названия членов keyboard.Key
+    """
+    from pynput import keyboard
+    return tuple(keyboard.Key.__members__)
+
+
+@lru_cache(maxsize=None)
+def special_key_codes() -> Dict[str, int]:
+    """Название специальной клавиши -> её код (обратная таблица special_key_names)"""
+    return {name: code for code, name in enumerate(special_key_names())}
+
+
+class KeyEvent:
+    """
+    Событие клавиатуры
+
+    Символ и название специальной клавиши не хранятся отдельно, а
+    вычисляются по коду: запись - пять целых чисел
+    """
+
+    __slots__ = ('flags', 'mods', 'code', 'vk', 'time_ns')
+
+    def __init__(self, flags: int, mods: int, code: int, vk: int, time_ns: int):
+        """
+        Args:
+            flags: Флаги FLAG_*
+            mods: Биты модификаторов MOD_* после события
+            code: Номер символа Unicode или номер специальной клавиши
+            vk: Виртуальный код (NO_VK - неизвестен)
+            time_ns: Метка времени time.monotonic_ns
+        """
+        self.flags = flags
+        self.mods = mods
+        self.code = code
+        self.vk = vk
+        self.time_ns = time_ns
+
+    @property
+    def pressed(self) -> bool:
+        """Нажатие (иначе отпускание)"""
+        return bool(self.flags & FLAG_PRESSED)
+
+    @property
+    def repeat(self) -> bool:
+        """Автоповтор удерживаемой клавиши (а не новое нажатие)"""
+        return bool(self.flags & FLAG_REPEAT)
+
+    @property
+    def char(self) -> Optional[str]:
+        """Символ символьной клавиши (None - у клавиши нет символа)"""
+        return chr(self.code) if self.flags & FLAG_CHAR else None
+
+    @property
+    def name(self) -> Optional[str]:
+        """Название специальной клавиши pynput (None - не специальная клавиша)"""
+        return special_key_names()[self.code] if self.flags & FLAG_SPECIAL else None
+
+    @property
+    def time(self) -> float:
+        """Метка времени в секундах (часы time.monotonic)"""
+        return self.time_ns / 1e9
+
+    @property
+    def key_id(self) -> int:
+        """
+        Идентификатор физической клавиши, одинаковый для нажатия и отпускания
+
+        Не зависит от Shift: Shift можно отпустить раньше клавиши ('T' -
+        нажатие, 't' - отпускание). Виртуальный код Windows и macOS - это
+        сама клавиша; без него и в X11 (FLAG_KEYSYM) символьная клавиша
+        определяется символом без Shift
+        """
+        if self.flags & FLAG_CHAR and (self.vk == NO_VK or self.flags & FLAG_KEYSYM):
+            return -ord(fold_char(chr(self.code)))
+        if self.vk != NO_VK:
+            return self.vk
+        return SPECIAL_ID_BASE + self.code
+
+    def pack(self) -> bytes:
+        """Двоичная запись фиксированного размера EVENT_STRUCT.size"""
+        return EVENT_STRUCT.pack(self.flags, self.mods, self.code, self.vk, self.time_ns)
+
+    @classmethod
+    def unpack(cls, data: bytes) -> 'KeyEvent':
+        """Событие из двоичной записи pack()"""
+        return cls(*EVENT_STRUCT.unpack(data))
+
+    @classmethod
+    def for_char(cls, char: str, pressed: bool = True, mods: int = 0) -> 'KeyEvent':
+        """Событие символьной клавиши (для синтезированного ввода)"""
+        return cls(FLAG_CHAR | (FLAG_PRESSED if pressed else 0), mods, ord(char), NO_VK,
+                   time.monotonic_ns())
+
+    @classmethod
+    def for_special(cls, name: str, pressed: bool = True, mods: int = 0) -> 'KeyEvent':
+        """Событие специальной клавиши по названию pynput (для синтезированного ввода)"""
+        return cls(FLAG_SPECIAL | (FLAG_PRESSED if pressed else 0), mods, special_key_codes()[name],
+                   NO_VK, time.monotonic_ns())
+
+    def __repr__(self) -> str:
+        key = self.char if self.flags & FLAG_CHAR else self.name or f"vk={self.vk}"
+        action = ('repeat' if self.repeat else 'press') if self.pressed else 'release'
+        return f"KeyEvent({key!r}, {action}, mods={self.mods})"
+
+
+class KeyEventNormalizer:
+    """
+    Граница слушателя: объекты клавиш pynput -> KeyEvent
+
+    Метка времени ставится первой, до любой другой работы. Нормализатор
+    помнит нажатые модификаторы, поэтому каждое событие несёт их маску, и
+    нажатые клавиши: повторное нажатие без отпускания - автоповтор ОС,
+    оно отмечается флагом FLAG_REPEAT (порог по времени не нужен, и быстрые
+    двойные буквы не теряются). Отпускание, идентификатор которого не
+    нажат, сопоставляется с той же клавишей на другой раскладке
+    (KEY_ID_ALTERNATIVES) и получает символ нажатия
+    """
+
+    __slots__ = ('mods', 'held')
+
+    def __init__(self):
+        # Нажатые модификаторы
+        self.mods = 0
+        # Идентификаторы нажатых клавиш (KeyEvent.key_id)
+        self.held = set()
+
+    def reset(self):
+        """Сброс нажатых клавиш и модификаторов (отпускания, пропущенные при перезапуске слушателя)"""
+        self.mods = 0
+        self.held.clear()
+
+    def normalize(self, key, pressed: bool) -> KeyEvent:
+        """
+        Событие по объекту клавиши pynput
+
+        Args:
+            key: Объект клавиши из pynput (Key или KeyCode)
+            pressed: True для нажатия, False для отпускания
+
+        Returns:
+            KeyEvent: Событие
+        """
+        time_ns = time.monotonic_ns()
+        flags = FLAG_PRESSED if pressed else 0
+        vk = getattr(key, 'vk', None)
+        char = getattr(key, 'char', None)
+        if char is not None:
+            flags |= FLAG_CHAR
+            code = ord(char)
+        elif hasattr(key, 'name'):
+            # Специальная клавиша (член перечисления Key)
+            flags |= FLAG_SPECIAL
+            code = special_key_codes()[key.name]
+            vk = getattr(key.value, 'vk', None)
+            bit = MODIFIER_KEYS.get(key.name)
+            if bit:
+                self.mods = self.mods | bit if pressed else self.mods & ~bit
+        else:
+            # KeyCode без символа (мультимедийные клавиши) - только виртуальный код
+            code = 0
+        if vk is None:
+            vk = NO_VK
+        elif not PHYSICAL_VK:
+            flags |= FLAG_KEYSYM
+        event = KeyEvent(flags, self.mods, code, vk, time_ns)
+        key_id = event.key_id
+        if not pressed:
+            if key_id not in self.held:
+                other = next((other for other in KEY_ID_ALTERNATIVES.get(key_id, ()) if other in self.held), None)
+                if other is not None:
+                    # Отпускание получает символ нажатия: у него тот же key_id
+                    event.code = -other
+                    key_id = other
+            self.held.discard(key_id)
+        elif key_id in self.held:
+            event.flags |= FLAG_REPEAT
+        else:
+            self.held.add(key_id)
+        return event
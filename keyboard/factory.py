@@ -9,11 +9,15 @@ import tkinter as tk
 from typing import Tuple
 
 # Импортируем перечисление языков
-from .config import Language
+from .config import Language, UIConfig
 # Импортируем базовый класс визуализатора и его реализации
 from .visualizers import BaseKeyboardVisualizer, EnglishKeyboardVisualizer, RussianKeyboardVisualizer
 # Импортируем базовый класс контроллера и его реализации
 from .controllers import BaseKeyboardController, EnglishKeyboardController, RussianKeyboardController
+# Импортируем загрузку словаря автодополнения
+from .completion import open_completion_cursor
+# Импортируем проверку раскладки слов
+from .layout_check import WrongLayoutDetector
 
 
 class KeyboardFactory:
@@ -97,5 +101,10 @@ class KeyboardFactory:
         visualizer = KeyboardFactory.create_visualizer(language, root)
         # Создаём контроллер для указанного языка, передавая ему визуализатор
         controller = KeyboardFactory.create_controller(language, visualizer)
+        # Подключаем словарь автодополнения языка (если он построен)
+        controller.set_completion(open_completion_cursor(UIConfig.COMPLETION_DIR, language))
+        # Подключаем проверку слов, набранных не на той раскладке
+        if UIConfig.WRONG_LAYOUT_MODE != 'off':
+            controller.set_layout_detector(WrongLayoutDetector(language))
         # Возвращаем кортеж из визуализатора и контроллера
         return visualizer, controller
\ No newline at end of file
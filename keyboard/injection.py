@@ -0,0 +1,269 @@
+"""
+Модуль ввода нажатий в активное приложение
+Нажатия кнопок экранной клавиатуры (щелчком мыши или касанием)
+передаются в систему через keyboard.Controller из pynput
+
+Главный поток только кладёт шаг в очередь (O(1), без системных вызовов).
+Отдельный поток забирает шаги пачками и вводит их с паузой
+1 / UIConfig.INJECT_RATE между нажатиями: частые касания и длинные
+макросы не задерживают Tk и не переполняют очередь ввода приложения
+"""
+
+# Импортируем модуль logging для итогов работы
+import logging
+# Импортируем модуль threading для потока ввода
+import threading
+# Импортируем модуль time для пауз и замера задержки
+import time
+# Импортируем deque для очереди шагов и окна последних задержек
+from collections import deque
+# Импортируем типы для аннотации
+from typing import List, Optional, Tuple
+
+# Импортируем настройки интерфейса и раскладок
+from .config import KeyboardLayoutConfig, RussianLayoutConfig, UIConfig
+# Импортируем биты модификаторов
+from .events import MOD_ALT, MOD_CTRL, MOD_SHIFT, MOD_WIN
+
+# Журнал ввода нажатий
+logger = logging.getLogger(__name__)
+
+# Подпись специальной кнопки -> название клавиши pynput (обратная SPECIAL_KEY_MAPPING;
+# для 'SHIFT', 'CTRL' и т.п. берётся левая клавиша - она идёт в маппинге первой)
+LABEL_TO_KEY = {label: name for name, label in reversed(list(KeyboardLayoutConfig.SPECIAL_KEY_MAPPING.items()))}
+# Модификаторы в порядке нажатия: бит -> название клавиши pynput
+MODIFIER_ORDER = ((MOD_CTRL, 'ctrl'), (MOD_ALT, 'alt'), (MOD_WIN, 'cmd'), (MOD_SHIFT, 'shift'))
+# Русская буква -> символ той же клавиши латинской раскладки (для сочетаний с Ctrl/Alt/Win)
+RU_TO_EN = {ru: en for en, ru in RussianLayoutConfig.EN_TO_RU_MAP.items() if ru.isalpha() and ru.islower()}
+# Модификаторы сочетаний (с ними клавиша вводится как сочетание, а не как символ)
+CHORD_MODS = MOD_CTRL | MOD_ALT | MOD_WIN
+
+# Шаг ввода: (модификаторы для нажатия, название специальной клавиши, символ, время постановки в очередь)
+InjectStep = Tuple[int, Optional[str], Optional[str], int]
+
+
+def resolve_label(label: str, mods: int, caps_lock: bool) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Клавиша для ввода по подписи кнопки
+
+    Буква учитывает Shift и Caps Lock, подпись 'a | b' с Shift даёт второй
+    символ. В сочетании с Ctrl/Alt/Win вводится строчный символ, а русская
+    буква заменяется символом той же клавиши латинской раскладки:
+    приложения распознают сочетания по латинской раскладке
+
+    Args:
+        label: Подпись кнопки (например 'A', '1 | !', 'ENTER')
+        mods: Активные модификаторы MOD_*
+        caps_lock: Включён ли Caps Lock
+
+    Returns:
+        Tuple[Optional[str], Optional[str]]: (название специальной клавиши, символ);
+        заполнено одно из полей, (None, None) - кнопку нельзя ввести
+    """
+    name = LABEL_TO_KEY.get(label)
+    if name:
+        return name, None
+    shift = bool(mods & MOD_SHIFT)
+    if ' | ' in label:
+        symbols = label.split(' | ')
+        char = symbols[1] if shift and len(symbols) > 1 else symbols[0]
+        # Подписи вида 'Ё | Ё' - буква с регистром, а не пара символов
+        if char.isalpha():
+            char = char.upper() if shift != caps_lock else char.lower()
+    elif len(label) == 1:
+        char = label.upper() if shift != caps_lock else label.lower()
+    else:
+        return None, None
+    if mods & CHORD_MODS:
+        char = char.lower()
+        char = RU_TO_EN.get(char, char)
+    return None, char
+
+
+class KeyInjector:
+    """
+    Очередь ввода нажатий с отдельным потоком
+
+    Очередь ограничена UIConfig.INJECT_QUEUE_SIZE: шаги сверх предела
+    отбрасываются и считаются. Задержка от постановки в очередь до
+    отпускания клавиши замеряется для каждого шага
+
+    Введённые нажатия возвращаются через слушатель клавиатуры как обычный
+    набор; пока идёт ввод и UIConfig.INJECT_ECHO_MS после него, injecting
+    равно True
+    """
+
+    def __init__(self, rate: float = UIConfig.INJECT_RATE, batch: int = UIConfig.INJECT_BATCH,
+                 queue_size: int = UIConfig.INJECT_QUEUE_SIZE, echo_ms: float = UIConfig.INJECT_ECHO_MS,
+                 controller=None):
+        """
+        Args:
+            rate: Наибольшее количество нажатий в секунду
+            batch: Наибольшее количество шагов, забираемых из очереди за раз
+            queue_size: Предел длины очереди
+            echo_ms: Сколько после ввода нажатия слушателя считаются эхом ввода
+            controller: Объект с методами press/release (None - keyboard.Controller из pynput)
+        """
+        self.interval_ns = int(1e9 / rate)
+        self.batch = batch
+        self.queue_size = queue_size
+        self._controller = controller
+        self._queue: deque = deque()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        # Окно эха ввода: поток вводит пачку или ввёл шаг позже, чем echo_ns назад
+        self.echo_ns = int(echo_ms * 1e6)
+        self._busy = False
+        self._echo_until_ns = 0
+        # Счётчики: введённые и отброшенные шаги, забранные пачки
+        self.injected = 0
+        self.dropped = 0
+        self.batches = 0
+        # Задержка (нс): последняя, наибольшая, сумма и окно последних замеров
+        self.last_latency_ns = 0
+        self.max_latency_ns = 0
+        self.total_latency_ns = 0
+        self.recent_latencies: deque = deque(maxlen=1024)
+
+    def put(self, mods: int, name: Optional[str], char: Optional[str]) -> bool:
+        """
+        Постановка нажатия в очередь (можно вызывать из любого потока)
+
+        Args:
+            mods: Модификаторы MOD_*, которые нужно нажать вокруг клавиши
+            name: Название специальной клавиши pynput (или None)
+            char: Символ (или None)
+
+        Returns:
+            bool: False, если очередь переполнена или закрыта и шаг отброшен
+        """
+        return self._put_steps([(mods, name, char, time.monotonic_ns())])
+
+    def put_text(self, text: str) -> bool:
+        """
+        Постановка текста в очередь одной операцией (по шагу на символ)
+
+        Args:
+            text: Текст для ввода
+
+        Returns:
+            bool: False, если текст не поместился в очередь целиком
+        """
+        now = time.monotonic_ns()
+        return self._put_steps([(0, None, char, now) for char in text])
+
+    def _put_steps(self, steps: List[InjectStep]) -> bool:
+        """Добавление шагов в очередь под одной блокировкой"""
+        with self._cond:
+            if self._closed:
+                self.dropped += len(steps)
+                return False
+            accepted = steps[:max(self.queue_size - len(self._queue), 0)]
+            self.dropped += len(steps) - len(accepted)
+            if accepted:
+                self._queue.extend(accepted)
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='key-injector', daemon=True)
+                    self._thread.start()
+                self._cond.notify()
+            return len(accepted) == len(steps)
+
+    def _run(self):
+        """Поток ввода: пачка шагов из очереди, затем шаги с паузой между нажатиями"""
+        controller, keys = self._create_controller()
+        next_ns = 0
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                queue = self._queue
+                steps = [queue.popleft() for _ in range(min(self.batch, len(queue)))]
+                self._busy = True
+            self.batches += 1
+            for step in steps:
+                if self._closed:
+                    return
+                now = time.monotonic_ns()
+                if next_ns > now:
+                    time.sleep((next_ns - now) / 1e9)
+                    now = next_ns
+                next_ns = now + self.interval_ns
+                try:
+                    self._inject(controller, keys, step)
+                except Exception:
+                    logger.exception("Injection of %r failed", step[1] or step[2])
+                    continue
+                finally:
+                    self._echo_until_ns = time.monotonic_ns() + self.echo_ns
+                latency = time.monotonic_ns() - step[3]
+                self.injected += 1
+                self.last_latency_ns = latency
+                self.total_latency_ns += latency
+                if latency > self.max_latency_ns:
+                    self.max_latency_ns = latency
+                self.recent_latencies.append(latency)
+            # Между пачками эхо закрывает окно после последнего шага
+            self._busy = False
+
+    def _create_controller(self):
+        """Контроллер ввода и перечисление специальных клавиш pynput (в потоке ввода)"""
+        from pynput import keyboard
+        controller = self._controller if self._controller is not None else keyboard.Controller()
+        return controller, keyboard.Key
+
+    @staticmethod
+    def _inject(controller, keys, step: InjectStep):
+        """
+        Ввод одного шага: модификаторы, нажатие и отпускание клавиши, отпускание модификаторов
+
+        Shift для символа без Ctrl/Alt/Win не нажимается: pynput вводит
+        заглавную букву или символ '!' сам
+        """
+        mods, name, char, _ = step
+        if char is not None and not mods & CHORD_MODS:
+            mods &= ~MOD_SHIFT
+        modifiers = [keys[key_name] for bit, key_name in MODIFIER_ORDER if mods & bit]
+        key = keys[name] if name is not None else char
+        for modifier in modifiers:
+            controller.press(modifier)
+        try:
+            controller.press(key)
+            controller.release(key)
+        finally:
+            for modifier in reversed(modifiers):
+                controller.release(modifier)
+
+    @property
+    def injecting(self) -> bool:
+        """Идёт ввод или его эхо ещё может прийти от слушателя (можно читать из любого потока)"""
+        return self._busy or time.monotonic_ns() < self._echo_until_ns
+
+    @property
+    def pending(self) -> int:
+        """Количество шагов в очереди"""
+        return len(self._queue)
+
+    def summary(self) -> str:
+        """Строка статистики: количество нажатий и задержка от постановки в очередь до ввода (для журнала)"""
+        if not self.injected:
+            return f"injected 0, dropped {self.dropped}"
+        recent = sorted(self.recent_latencies)
+        median = recent[len(recent) // 2] / 1e6
+        p99 = recent[min(len(recent) - 1, int(len(recent) * 0.99))] / 1e6
+        return (f"injected {self.injected} in {self.batches} batches, dropped {self.dropped}; "
+                f"latency mean {self.total_latency_ns / self.injected / 1e6:.2f} ms, "
+                f"median {median:.2f} ms, p99 {p99:.2f} ms, max {self.max_latency_ns / 1e6:.2f} ms")
+
+    def close(self):
+        """Остановка потока ввода; шаги, оставшиеся в очереди, отбрасываются"""
+        with self._cond:
+            self._closed = True
+            self.dropped += len(self._queue)
+            self._queue.clear()
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            logger.info("Key injection: %s", self.summary())
@@ -0,0 +1,253 @@
+"""
+Модуль атласа изображений клавиш
+Содержит отрисовку клавиш в изображения PhotoImage и кнопку, у которой
+подсветка - замена изображения, а не перекраска tk.Label
+
+Перекраска tk.Label заставляет Tk заново измерять шрифт и раскладывать
+текст; замена изображения этого не требует. Изображения рисуются через
+Pillow (необязательная зависимость) и хранятся в общем атласе с ключом
+(раскладка, клавиша, размер, состояние) и вытеснением давно не
+использованных, поэтому изображения старых размеров окна не копятся
+"""
+
+# Импортируем модуль tkinter для кнопки-изображения
+import tkinter as tk
+# Импортируем OrderedDict для порядка использования изображений (LRU)
+from collections import OrderedDict
+# Импортируем lru_cache для общего атласа и загруженных шрифтов
+from functools import lru_cache
+# Импортируем типы для аннотации
+from typing import Optional, Tuple
+
+# Импортируем конфигурацию UI (цвета, шрифт, размер атласа)
+from .config import UIConfig
+
+# Pillow нужен только для режима изображений; без него клавиши - обычные tk.Label
+try:
+    from PIL import Image, ImageDraw, ImageFont, ImageTk
+except ImportError:
+    Image = None
+
+# Доступен ли режим изображений
+IMAGES_AVAILABLE = Image is not None
+
+# Ширина рельефной рамки клавиши (как borderwidth=2 у tk.Label)
+BORDER_WIDTH = 2
+# Файлы шрифтов по порядку предпочтения (жирный Arial как у tk.Label, затем DejaVu с кириллицей)
+FONT_FILES = ('arialbd.ttf', 'Arial Bold.ttf', 'DejaVuSans-Bold.ttf')
+
+# Размер изображения: (ширина, высота, кегль в пикселях)
+CapSize = Tuple[int, int, int]
+# Состояние клавиши: (цвет фона, цвет текста)
+CapState = Tuple[str, str]
+
+
+def _shade(color: str, factor: float) -> str:
+    """
+    Осветление (factor > 1) или затемнение (factor < 1) цвета для рамки
+
+    Args:
+        color: Цвет в формате HEX
+        factor: Множитель яркости
+
+    Returns:
+        str: Цвет в формате HEX
+    """
+    channels = (int(color[i:i + 2], 16) for i in (1, 3, 5))
+    return '#%02x%02x%02x' % tuple(min(255, round(c * factor)) for c in channels)
+
+
+@lru_cache(maxsize=None)
+def _load_font(size: int):
+    """Шрифт клавиш указанного кегля (первый найденный из FONT_FILES)"""
+    for name in FONT_FILES:
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    return ImageFont.load_default(size)
+
+
+def render_key_cap(text: str, size: CapSize, state: CapState):
+    """
+    Отрисовка клавиши в изображение Pillow
+
+    Args:
+        text: Подпись клавиши
+        size: Размер изображения и кегль подписи
+        state: Цвета фона и текста
+
+    Returns:
+        PIL.Image.Image: Изображение клавиши с рельефной рамкой, как у tk.RAISED
+    """
+    width, height, font_px = size
+    bg, fg = state
+    image = Image.new('RGB', (width, height), bg)
+    draw = ImageDraw.Draw(image)
+    light, dark = _shade(bg, 1.4), _shade(bg, 0.6)
+    for i in range(BORDER_WIDTH):
+        # Светлая рамка сверху и слева, тёмная снизу и справа
+        draw.line([(i, height - 1 - i), (i, i), (width - 1 - i, i)], fill=light)
+        draw.line([(i + 1, height - 1 - i), (width - 1 - i, height - 1 - i), (width - 1 - i, i + 1)], fill=dark)
+    draw.text((width / 2, height / 2), text, fill=fg, font=_load_font(font_px), anchor='mm')
+    return image
+
+
+class KeyCapAtlas:
+    """
+    Атлас изображений клавиш с вытеснением давно не использованных (LRU)
+
+    Ключ изображения - (раскладка, клавиша, размер, состояние). Вытесненное
+    изображение, которое ещё показывает кнопка, остаётся живым, пока кнопка
+    держит на него ссылку
+    """
+
+    __slots__ = ('capacity', '_images', 'hits', 'misses', 'evictions')
+
+    def __init__(self, capacity: int):
+        """
+        Args:
+            capacity: Максимальное количество изображений в атласе
+        """
+        self.capacity = capacity
+        self._images: 'OrderedDict[tuple, ImageTk.PhotoImage]' = OrderedDict()
+        # Счётчики обращений (для настройки размера атласа)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, layout: str, key: str, size: CapSize, state: CapState):
+        """
+        Изображение клавиши (отрисовывается при первом обращении)
+
+        Args:
+            layout: Раскладка (подписи клавиш разных раскладок различаются)
+            key: Подпись клавиши
+            size: Размер изображения и кегль подписи
+            state: Цвета фона и текста
+
+        Returns:
+            ImageTk.PhotoImage: Изображение клавиши
+        """
+        cache_key = (layout, key, size, state)
+        image = self._images.get(cache_key)
+        if image is not None:
+            self._images.move_to_end(cache_key)
+            self.hits += 1
+            return image
+        self.misses += 1
+        image = ImageTk.PhotoImage(render_key_cap(key, size, state))
+        self._images[cache_key] = image
+        if len(self._images) > self.capacity:
+            self._images.popitem(last=False)
+            self.evictions += 1
+        return image
+
+    def __len__(self) -> int:
+        """Количество изображений в атласе"""
+        return len(self._images)
+
+
+@lru_cache(maxsize=1)
+def shared_atlas() -> KeyCapAtlas:
+    """Общий атлас всех раскладок (создаётся при первой кнопке-изображении)"""
+    return KeyCapAtlas(UIConfig.KEYCAP_CACHE_SIZE)
+
+
+class KeyCap(tk.Label):
+    """
+    Кнопка клавиатуры, подсветка которой - замена изображения
+
+    До первого размещения кнопка - обычная подпись (её естественный размер
+    задаёт раскладку окна). Когда Tk сообщает размер кнопки, для него
+    рисуются основные состояния (обычное, нажатое, приглушённое), и дальше
+    кнопка показывает только изображения из атласа
+    """
+
+    def __init__(self, master: tk.Widget, layout: str, text: str, bg: str, fg: str, font_size: int):
+        """
+        Args:
+            master: Родительский виджет
+            layout: Раскладка (часть ключа атласа)
+            text: Подпись клавиши
+            bg: Базовый цвет клавиши
+            fg: Цвет подписи
+            font_size: Кегль подписи в пунктах
+        """
+        super().__init__(master, text=text, relief=tk.RAISED, bg=bg, fg=fg,
+                         font=(UIConfig.FONT_FAMILY, font_size, 'bold'), borderwidth=BORDER_WIDTH)
+        self.atlas = shared_atlas()
+        self.layout = layout
+        self.key_text = text
+        self.font_px = round(font_size * self.winfo_fpixels('1p'))
+        # Базовый цвет клавиши (меняется со сменой темы)
+        self.base_color = bg
+        # Текущие цвета и размер изображения (None - кнопка ещё не размещена)
+        self.colors: CapState = (bg, fg)
+        self.cap_size: Optional[CapSize] = None
+        # Показываемое изображение (ссылка не даёт Tk удалить вытесненное из атласа изображение)
+        self._image = None
+        self.bind('<Configure>', self._on_configure)
+
+    def paint(self, bg: str, fg: str):
+        """
+        Показ клавиши в указанных цветах (вызывается часами анимации)
+
+        Args:
+            bg: Цвет фона
+            fg: Цвет текста
+        """
+        self.colors = (bg, fg)
+        if self.cap_size is None:
+            # Размер ещё неизвестен - перекрашиваем подпись
+            self.configure(bg=bg, fg=fg)
+            return
+        self._show(self.atlas.get(self.layout, self.key_text, self.cap_size, self.colors))
+
+    def set_text(self, text: str):
+        """
+        Новая подпись (смена Shift или Caps Lock)
+
+        Args:
+            text: Подпись клавиши
+        """
+        self.key_text = text
+        if self.cap_size is None:
+            self.configure(text=text)
+            return
+        self._show(self.atlas.get(self.layout, text, self.cap_size, self.colors))
+
+    def set_base_color(self, color: str):
+        """
+        Новый базовый цвет (смена темы): основные состояния будут нарисованы заново
+
+        Args:
+            color: Базовый цвет клавиши
+        """
+        self.base_color = color
+        if self.cap_size is not None:
+            self._prerender(self.cap_size)
+
+    def _prerender(self, size: CapSize):
+        """Отрисовка основных состояний (обычное, приглушённое, нажатое) для размера"""
+        for state in ((self.base_color, UIConfig.FG_COLOR), (UIConfig.KEY_DIM_COLOR, UIConfig.FG_COLOR),
+                      (UIConfig.KEY_PRESSED_COLOR, UIConfig.FG_BLACK)):
+            self.atlas.get(self.layout, self.key_text, size, state)
+
+    def _show(self, image):
+        """Замена изображения (без обращения к Tk, если оно не изменилось)"""
+        if image is not self._image:
+            self._image = image
+            self.configure(image=image)
+
+    def _on_configure(self, event: tk.Event):
+        """Новый размер кнопки: отрисовка основных состояний и переход на изображения"""
+        size = (event.width, event.height, self.font_px)
+        if size == self.cap_size or event.width <= 1 or event.height <= 1:
+            return
+        if self.cap_size is None:
+            # Изображение занимает весь размер кнопки: рамку рисует само изображение
+            self.configure(borderwidth=0, padx=0, pady=0, highlightthickness=0)
+        self.cap_size = size
+        self._prerender(size)
+        self._show(self.atlas.get(self.layout, self.key_text, size, self.colors))
@@ -0,0 +1,100 @@
+"""
+Модуль подписей клавиш
+Кнопка показывает только тот символ, который клавиша введёт при текущих
+Shift и Caps Lock, как на настоящей экранной клавиатуре
+
+Подписи всех кнопок раскладки вычисляются один раз для каждого состояния
+модификаторов вместе со списками кнопок, подпись которых меняется при
+переходе между состояниями. Нажатие Shift - одна перерисовка только этих
+кнопок, без разбора подписей 'a | b'
+"""
+
+# Импортируем lru_cache для однократного построения таблиц раскладки
+from functools import lru_cache
+# Импортируем типы для аннотации
+from typing import Sequence, Tuple
+
+# Биты состояния подписей: Shift и Caps Lock
+LABEL_SHIFT = 1
+LABEL_CAPS = 2
+# Количество состояний подписей
+LABEL_STATES = 4
+
+
+def label_state(shift: bool, caps_lock: bool) -> int:
+    """
+    Номер состояния подписей
+
+    Args:
+        shift: Нажат ли Shift
+        caps_lock: Включён ли Caps Lock
+
+    Returns:
+        int: Состояние (биты LABEL_SHIFT и LABEL_CAPS)
+    """
+    return (LABEL_SHIFT if shift else 0) | (LABEL_CAPS if caps_lock else 0)
+
+
+def key_legend(key: str, state: int) -> str:
+    """
+    Подпись кнопки в состоянии модификаторов
+
+    Буква зависит от Shift и Caps Lock (XOR), пара 'a | b' - только от
+    Shift; подписи специальных клавиш (ENTER, F1) не меняются
+
+    Args:
+        key: Подпись кнопки в раскладке ('A', '1 | !', 'Ё | Ё', 'ENTER')
+        state: Состояние подписей
+
+    Returns:
+        str: Показываемая подпись
+    """
+    shift = bool(state & LABEL_SHIFT)
+    if ' | ' in key:
+        # Разделитель - ' | ' с пробелами: сама черта бывает символом ('\\ | |')
+        symbols = key.split(' | ')
+        # Пара вида 'Ё | Ё' - буква с регистром, а не два символа
+        if not symbols[0].isalpha() or symbols[0].lower() != symbols[-1].lower():
+            return symbols[1] if shift and len(symbols) > 1 else symbols[0]
+        key = symbols[0]
+    if len(key) != 1 or not key.isalpha():
+        return key
+    return key.upper() if shift != bool(state & LABEL_CAPS) else key.lower()
+
+
+class LabelTable:
+    """
+    Подписи кнопок раскладки во всех состояниях модификаторов
+
+    labels[состояние][индекс кнопки] - подпись; changes[из][в] - индексы
+    кнопок, подпись которых отличается в двух состояниях
+    """
+
+    __slots__ = ('labels', 'changes')
+
+    def __init__(self, keys: Sequence[str]):
+        """
+        Args:
+            keys: Подписи кнопок раскладки в порядке индексов кнопок
+        """
+        self.labels: Tuple[Tuple[str, ...], ...] = tuple(
+            tuple(key_legend(key, state) for key in keys) for state in range(LABEL_STATES))
+        self.changes: Tuple[Tuple[Tuple[int, ...], ...], ...] = tuple(
+            tuple(tuple(index for index, (old, new) in enumerate(zip(self.labels[source], self.labels[target]))
+                        if old != new)
+                  for target in range(LABEL_STATES))
+            for source in range(LABEL_STATES))
+
+
+@lru_cache(maxsize=None)
+def compile_labels(layout: Tuple[Tuple[str, ...], ...]) -> LabelTable:
+    """
+    Таблица подписей раскладки (строится один раз на раскладку)
+
+    Args:
+        layout: Ряды раскладки (кортежи подписей)
+
+    Returns:
+        LabelTable: Подписи кнопок во всех состояниях
+    """
+    return LabelTable([key for row in layout for key in row])
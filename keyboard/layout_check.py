@@ -0,0 +1,79 @@
+"""
+Модуль обнаружения слов, набранных не на той раскладке
+Например, "ghbdtn" на английской раскладке вместо "привет" на русской
+"""
+
+# Импортируем типы для аннотации
+from typing import Optional
+
+# Импортируем конфигурацию UI и перечисление языков
+from .config import Language, UIConfig
+# Импортируем таблицы перевода между раскладками
+from .translation import TABLES, WORD_CHARS, other_language
+# Импортируем символьные модели языков
+from .ngram import load_model
+
+
+class WrongLayoutDetector:
+    """
+    Проверка законченного слова на обеих раскладках
+
+    Слово переводится на другую раскладку готовой таблицей str.translate,
+    обе версии оцениваются моделями n-грамм своих языков. Проверка
+    выполняется один раз на слово (при пробеле), а не на каждый символ
+    """
+
+    def __init__(self, language: Language):
+        """
+        Args:
+            language: Язык раскладки, на которой набирается текст
+        """
+        self.language = language
+        self.target = other_language(language)
+        # Таблица перевода и символы, из которых состоит слово на этой раскладке
+        self.table = TABLES[(language, self.target)]
+        self.word_chars = WORD_CHARS[language]
+        self.own_model = load_model(language)
+        self.other_model = load_model(self.target)
+        # Счётчики проверенных и исправленных слов
+        self.checked = 0
+        self.detected = 0
+
+    def last_word(self, text: str) -> str:
+        """
+        Последнее слово текста (хвост из символов раскладки)
+
+        Args:
+            text: Набранный текст
+
+        Returns:
+            str: Слово или пустая строка
+        """
+        start = len(text)
+        while start > 0 and text[start - 1] in self.word_chars:
+            start -= 1
+        return text[start:]
+
+    def check(self, word: str) -> Optional[str]:
+        """
+        Проверка слова
+
+        Args:
+            word: Слово, набранное на текущей раскладке
+
+        Returns:
+            Optional[str]: Слово на другой раскладке, если оно правдоподобнее, иначе None
+        """
+        # Знаки в конце слова оцениваются как пунктуация, а не как буквы другой раскладки
+        length = len(word)
+        while length > 0 and not word[length - 1].isalpha():
+            length -= 1
+        if length < UIConfig.WRONG_LAYOUT_MIN_LENGTH:
+            return None
+        self.checked += 1
+        converted = word.translate(self.table)
+        gain = self.other_model.score(converted[:length]) - self.own_model.score(word[:length])
+        if gain < UIConfig.WRONG_LAYOUT_MARGIN:
+            return None
+        self.detected += 1
+        return converted
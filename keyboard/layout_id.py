@@ -0,0 +1,145 @@
+"""
+Модуль определения раскладки по набираемому тексту
+Используется, когда раскладку нельзя узнать у ОС (Linux, удалённые сеансы)
+
+Каждая буквенная клавиша задаётся своей русской буквой ('f' и 'а' - одна
+клавиша). Для обоих языков заранее строится таблица логарифмов вероятностей
+биграмм клавиш: английские слова переводятся в клавиши через EN_TO_RU_MAP,
+русские - как есть. Нажатие добавляет к накопленной оценке разность двух
+чисел из таблиц, а старые нажатия постепенно забываются; раскладка
+меняется, когда оценка уверенно переходит порог
+"""
+
+# Импортируем модуль math для логарифмов
+import math
+# Импортируем array - компактную таблицу чисел
+from array import array
+# Импортируем lru_cache, чтобы таблицы строились один раз
+from functools import lru_cache
+# Импортируем типы для аннотации
+from typing import Dict, Optional
+
+# Импортируем конфигурацию UI, перечисление языков и карту раскладок
+from .config import Language, RussianLayoutConfig, UIConfig
+# Импортируем обучающие тексты
+from .ngram_data import SEED_EN, SEED_RU
+
+# Буквенные клавиши (русская буква клавиши); индекс 0 - граница слова
+KEY_LETTERS = sorted({ru.lower() for ru in RussianLayoutConfig.EN_TO_RU_MAP.values() if ru.isalpha()})
+# Количество состояний биграммы: клавиши и граница слова
+STATES = len(KEY_LETTERS) + 1
+
+
+def _build_key_index() -> Dict[str, int]:
+    """Символ (латинский или русский, любой регистр) -> индекс клавиши"""
+    index = {}
+    for en, ru in RussianLayoutConfig.EN_TO_RU_MAP.items():
+        if ru.isalpha():
+            index[en] = index[ru] = KEY_LETTERS.index(ru.lower()) + 1
+    return index
+
+
+# Символ (латинский или русский, любой регистр) -> индекс клавиши
+KEY_INDEX: Dict[str, int] = _build_key_index()
+# Русские буквы: сами по себе означают русскую раскладку
+CYRILLIC = frozenset(ru for ru in RussianLayoutConfig.EN_TO_RU_MAP.values() if ru.isalpha())
+# Сглаживание счётчиков биграмм (незнакомая пара клавиш получает конечную цену)
+SMOOTHING = 0.5
+
+
+def _bigram_table(words) -> array:
+    """
+    Таблица логарифмов вероятностей биграмм клавиш
+
+    Args:
+        words: Обучающие слова
+
+    Returns:
+        array: Плоская таблица STATES x STATES: [предыдущая * STATES + текущая]
+    """
+    counts = [0] * (STATES * STATES)
+    for word in words:
+        prev = 0
+        for char in word:
+            key = KEY_INDEX.get(char, 0)
+            counts[prev * STATES + key] += 1
+            prev = key
+        counts[prev * STATES] += 1
+    table = array('f', bytes(4 * STATES * STATES))
+    for prev in range(STATES):
+        row = counts[prev * STATES:(prev + 1) * STATES]
+        total = sum(row) + SMOOTHING * STATES
+        for key in range(STATES):
+            table[prev * STATES + key] = math.log((row[key] + SMOOTHING) / total)
+    return table
+
+
+@lru_cache(maxsize=1)
+def evidence_table() -> array:
+    """
+    Таблица свидетельств в пользу русской раскладки (строится один раз)
+
+    Returns:
+        array: log P_ru - log P_en для каждой биграммы клавиш
+    """
+    en = _bigram_table(SEED_EN.lower().split())
+    ru = _bigram_table(SEED_RU.lower().split())
+    return array('f', (r - e for r, e in zip(ru, en)))
+
+
+class LayoutIdentifier:
+    """
+    Пошаговое определение раскладки по нажатиям
+
+    Оценка > 0 - текст больше похож на русский, < 0 - на английский.
+    Раскладка меняется, когда оценка переходит порог UIConfig.LAYOUT_ID_THRESHOLD
+    в сторону другого языка
+    """
+
+    __slots__ = ('language', 'score', 'switches', '_prev', '_table')
+
+    def __init__(self, language: Language = Language.ENGLISH):
+        """
+        Args:
+            language: Начальная раскладка
+        """
+        self.language = language
+        # Накопленная оценка (с забыванием старых нажатий)
+        self.score = 0.0
+        # Количество смен раскладки
+        self.switches = 0
+        # Предыдущая клавиша (0 - начало слова)
+        self._prev = 0
+        self._table = evidence_table()
+
+    def feed(self, char: Optional[str]) -> Optional[Language]:
+        """
+        Учёт нажатия (вызывается из потока слушателя)
+
+        Args:
+            char: Символ клавиши (None - специальная клавиша)
+
+        Returns:
+            Optional[Language]: Новая раскладка, если она сменилась, иначе None
+        """
+        key = KEY_INDEX.get(char, 0) if char else 0
+        prev = self._prev
+        if not key and not prev:
+            # Между словами: пробелы и знаки подряд ничего не говорят о раскладке
+            return None
+        self._prev = key
+        score = self.score * UIConfig.LAYOUT_ID_DECAY + self._table[prev * STATES + key]
+        if char in CYRILLIC:
+            # Русская буква пришла от русской раскладки ОС - это решающее свидетельство
+            score = max(score, 0.0) + UIConfig.LAYOUT_ID_THRESHOLD
+        self.score = score
+        threshold = UIConfig.LAYOUT_ID_THRESHOLD
+        if self.language == Language.ENGLISH and score > threshold:
+            language = Language.RUSSIAN
+        elif self.language == Language.RUSSIAN and score < -threshold:
+            language = Language.ENGLISH
+        else:
+            return None
+        self.language = language
+        self.switches += 1
+        return language
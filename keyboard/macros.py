@@ -0,0 +1,298 @@
+"""
+Модуль макросов: распознавание последовательностей клавиш и сочетаний
+Например, "Ctrl+Alt+K, затем T" запускает действие
+
+Файл макросов (main.py --macros), по одному макросу в строке:
+    ctrl+alt+k t  => text:Спасибо!
+    ctrl+shift+f12 => theme
+Шаги последовательности разделяются пробелами, клавиши сочетания - '+'.
+Шаг - сочетание модификаторов (ctrl, alt, shift, win) и одной клавиши:
+символа (в нижнем регистре; символы с Shift записываются как набираются,
+например shift+!) или названия специальной клавиши pynput (f5, enter, space).
+Русские буквы приводятся к латинским буквам той же клавиши
+
+Все последовательности компилируются в автомат Ахо-Корасик над шагами;
+нажатие - один шаг автомата (поиск в словаре переходов, которые
+вычисляются при первом проходе и запоминаются), сколько бы макросов ни было.
+При изменении файла автомат строится заново в фоновом потоке и заменяется
+одним присваиванием
+"""
+
+# Импортируем модуль logging для ошибок файла макросов
+import logging
+# Импортируем модуль os для времени изменения файла
+import os
+# Импортируем модуль threading для построения автомата в фоне
+import threading
+# Импортируем deque для обхода автомата в ширину
+from collections import deque
+# Импортируем типы для аннотации
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Импортируем карту раскладок (русские буквы -> латинские клавиши)
+from .config import RussianLayoutConfig
+# Импортируем биты модификаторов и запись события
+from .events import MOD_WIN, MODIFIER_KEYS, KeyEvent
+
+# Журнал макросов
+logger = logging.getLogger(__name__)
+
+# Названия модификаторов в файле макросов и в pynput -> бит
+MODIFIER_BITS = dict(MODIFIER_KEYS, win=MOD_WIN)
+# Русская буква -> латинская буква той же клавиши
+RU_TO_EN = {ru: en for en, ru in RussianLayoutConfig.EN_TO_RU_MAP.items() if ru.isalpha() and en.islower()}
+# Разделитель последовательности и действия в файле
+ACTION_SEPARATOR = '=>'
+
+# Шаг последовательности: (модификаторы, клавиша)
+Step = Tuple[int, str]
+# Нет совпадений (общий пустой кортеж, без выделения памяти на нажатие)
+NO_ACTIONS: Tuple[str, ...] = ()
+
+
+def normalize_key(char: Optional[str], name: Optional[str]) -> Optional[str]:
+    """
+    Клавиша шага по символу или названию клавиши pynput
+
+    Args:
+        char: Символ клавиши (None - специальная клавиша)
+        name: Название специальной клавиши
+
+    Returns:
+        Optional[str]: Клавиша в нижнем регистре (None - клавиша не определена)
+    """
+    if char:
+        if char < ' ':
+            # С Ctrl некоторые системы присылают управляющий символ: Ctrl+K -> '\\x0b'
+            return chr(ord(char) + 96)
+        char = char.lower()
+        return RU_TO_EN.get(char, char)
+    return name
+
+
+def parse_step(text: str) -> Step:
+    """
+    Разбор шага последовательности
+
+    Args:
+        text: Шаг вида 'ctrl+alt+k' или 'f5'
+
+    Returns:
+        Step: (модификаторы, клавиша)
+
+    Raises:
+        ValueError: Если в шаге нет клавиши кроме модификаторов
+    """
+    # '+' как клавиша записывается в конце шага: ctrl++
+    text = text.lower()
+    if text == '+' or text.endswith('++'):
+        parts = text[:-1].split('+')[:-1] + ['+']
+    else:
+        parts = text.split('+')
+    *modifiers, key = parts
+    mods = 0
+    for name in modifiers:
+        if name not in MODIFIER_BITS:
+            raise ValueError(f"Unknown modifier: {name}")
+        mods |= MODIFIER_BITS[name]
+    if not key or key in MODIFIER_BITS:
+        raise ValueError(f"Step has no key: {text}")
+    return mods, normalize_key(key, None) if len(key) == 1 else key
+
+
+def parse_macros(lines: Iterable[str]) -> List[Tuple[Tuple[Step, ...], str]]:
+    """
+    Разбор файла макросов
+
+    Args:
+        lines: Строки файла
+
+    Returns:
+        List[Tuple[Tuple[Step, ...], str]]: Пары (последовательность шагов, действие)
+
+    Raises:
+        ValueError: Если строка не разбирается (с номером строки)
+    """
+    macros = []
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        sequence, separator, action = line.partition(ACTION_SEPARATOR)
+        try:
+            if not separator or not action.strip() or not sequence.split():
+                raise ValueError(f"expected 'steps {ACTION_SEPARATOR} action'")
+            macros.append((tuple(parse_step(step) for step in sequence.split()), action.strip()))
+        except ValueError as e:
+            raise ValueError(f"line {number}: {e}") from None
+    return macros
+
+
+class MacroAutomaton:
+    """
+    Автомат Ахо-Корасик над шагами последовательностей
+
+    Состояние - индекс узла бора. Переход для пары (состояние, шаг)
+    вычисляется по ссылкам неудач один раз и запоминается, поэтому шаг
+    автомата - поиск в словаре
+    """
+
+    __slots__ = ('symbols', 'goto', 'fail', 'output', 'size', '_delta')
+
+    def __init__(self, macros: List[Tuple[Tuple[Step, ...], str]]):
+        """
+        Построение автомата
+
+        Args:
+            macros: Пары (последовательность шагов, действие)
+        """
+        # Шаг -> номер символа алфавита автомата
+        self.symbols: Dict[Step, int] = {}
+        # Переходы бора: по словарю на узел (номер символа -> узел)
+        self.goto: List[Dict[int, int]] = [{}]
+        # Действия, завершающиеся в узле (включая действия суффиксов)
+        self.output: List[Tuple[str, ...]] = [NO_ACTIONS]
+        for sequence, action in macros:
+            node = 0
+            for step in sequence:
+                symbol = self.symbols.setdefault(step, len(self.symbols))
+                next_node = self.goto[node].get(symbol)
+                if next_node is None:
+                    next_node = len(self.goto)
+                    self.goto[node][symbol] = next_node
+                    self.goto.append({})
+                    self.output.append(NO_ACTIONS)
+                node = next_node
+            self.output[node] += (action,)
+        self.size = len(macros)
+        # Ссылки неудач (обход в ширину)
+        self.fail = [0] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for symbol, child in self.goto[node].items():
+                self.fail[child] = self._resolve(self.fail[node], symbol)
+                if self.output[self.fail[child]]:
+                    self.output[child] += self.output[self.fail[child]]
+                queue.append(child)
+        # Запомненные переходы: (состояние << 32 | символ) -> состояние
+        self._delta: Dict[int, int] = {}
+
+    def _resolve(self, state: int, symbol: int) -> int:
+        """Переход по символу с откатом по ссылкам неудач"""
+        while True:
+            next_state = self.goto[state].get(symbol)
+            if next_state is not None:
+                return next_state
+            if state == 0:
+                return 0
+            state = self.fail[state]
+
+    def step(self, state: int, step: Step) -> int:
+        """
+        Переход автомата по шагу
+
+        Args:
+            state: Текущее состояние
+            step: Нажатый шаг
+
+        Returns:
+            int: Новое состояние (0 - шаг не продолжает ни одну последовательность)
+        """
+        symbol = self.symbols.get(step)
+        if symbol is None:
+            return 0
+        key = state << 32 | symbol
+        next_state = self._delta.get(key)
+        if next_state is None:
+            next_state = self._delta[key] = self._resolve(state, symbol)
+        return next_state
+
+
+class MacroMatcher:
+    """
+    Распознавание макросов по нажатиям (поток слушателя)
+
+    Модификаторы берутся из события; каждое нажатие другой клавиши - один
+    шаг автомата. Автомат можно заменить из другого потока в любой момент:
+    сопоставление продолжится с начала нового автомата
+    """
+
+    __slots__ = ('automaton', 'path', 'matches', '_state', '_state_automaton', '_mtime', '_loading')
+
+    def __init__(self, automaton: Optional[MacroAutomaton] = None, path: Optional[str] = None):
+        """
+        Args:
+            automaton: Скомпилированные макросы (None - пустой автомат)
+            path: Файл макросов для перезагрузки (None - без файла)
+        """
+        self.automaton = automaton or MacroAutomaton([])
+        self.path = path
+        # Количество сработавших макросов
+        self.matches = 0
+        self._state = 0
+        self._state_automaton = self.automaton
+        # Время изменения загруженного файла и флаг идущей загрузки
+        self._mtime: Optional[int] = None
+        self._loading = False
+
+    def on_press(self, event: KeyEvent) -> Tuple[str, ...]:
+        """
+        Учёт нажатия
+
+        Args:
+            event: Событие нажатия
+
+        Returns:
+            Tuple[str, ...]: Действия сработавших макросов (обычно пустой кортеж)
+        """
+        name = event.name
+        # Модификатор - часть сочетания, автоповтор - не новый шаг
+        if name in MODIFIER_KEYS or event.repeat:
+            return NO_ACTIONS
+        key = normalize_key(event.char, name)
+        if key is None:
+            return NO_ACTIONS
+        automaton = self.automaton
+        state = self._state if automaton is self._state_automaton else 0
+        state = automaton.step(state, (event.mods, key))
+        self._state = state
+        self._state_automaton = automaton
+        actions = automaton.output[state]
+        if actions:
+            self.matches += len(actions)
+        return actions
+
+    def check_file(self):
+        """
+        Перезагрузка файла макросов, если он изменился (главный поток)
+
+        Сам файл читается и компилируется в фоновом потоке
+        """
+        if not self.path or self._loading:
+            return
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime == self._mtime:
+            return
+        self._mtime = mtime
+        self._loading = True
+        threading.Thread(target=self._reload, args=(mtime,), daemon=True).start()
+
+    def _reload(self, mtime: Optional[int]):
+        """Чтение и компиляция файла макросов (фоновый поток)"""
+        try:
+            if mtime is None:
+                macros = []
+            else:
+                with open(self.path, encoding='utf-8') as f:
+                    macros = parse_macros(f)
+            # Замена автомата - одно присваивание: поток слушателя видит старый или новый
+            self.automaton = MacroAutomaton(macros)
+            logger.info("Loaded %d macros from %s", len(macros), self.path)
+        except (OSError, ValueError) as e:
+            logger.warning("Macros not reloaded from %s: %s", self.path, e)
+        finally:
+            self._loading = False
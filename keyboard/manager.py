@@ -9,13 +9,13 @@ import tkinter as tk
 import threading
 # Импортируем модуль time для работы с задержками
 import time
-# Импортируем типы для аннотации: Dict (словарь), Tuple (кортеж), Optional (может быть None)
-from typing import Dict, Tuple, Optional
+# Импортируем типы для аннотации: Dict (словарь), List (список), Tuple (кортеж), Optional (может быть None)
+from typing import TYPE_CHECKING, Dict, List, Tuple, Optional
 # Импортируем модуль keyboard из pynput для прослушивания нажатий клавиш
 from pynput import keyboard
 
 # Импортируем перечисление языков
-from .config import Language
+from .config import Language, UIConfig
 # Импортируем базовый класс визуализатора
 from .visualizers import BaseKeyboardVisualizer
 # Импортируем базовый класс контроллера
@@ -24,20 +24,55 @@ from .controllers import BaseKeyboardController
 from .factory import KeyboardFactory
 # Импортируем сервис для определения языка клавиатуры
 from .services import LanguageDetector
+# Импортируем слушатель, работающий в отдельном процессе
+from .capture import IsolatedKeyboardListener
+# Импортируем запись события клавиатуры и её построение из объектов pynput
+from .events import MOD_SHIFT, MODIFIER_KEYS, KeyEvent, KeyEventNormalizer
+# Импортируем издателя трансляции состояния
+from .broadcast import KeyEventPublisher
+# Импортируем шину событий для плагинов
+from .plugins import HookBus
+# Импортируем распознавание макросов
+from .macros import MacroMatcher
+# Импортируем запись сеанса набора
+from .recorder import SessionRecorder
+# Импортируем профилировщик главного потока
+from .diagnostics import MainThreadProfiler
+# Импортируем смену темы оформления
+from .themes import apply_theme, next_theme
+# Импортируем определение раскладки по набираемому тексту
+from .layout_id import LayoutIdentifier
+# Импортируем ввод нажатий в активное приложение
+from .injection import LABEL_TO_KEY, KeyInjector, resolve_label
+# Импортируем номер состояния подписей клавиш
+from .labels import label_state
+
+if TYPE_CHECKING:
+    # Экспорт в разделяемую память импортируется только с --shared-state
+    # (multiprocessing.shared_memory появился в Python 3.8)
+    from .shared_state import SharedStateExporter
 
 
 class LayoutManager:
     """Менеджер для переключения между раскладками"""
 
-    def __init__(self, root: tk.Tk):
+    def __init__(self, root: tk.Tk, isolated_capture: bool = False,
+                 broadcast_address: Optional[str] = None, record_path: Optional[str] = None,
+                 shared_state_name: Optional[str] = None):
         """
         Инициализация менеджера раскладок
 
         Args:
             root: Главное окно приложения Tkinter
+            isolated_capture: Перехватывать клавиатуру в отдельном процессе
+            broadcast_address: Адрес трансляции для зрителей ('unix:/путь' или 'хост:порт')
+            record_path: Файл для записи сеанса набора (None - не записывать)
+            shared_state_name: Имя сегмента разделяемой памяти для экспорта состояния (None - без экспорта)
         """
         # Сохраняем ссылку на главное окно приложения
         self.root = root
+        # Флаг изолированного перехвата (слушатель в отдельном процессе)
+        self.isolated_capture = isolated_capture
         # Устанавливаем текущий язык по умолчанию (английский)
         self.current_language = Language.ENGLISH
         # Создаём словарь для хранения всех раскладок
@@ -49,9 +84,49 @@ class LayoutManager:
         self.current_controller: Optional[BaseKeyboardController] = None
         # Ссылка на слушателя клавиатуры pynput (изначально None)
         self.listener: Optional[keyboard.Listener] = None
+        # Граница слушателя в процессе GUI: объекты pynput -> KeyEvent
+        self.normalizer = KeyEventNormalizer()
+        # Слушатель в отдельном процессе (только при isolated_capture)
+        self.isolated_listener: Optional[IsolatedKeyboardListener] = None
+        # Издатель трансляции (только при указанном адресе)
+        self.publisher: Optional[KeyEventPublisher] = None
+        # Экспорт состояния в разделяемую память (только при указанном имени)
+        self.shared_state: Optional['SharedStateExporter'] = None
+        # Шина событий для плагинов (без подписчиков публикация почти бесплатна)
+        self.hooks = HookBus()
+        # Распознавание макросов (только при указанном файле макросов)
+        self.macros: Optional[MacroMatcher] = MacroMatcher(path=UIConfig.MACRO_FILE) if UIConfig.MACRO_FILE else None
+        # Запись сеанса набора (только при указанном файле)
+        self.recorder: Optional[SessionRecorder] = SessionRecorder(record_path) if record_path else None
+        # Профилировщик главного потока (включается клавишей UIConfig.PROFILER_HOTKEY)
+        self.profiler = MainThreadProfiler(root, UIConfig.PROFILE_OUTPUT, UIConfig.PROFILE_SECONDS)
+        # Определение раскладки по тексту (когда раскладку нельзя узнать у ОС)
+        self.layout_identifier: Optional[LayoutIdentifier] = None
+        # Ввод нажатий в активное приложение (поток ввода запускается первым нажатием)
+        self.injector = KeyInjector()
+        # Модификаторы, удерживаемые на физической клавиатуре (из последнего события)
+        self.held_mods = 0
+        # Модификаторы, зафиксированные щелчком, и их подсвеченные кнопки: (визуализатор, маска, бит)
+        self.latched_mods = 0
+        self._latched_buttons: List[Tuple[BaseKeyboardVisualizer, int, int]] = []
 
         # Инициализируем все раскладки (английская и русская)
         self._initialize_layouts()
+        # Шина публикует изменения текста и раскладки всех визуализаторов
+        for visualizer, _ in self.layouts.values():
+            visualizer.observers.append(self.hooks)
+            # Щелчок по кнопке вводит нажатие в активное приложение
+            if UIConfig.CLICK_TO_TYPE:
+                visualizer.click_handler = self._on_key_click
+        # Запускаем трансляцию состояния, если указан адрес
+        if broadcast_address:
+            self._start_broadcast(broadcast_address)
+        # Экспортируем состояние в разделяемую память, если указано имя сегмента
+        if shared_state_name:
+            self._start_shared_state(shared_state_name)
+        # Загружаем макросы и следим за изменением их файла
+        if self.macros:
+            self._watch_macros()
         # Запускаем мониторинг изменения раскладки и слушателя клавиш
         self._start_monitoring()
 
@@ -73,6 +148,37 @@ class LayoutManager:
         # Берём их из словаря layouts по ключу current_language
         self.current_visualizer, self.current_controller = self.layouts[self.current_language]
 
+    def _start_broadcast(self, address: str):
+        """
+        Запуск трансляции состояния клавиатуры
+
+        Args:
+            address: Адрес прослушивания для зрителей
+        """
+        self.publisher = KeyEventPublisher(address)
+        self.publisher.start()
+        # Издатель наблюдает за визуализаторами всех раскладок
+        for visualizer, _ in self.layouts.values():
+            visualizer.observers.append(self.publisher)
+        self.publisher.on_layout_changed(self.current_language)
+
+    def _start_shared_state(self, name: str):
+        """
+        Запуск экспорта состояния клавиатуры в разделяемую память
+
+        Args:
+            name: Имя сегмента разделяемой памяти
+        """
+        # Импортируем экспорт здесь: multiprocessing.shared_memory нужен только с --shared-state
+        from .shared_state import SharedStateExporter
+        self.shared_state = SharedStateExporter(
+            self.root, name, {lang: visualizer for lang, (visualizer, _) in self.layouts.items()},
+            caps_lock=lambda: self.current_controller.caps_lock_on)
+        # Экспорт наблюдает за визуализаторами всех раскладок
+        for visualizer, _ in self.layouts.values():
+            visualizer.observers.append(self.shared_state)
+        self.shared_state.on_layout_changed(self.current_language)
+
     def _start_monitoring(self):
         """
         Запуск мониторинга раскладки и слушателя клавиатуры
@@ -80,13 +186,20 @@ class LayoutManager:
         Создаёт и запускает два фоновых потока:
         1. Поток для отслеживания изменения системной раскладки
         2. Поток для прослушивания нажатий клавиш
+
+        Если раскладку нельзя узнать у ОС (UIConfig.LAYOUT_DETECTION), первого
+        потока нет: раскладка определяется по нажатиям в потоке слушателя
         """
-        # Создаём поток для мониторинга раскладки
-        # target - функция, которая будет выполняться в потоке
-        # daemon=True - поток завершится при завершении главной программы
-        layout_monitor_thread = threading.Thread(target=self._monitor_layout, daemon=True)
-        # Запускаем поток мониторинга раскладки
-        layout_monitor_thread.start()
+        mode = UIConfig.LAYOUT_DETECTION
+        if mode == 'os' or (mode == 'auto' and LanguageDetector.is_supported()):
+            # Создаём поток для мониторинга раскладки
+            # target - функция, которая будет выполняться в потоке
+            # daemon=True - поток завершится при завершении главной программы
+            layout_monitor_thread = threading.Thread(target=self._monitor_layout, daemon=True)
+            # Запускаем поток мониторинга раскладки
+            layout_monitor_thread.start()
+        else:
+            self.layout_identifier = LayoutIdentifier(self.current_language)
 
         # Создаём поток для слушателя клавиатуры
         listener_thread = threading.Thread(target=self._start_listener, daemon=True)
@@ -136,21 +249,23 @@ class LayoutManager:
         current_text = self.current_controller.get_typed_text()
 
         # Останавливаем текущий слушатель клавиатуры, если он существует
-        if self.listener:
+        # Процесс изолированного перехвата не перезапускается: он сам
+        # передаёт события текущему контроллеру
+        if self.listener and not self.isolated_capture:
             # Вызываем метод stop() для остановки слушателя
             self.listener.stop()
 
-        # Удаляем графический фрейм текущего визуализатора
-        if self.current_visualizer.main_frame is not None:
-            # Уничтожаем фрейм (удаляем из интерфейса)
-            self.current_visualizer.main_frame.destroy()
-            # Обнуляем ссылку на фрейм
-            self.current_visualizer.main_frame = None
+        # Удаляем клавиатуру текущего визуализатора вместе со ссылками на её виджеты
+        self.current_visualizer.destroy_keyboard()
 
         # Переключаемся на новую раскладку из словаря layouts
         # Получаем визуализатор и контроллер для нового языка
         self.current_visualizer, self.current_controller = self.layouts[self.current_language]
 
+        # Удерживаемые клавиши контроллера остались от его прошлого показа:
+        # их отпускания пришли другому контроллеру
+        self.current_controller.held_keys.clear()
+
         # Синхронизируем состояние Caps Lock с системным перед использованием контроллера
         # Это важно, чтобы состояние Caps Lock было корректным после переключения
         self.current_controller.sync_caps_lock_state()
@@ -161,12 +276,27 @@ class LayoutManager:
         # Создаём визуализацию клавиатуры с сохранённым текстом
         self.current_visualizer.create_keyboard(current_text)
 
+        # Сообщаем наблюдателям о новой раскладке
+        for observer in self.current_visualizer.observers:
+            observer.on_layout_changed(self.current_language)
+
+        # При изолированном перехвате слушатель уже работает
+        if self.isolated_capture:
+            return
+
+        # Отпускания, пришедшие во время перезапуска слушателя, потеряны:
+        # начинаем без нажатых клавиш и модификаторов
+        self.normalizer.reset()
+        self.held_mods = 0
+        if self.shared_state:
+            self.shared_state.set_modifiers(0)
+
         # Создаём новый слушатель клавиатуры с обработчиками из нового контроллера
         self.listener = keyboard.Listener(
             # Обработчик нажатия клавиши
-            on_press=self.current_controller.on_press,
+            on_press=self._on_os_press,
             # Обработчик отпускания клавиши
-            on_release=self.current_controller.on_release
+            on_release=self._on_os_release
         )
         # Запускаем слушателя клавиатуры
         self.listener.start()
@@ -180,15 +310,178 @@ class LayoutManager:
         """
         # Делаем паузу 500 миллисекунд, чтобы дать время на инициализацию GUI
         time.sleep(0.5)
+        # При изолированном перехвате слушатель работает в отдельном процессе
+        if self.isolated_capture:
+            self._start_isolated_listener()
+            return
         # Создаём слушателя клавиатуры с обработчиками текущего контроллера
         self.listener = keyboard.Listener(
             # Обработчик нажатия клавиши
-            on_press=self.current_controller.on_press,
+            on_press=self._on_os_press,
             # Обработчик отпускания клавиши
-            on_release=self.current_controller.on_release
+            on_release=self._on_os_release
         )
         # Запускаем слушателя
         self.listener.start()
         # Ждём завершения работы слушателя (блокирующий вызов)
         # Слушатель будет работать до остановки программы
-        self.listener.join()
\ No newline at end of file
+        self.listener.join()
+
+    def _start_isolated_listener(self):
+        """
+        Запуск слушателя в отдельном процессе
+
+        Процесс запускается один раз; события передаются текущему
+        контроллеру, поэтому при переключении раскладки его не нужно пересоздавать
+        """
+        self.isolated_listener = IsolatedKeyboardListener(
+            # Обработчик нажатия: всегда вызываем текущий контроллер
+            on_press=self._on_press,
+            # Обработчик отпускания: всегда вызываем текущий контроллер
+            on_release=self._on_release
+        )
+        # Запускаем процесс перехвата и поток чтения канала
+        self.isolated_listener.start()
+        # Ждём завершения потока чтения (до остановки программы)
+        self.isolated_listener.join()
+
+    def _on_os_press(self, key):
+        """Нажатие от слушателя pynput: построение записи события"""
+        self._on_press(self.normalizer.normalize(key, True))
+
+    def _on_os_release(self, key):
+        """Отпускание от слушателя pynput: построение записи события"""
+        self._on_release(self.normalizer.normalize(key, False))
+
+    def _on_press(self, event: KeyEvent):
+        """Нажатие клавиши: запись в сеанс и передача текущему контроллеру"""
+        self.held_mods = event.mods
+        if self.shared_state:
+            self.shared_state.set_modifiers(event.mods)
+        # Эхо собственного ввода (type:, щелчок по кнопке) не записывается и не
+        # распознаётся как макрос: иначе type: с триггером макроса зациклится
+        injected = self.injector.injecting
+        if self.recorder and not injected:
+            self.recorder.record(event)
+        self.hooks.emit('press', event)
+        if self.macros and not injected:
+            actions = self.macros.on_press(event)
+            if actions:
+                self.root.after(0, self._run_macros, actions)
+        name = event.name
+        # Клавиша профилировщика не отображается на клавиатуре
+        if name == UIConfig.PROFILER_HOTKEY:
+            self.profiler.toggle()
+            return
+        # Клавиша смены темы тоже не отображается
+        if name == UIConfig.THEME_HOTKEY:
+            self.root.after(0, self.cycle_theme)
+            return
+        # Автоповтор - одна и та же клавиша, а не новая биграмма
+        if self.layout_identifier and not event.repeat:
+            language = self.layout_identifier.feed(event.char)
+            if language:
+                # Переключение в главном потоке, как при опросе ОС
+                self.current_language = language
+                self.root.after(0, self.switch_layout)
+        self.current_controller.on_press(event)
+
+    def _on_release(self, event: KeyEvent):
+        """Отпускание клавиши: запись в сеанс и передача текущему контроллеру"""
+        self.held_mods = event.mods
+        if self.shared_state:
+            self.shared_state.set_modifiers(event.mods)
+        if self.recorder and not self.injector.injecting:
+            self.recorder.record(event)
+        self.hooks.emit('release', event)
+        self.current_controller.on_release(event)
+
+    def _watch_macros(self):
+        """Перезагрузка изменившегося файла макросов (главный поток, раз в UIConfig.MACRO_RELOAD_MS)"""
+        self.macros.check_file()
+        self.root.after(UIConfig.MACRO_RELOAD_MS, self._watch_macros)
+
+    def _run_macros(self, actions):
+        """
+        Выполнение действий сработавших макросов (главный поток)
+
+        Встроенные действия: 'text:ТЕКСТ' - добавить текст, 'type:ТЕКСТ' -
+        ввести текст в активное приложение, 'clear' - очистить текст,
+        'theme' - сменить тему. Все действия публикуются плагинам
+
+        Args:
+            actions: Действия макросов
+        """
+        for action in actions:
+            if action.startswith('text:'):
+                self.current_controller.set_typed_text(self.current_controller.get_typed_text() + action[5:])
+            elif action.startswith('type:'):
+                self.injector.put_text(action[5:])
+            elif action == 'clear':
+                self.current_controller.set_typed_text("")
+            elif action == 'theme':
+                self.cycle_theme()
+            self.hooks.emit('macro', action)
+
+    def _on_key_click(self, index: int, key: str):
+        """
+        Щелчок по кнопке (главный поток): постановка нажатия в очередь ввода
+
+        Модификатор фиксируется до щелчка по следующей клавише (повторный
+        щелчок снимает фиксацию). Модификаторы, удерживаемые на физической
+        клавиатуре, учитываются при выборе символа, но не нажимаются
+        повторно: они уже нажаты в системе
+
+        Args:
+            index: Индекс кнопки
+            key: Подпись кнопки
+        """
+        bit = MODIFIER_KEYS.get(LABEL_TO_KEY.get(key, ''), 0)
+        if bit:
+            if self.latched_mods & bit:
+                self._release_latched(bit)
+            else:
+                self.latched_mods |= bit
+                self.current_visualizer.press_buttons(1 << index)
+                self._latched_buttons.append((self.current_visualizer, 1 << index, bit))
+                self._update_latched_labels()
+            return
+        mods = self.latched_mods | self.held_mods
+        name, char = resolve_label(key, mods, self.current_controller.caps_lock_on)
+        if name or char:
+            self.injector.put(self.latched_mods & ~self.held_mods, name, char)
+        self._release_latched(self.latched_mods)
+
+    def _release_latched(self, bits: int):
+        """Снятие фиксации модификаторов bits и подсветки их кнопок"""
+        self.latched_mods &= ~bits
+        kept = []
+        for visualizer, mask, bit in self._latched_buttons:
+            if bit & bits:
+                visualizer.release_keys(mask)
+            else:
+                kept.append((visualizer, mask, bit))
+        self._latched_buttons = kept
+        self._update_latched_labels()
+
+    def _update_latched_labels(self):
+        """Подписи клавиш с учётом Shift, зафиксированного щелчком"""
+        shift = bool((self.latched_mods | self.held_mods) & MOD_SHIFT)
+        self.current_visualizer.set_label_state(label_state(shift, self.current_controller.caps_lock_on))
+
+    def cycle_theme(self):
+        """Смена темы на следующую по кругу (главный поток)"""
+        apply_theme(next_theme(UIConfig.THEME), self.root,
+                    [visualizer for visualizer, _ in self.layouts.values()])
+
+    def close(self):
+        """Завершение работы: сохранение профиля и записи сеанса, остановка трансляции, экспорта, плагинов и ввода"""
+        self.profiler.stop()
+        self.hooks.close()
+        self.injector.close()
+        if self.recorder:
+            self.recorder.close()
+        if self.publisher:
+            self.publisher.stop()
+        if self.shared_state:
+            self.shared_state.close()
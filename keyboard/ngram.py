@@ -0,0 +1,109 @@
+"""
+Модуль символьной модели n-грамм
+Оценивает, насколько слово похоже на слова языка (средний логарифм
+вероятности символа с учётом двух предыдущих символов)
+"""
+
+# Импортируем модуль math для логарифмов
+import math
+# Импортируем lru_cache, чтобы модель каждого языка обучалась один раз
+from functools import lru_cache
+# Импортируем Counter для подсчёта n-грамм
+from collections import Counter
+# Импортируем типы для аннотации
+from typing import Dict, Iterable
+
+# Импортируем перечисление языков
+from .config import Language
+# Импортируем обучающие тексты
+from .ngram_data import SEED_EN, SEED_RU
+
+# Маркер начала слова
+BOS = '^'
+# Маркер конца слова
+EOS = '$'
+# Штраф за переход к n-грамме меньшего порядка (stupid backoff)
+BACKOFF = math.log(0.4)
+
+
+class CharNgramModel:
+    """
+    Символьная модель триграмм с откатом к биграммам и униграммам
+
+    Логарифмы вероятностей всех встреченных n-грамм вычисляются при обучении,
+    поэтому оценка символа - не более трёх поисков в словарях
+    """
+
+    def __init__(self, words: Iterable[str]):
+        """
+        Обучение модели на словах
+
+        Args:
+            words: Обучающие слова
+        """
+        trigrams: Counter = Counter()
+        bigrams: Counter = Counter()
+        unigrams: Counter = Counter()
+        for word in words:
+            padded = BOS + BOS + word.lower() + EOS
+            for i in range(2, len(padded)):
+                trigrams[padded[i - 2:i + 1]] += 1
+                bigrams[padded[i - 1:i + 1]] += 1
+                unigrams[padded[i]] += 1
+        # Счётчики контекстов (n-граммы без последнего символа)
+        bigram_contexts: Counter = Counter()
+        for gram, count in trigrams.items():
+            bigram_contexts[gram[:2]] += count
+        unigram_contexts: Counter = Counter()
+        for gram, count in bigrams.items():
+            unigram_contexts[gram[0]] += count
+        total = sum(unigrams.values())
+
+        self._trigram: Dict[str, float] = {
+            gram: math.log(count / bigram_contexts[gram[:2]]) for gram, count in trigrams.items()}
+        self._bigram: Dict[str, float] = {
+            gram: BACKOFF + math.log(count / unigram_contexts[gram[0]]) for gram, count in bigrams.items()}
+        # Униграммы сглаживаются добавлением единицы, чтобы незнакомый символ имел конечную цену
+        vocabulary = len(unigrams) + 1
+        self._unigram: Dict[str, float] = {
+            char: 2 * BACKOFF + math.log((count + 1) / (total + vocabulary))
+            for char, count in unigrams.items()}
+        self._unknown = 2 * BACKOFF + math.log(1 / (total + vocabulary))
+
+    def score(self, word: str) -> float:
+        """
+        Средний логарифм вероятности символа слова (чем больше, тем правдоподобнее)
+
+        Args:
+            word: Слово
+
+        Returns:
+            float: Оценка слова
+        """
+        padded = BOS + BOS + word.lower() + EOS
+        trigram, bigram, unigram = self._trigram, self._bigram, self._unigram
+        total = 0.0
+        for i in range(2, len(padded)):
+            gram = padded[i - 2:i + 1]
+            value = trigram.get(gram)
+            if value is None:
+                value = bigram.get(gram[1:])
+                if value is None:
+                    value = unigram.get(gram[2], self._unknown)
+            total += value
+        return total / (len(padded) - 2)
+
+
+@lru_cache(maxsize=None)
+def load_model(language: Language) -> CharNgramModel:
+    """
+    Модель языка, обученная на встроенных текстах
+
+    Args:
+        language: Язык
+
+    Returns:
+        CharNgramModel: Модель (одна на язык)
+    """
+    seed = SEED_RU if language == Language.RUSSIAN else SEED_EN
+    return CharNgramModel(seed.split())
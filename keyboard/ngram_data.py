@@ -0,0 +1,70 @@
+"""
+Модуль обучающих текстов для символьной модели n-грамм
+Частотные слова английского и русского языков (встроены в код, чтобы
+попадать в сборку EXE без отдельных файлов данных)
+"""
+
+# Частотные английские слова
+SEED_EN = """
+the be to of and a in that have i it for not on with he as you do at this but his by
+from they we say her she or an will my one all would there their what so up out if
+about who get which go me when make can like time no just him know take people into
+year your good some could them see other than then now look only come its over think
+also back after use two how our work first well way even new want because any these
+give day most us is are was were been has had did does said says made went gone done
+hello hi thanks thank please yes sorry okay ok world word words home house school
+water money family friend friends night morning evening today tomorrow yesterday week
+month life man woman child children game play player team win lost love like liked
+great little long small big high old young right left next last late early same
+different important public private able bad best better sure free true false real
+keyboard key keys type typing text letter letters layout language english russian
+computer program code python window screen mouse file files open close save start
+stop run test tests build should must might may shall where why here very much many
+more less few every each both either neither never always often sometimes usually
+again already still yet soon together around between under above below through during
+before while since until against among without within along across behind beyond
+something nothing everything anything someone nobody everyone anyone thing things
+place point problem question answer number part hand eye eyes head face fact case
+group company system service information business government country city state
+story study book books page read write wrote written talk speak spoke said tell told
+call called ask asked need needed feel felt try tried leave left put keep kept let
+begin began seem seemed help helped show showed hear heard turn turned move moved
+live lived believe bring brought happen happened stand sit set learn change changes
+follow create created add added spend grow open walk offer remember remembered
+consider appear buy wait serve die send expect stay fall cut reach kill remain
+suggest raise pass sell require report decide pull return explain hope develop carry
+break receive agree support hit produce eat cover catch draw choose cause point
+message email mail phone call meeting office project release version update data
+"""
+
+# Частотные русские слова
+SEED_RU = """
+и в не на я быть он с что а по это она этот к но они мы как из у который то за свой
+весь год от так о для ты же все тот мочь вы человек такой его сказать только или
+ещё бы себя один как уже до время если сам когда другой вот говорить наш мой знать
+стать при чтобы дело жизнь кто первый очень два день её новый рука даже во со раз
+где там под можно ну какой после их работа без самый потом надо хотеть ли слово
+идти большой должен место иметь ничто то сейчас тут лицо каждый друг нет теперь
+ни глаз тоже тогда видеть вопрос через да здесь дом да сторона думать сделать
+страна жить чем мир об последний случай голова более делать что-то смотреть ребёнок
+просто конечно сила российский конец перед несколько вид система всегда работать
+между три продолжать город нужно сразу понимать решение понять деньги история
+привет здравствуйте спасибо пожалуйста извините хорошо плохо да нет давай давайте
+пока добрый утро вечер ночь сегодня завтра вчера неделя месяц слова буквы текст
+клавиатура клавиша раскладка язык русский английский компьютер программа окно экран
+файл открыть закрыть сохранить начать начало остановить запуск проверка сборка
+был была было были буду будет будем будут есть нету могу может можем могут хочу
+хочет хотим хотят знаю знает знаем знают говорю говорит говорят думаю думает
+сделал сделала сделали пишу пишет писать написал читать читаю прочитал
+работаю работает работали иду идёт пошёл пошла пришёл пришла
+мама папа семья друзья школа учитель ученик книга книги страница вода деньги
+время года года лет дня дней часов минут секунд человека людей люди
+большая большое большие маленький маленькая новая новое новые старый старая
+хороший хорошая хорошее плохой первая первое второй третий последний
+здесь туда сюда откуда почему зачем потому поэтому тоже также ещё уже
+всё всего всех всем кому чему чего кого тебя тебе меня мне нас нам вас вам
+него нему ней ними этого этому этой эти этих тех того тому той
+работы работе дела делу жизни жизнью слова словами вопросы вопроса ответ ответы
+сообщение письмо почта телефон звонок встреча офис проект версия обновление данные
+понятно спасибо большое всего доброго до свидания увидимся скоро позже
+"""
@@ -0,0 +1,116 @@
+"""
+Модуль политики перегрузки
+Содержит очередь правок текста из потока слушателя в главный поток
+и счётчики событий, объединённых при перегрузке
+
+Политика:
+    правки текста (символы и специальные клавиши) никогда не отбрасываются:
+    все накопившиеся за кадр правки применяются одним обратным вызовом,
+    а дисплей перерисовывается один раз за пачку;
+    автоповтор удерживаемой клавиши не добавляет правку, а увеличивает
+    счётчик повторов последней правки той же клавиши;
+    подсветка, пока событий за кадр не больше UIConfig.OVERLOAD_THRESHOLD,
+    показывает каждое нажатие (в том числе короткие), а сверх порога
+    сводится к последнему состоянию каждой клавиши
+"""
+
+# Импортируем модуль threading для блокировки очереди
+import threading
+# Импортируем модуль tkinter для аннотации типа окна
+import tkinter as tk
+# Импортируем типы для аннотации
+from typing import Callable, List, Tuple
+
+# Правка текста: (вид - 'char' или 'special', символ или название клавиши, количество повторов)
+Edit = Tuple[str, str, int]
+
+
+class OverloadCounters:
+    """Счётчики очереди правок и объединённой подсветки"""
+
+    __slots__ = ('edits_queued', 'edits_applied', 'merged_repeats', 'batches', 'max_batch',
+                 'highlight_events', 'collapsed_highlights')
+
+    def __init__(self):
+        # Правки, поставленные в очередь, и применённые правки (с учётом повторов)
+        self.edits_queued = 0
+        self.edits_applied = 0
+        # Автоповторы, слитые с предыдущей правкой
+        self.merged_repeats = 0
+        # Количество пачек (обратных вызовов главного потока) и самая большая пачка
+        self.batches = 0
+        self.max_batch = 0
+        # События подсветки (нажатия и отпускания) и события, объединённые при перегрузке
+        self.highlight_events = 0
+        self.collapsed_highlights = 0
+
+    def summary(self) -> str:
+        """Строка со значениями счётчиков (для журнала и бенчмарка)"""
+        return (f"edits {self.edits_applied}/{self.edits_queued} in {self.batches} batches "
+                f"(max {self.max_batch}, repeats merged {self.merged_repeats}), highlights {self.highlight_events}, "
+                f"collapsed {self.collapsed_highlights}")
+
+
+class InputQueue:
+    """
+    Очередь правок текста
+
+    Поток слушателя добавляет правки, главный поток забирает их все сразу.
+    В очереди Tk одновременно находится не больше одного обратного вызова,
+    сколько бы событий ни пришло
+    """
+
+    __slots__ = ('root', 'handler', 'counters', '_items', '_lock', '_scheduled')
+
+    def __init__(self, root: tk.Tk, handler: Callable[[List[Edit]], None], counters: OverloadCounters):
+        """
+        Args:
+            root: Главное окно приложения (для планирования в главный поток)
+            handler: Применение пачки правок (вызывается в главном потоке)
+            counters: Счётчики перегрузки
+        """
+        self.root = root
+        self.handler = handler
+        self.counters = counters
+        self._items: List[Edit] = []
+        self._lock = threading.Lock()
+        # Запланирован ли разбор очереди
+        self._scheduled = False
+
+    def put(self, kind: str, value: str, repeat: bool = False):
+        """
+        Добавление правки (можно вызывать из любого потока)
+
+        Args:
+            kind: 'char' - символ, 'special' - специальная клавиша
+            value: Символ или название клавиши
+            repeat: Автоповтор: если последняя правка в очереди - та же
+                клавиша, увеличивается её счётчик повторов
+        """
+        with self._lock:
+            items = self._items
+            if repeat and items and items[-1][0] == kind and items[-1][1] == value:
+                items[-1] = (kind, value, items[-1][2] + 1)
+                self.counters.merged_repeats += 1
+            else:
+                items.append((kind, value, 1))
+            self.counters.edits_queued += 1
+            schedule = not self._scheduled
+            self._scheduled = True
+        if schedule:
+            self.root.after(0, self._drain)
+
+    def __len__(self) -> int:
+        """Количество правок, ожидающих разбора (слитые повторы - одна правка)"""
+        return len(self._items)
+
+    def _drain(self):
+        """Применение всех накопившихся правок (главный поток)"""
+        with self._lock:
+            items, self._items = self._items, []
+            self._scheduled = False
+        counters = self.counters
+        counters.batches += 1
+        counters.max_batch = max(counters.max_batch, len(items))
+        self.handler(items)
+        counters.edits_applied += sum(count for _, _, count in items)
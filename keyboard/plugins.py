@@ -0,0 +1,286 @@
+"""
+Модуль шины событий для плагинов
+Плагины (журнал, макросы, статистика) подписываются на события клавиатуры,
+не изменяя контроллеры
+
+События:
+    'press' / 'release' - нажатие и отпускание клавиши (поток слушателя)
+    'text_changed' - изменился набранный текст (главный поток)
+    'layout_switched' - переключилась раскладка (главный поток)
+    'macro' - сработал макрос, значение - его действие (главный поток)
+
+Публикация без подписчиков - один поиск в словаре. У каждого подписчика
+своя ограниченная очередь; его обработчик выполняется в пуле потоков, по
+одному вызову подписчика за раз. Медленный плагин не задерживает ни поток
+слушателя, ни главный поток: переполненная очередь отбрасывает новые
+события и считает их. Задача пула обрабатывает не больше
+UIConfig.PLUGIN_BATCH событий подписчика и не дольше UIConfig.PLUGIN_SLICE_MS,
+затем ставится в конец очереди пула: медленные плагины не занимают потоки
+пула навсегда, а быстрые успевают разобрать свою очередь за один раз
+
+Плагин - модуль с функцией register(bus), загружаемый параметром main.py --plugin
+"""
+
+# Импортируем модуль importlib для загрузки модулей плагинов
+import importlib
+# Импортируем модуль logging для ошибок обработчиков и итоговой статистики
+import logging
+# Импортируем модуль sys для проверки версии Python
+import sys
+# Импортируем модуль threading для блокировок очередей
+import threading
+# Импортируем модуль time для измерения длительности обработчиков
+import time
+# Импортируем deque для очередей подписчиков
+from collections import deque
+# Импортируем пул потоков для выполнения обработчиков
+from concurrent.futures import ThreadPoolExecutor
+# Импортируем типы для аннотации
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Импортируем конфигурацию UI (размеры очередей и пула)
+from .config import UIConfig
+# Импортируем базовый класс наблюдателя состояния
+from .state import StateObserver
+
+# Журнал шины плагинов
+logger = logging.getLogger(__name__)
+
+# Типы событий шины
+HOOK_EVENTS = ('press', 'release', 'text_changed', 'layout_switched', 'macro')
+
+
+class Subscription:
+    """
+    Подписчик шины: обработчик, его очередь и статистика
+
+    Очередь разбирается одной задачей пула за раз, поэтому обработчик
+    одного подписчика никогда не вызывается параллельно с самим собой
+    """
+
+    __slots__ = ('name', 'event', 'handler', 'queue_size', '_queue', '_lock', '_scheduled',
+                 'delivered', 'dropped', 'errors', 'total_time', 'max_time')
+
+    def __init__(self, name: str, event: str, handler: Callable[[Any], None], queue_size: int):
+        """
+        Args:
+            name: Имя подписчика (для статистики)
+            event: Тип события
+            handler: Обработчик события (получает значение события)
+            queue_size: Предел очереди необработанных событий
+        """
+        self.name = name
+        self.event = event
+        self.handler = handler
+        self.queue_size = queue_size
+        self._queue: deque = deque()
+        self._lock = threading.Lock()
+        # Запланирован ли разбор очереди в пуле
+        self._scheduled = False
+        # Статистика: обработанные, отброшенные, завершившиеся ошибкой события
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        # Суммарное и наибольшее время обработчика (в секундах)
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def offer(self, value: Any) -> bool:
+        """
+        Добавление события в очередь
+
+        Args:
+            value: Значение события
+
+        Returns:
+            bool: True, если нужно запланировать разбор очереди
+        """
+        with self._lock:
+            if len(self._queue) >= self.queue_size:
+                self.dropped += 1
+                return False
+            self._queue.append(value)
+            if self._scheduled:
+                return False
+            self._scheduled = True
+            return True
+
+    def drain(self, limit: int, time_slice: float) -> bool:
+        """
+        Разбор очереди (задача пула)
+
+        Args:
+            limit: Наибольшее количество обрабатываемых событий
+            time_slice: Время разбора в секундах, после которого новые события не берутся
+
+        Returns:
+            bool: True, если в очереди остались события и разбор нужно запланировать снова
+        """
+        deadline = time.perf_counter() + time_slice
+        for _ in range(limit):
+            with self._lock:
+                if not self._queue:
+                    self._scheduled = False
+                    return False
+                value = self._queue.popleft()
+            start = time.perf_counter()
+            try:
+                self.handler(value)
+            except Exception:
+                self.errors += 1
+                logger.exception("Plugin %s failed on %s", self.name, self.event)
+            elapsed = time.perf_counter() - start
+            self.delivered += 1
+            self.total_time += elapsed
+            if elapsed > self.max_time:
+                self.max_time = elapsed
+            if start + elapsed >= deadline:
+                break
+        with self._lock:
+            if self._queue:
+                return True
+            self._scheduled = False
+            return False
+
+    def summary(self) -> str:
+        """Строка статистики подписчика (для журнала)"""
+        mean_ms = self.total_time / self.delivered * 1000.0 if self.delivered else 0.0
+        return (f"{self.name} [{self.event}]: delivered {self.delivered}, dropped {self.dropped}, "
+                f"errors {self.errors}, mean {mean_ms:.3f} ms, max {self.max_time * 1000.0:.3f} ms")
+
+
+class HookBus(StateObserver):
+    """
+    Шина событий для плагинов
+
+    Список подписчиков события - неизменяемый кортеж, который заменяется
+    целиком при подписке, поэтому публикация читает его без блокировки.
+    Как наблюдатель визуализаторов шина публикует изменения текста и раскладки
+    """
+
+    def __init__(self, workers: int = UIConfig.PLUGIN_WORKERS,
+                 queue_size: int = UIConfig.PLUGIN_QUEUE_SIZE, batch: int = UIConfig.PLUGIN_BATCH,
+                 time_slice_ms: float = UIConfig.PLUGIN_SLICE_MS):
+        """
+        Args:
+            workers: Количество потоков пула обработчиков
+            queue_size: Предел очереди подписчика по умолчанию
+            batch: Наибольшее количество событий подписчика на одну задачу пула
+            time_slice_ms: Время одной задачи пула на подписчика (мс)
+        """
+        self.workers = workers
+        self.queue_size = queue_size
+        self.batch = batch
+        self.time_slice = time_slice_ms / 1000.0
+        # Тип события -> кортеж подписчиков
+        self._subscribers: Dict[str, Tuple[Subscription, ...]] = {}
+        self._lock = threading.Lock()
+        # Пул создаётся при первой подписке
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def subscribe(self, event: str, handler: Callable[[Any], None], name: Optional[str] = None,
+                  queue_size: Optional[int] = None) -> Subscription:
+        """
+        Подписка обработчика на событие
+
+        Args:
+            event: Тип события из HOOK_EVENTS
+            handler: Обработчик (вызывается в потоке пула со значением события)
+            name: Имя подписчика (по умолчанию - имя обработчика)
+            queue_size: Предел очереди (по умолчанию - общий для шины)
+
+        Returns:
+            Subscription: Подписчик (для статистики и отписки)
+
+        Raises:
+            ValueError: Если тип события неизвестен
+        """
+        if event not in HOOK_EVENTS:
+            raise ValueError(f"Unknown hook event: {event}")
+        subscription = Subscription(name or getattr(handler, '__qualname__', repr(handler)), event,
+                                    handler, queue_size or self.queue_size)
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix='plugin')
+            self._subscribers[event] = self._subscribers.get(event, ()) + (subscription,)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Отписка (события, уже стоящие в очереди, будут обработаны)"""
+        with self._lock:
+            remaining = tuple(s for s in self._subscribers.get(subscription.event, ())
+                              if s is not subscription)
+            if remaining:
+                self._subscribers[subscription.event] = remaining
+            else:
+                self._subscribers.pop(subscription.event, None)
+
+    def emit(self, event: str, value: Any):
+        """
+        Публикация события (из любого потока, без ожидания обработчиков)
+
+        Args:
+            event: Тип события
+            value: Значение события
+        """
+        subscribers = self._subscribers.get(event)
+        if not subscribers:
+            return
+        for subscription in subscribers:
+            if subscription.offer(value):
+                if not self._submit(subscription):
+                    return
+
+    def _submit(self, subscription: Subscription) -> bool:
+        """Постановка разбора очереди подписчика в пул; False - пул уже остановлен"""
+        try:
+            self._pool.submit(self._drain, subscription)
+        except RuntimeError:
+            # Пул уже остановлен (завершение программы)
+            return False
+        return True
+
+    def _drain(self, subscription: Subscription):
+        """Задача пула: пачка событий подписчика, остаток - новой задачей в конце очереди пула"""
+        if subscription.drain(self.batch, self.time_slice):
+            self._submit(subscription)
+
+    def on_text_changed(self, text: str):
+        """Публикация изменения текста"""
+        self.emit('text_changed', text)
+
+    def on_layout_changed(self, language):
+        """Публикация переключения раскладки"""
+        self.emit('layout_switched', language)
+
+    def subscriptions(self) -> List[Subscription]:
+        """Все подписчики (для статистики)"""
+        return [s for subscribers in self._subscribers.values() for s in subscribers]
+
+    def close(self):
+        """Остановка пула и запись статистики подписчиков в журнал"""
+        if self._pool is None:
+            return
+        if sys.version_info >= (3, 9):
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        else:
+            # До Python 3.9 нет cancel_futures: поставленные задачи доработают сами
+            self._pool.shutdown(wait=False)
+        for subscription in self.subscriptions():
+            logger.info("%s", subscription.summary())
+
+
+def load_plugin(bus: HookBus, module_name: str):
+    """
+    Загрузка плагина
+
+    Args:
+        bus: Шина событий
+        module_name: Имя модуля плагина с функцией register(bus)
+
+    Raises:
+        ImportError: Если модуль не найден
+        AttributeError: Если в модуле нет функции register
+    """
+    module = importlib.import_module(module_name)
+    module.register(bus)
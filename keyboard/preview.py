@@ -0,0 +1,140 @@
+"""
+Модуль предпросмотра клавиши на других раскладках
+Рядом с клавиатурой показывается, что нажатая клавиша ввела бы на каждой
+раскладке ('EN f  RU а')
+
+Все раскладки один раз сводятся в матрицу перевода: строка - клавиша в
+состоянии Shift/Caps Lock, столбец - раскладка. Раскладки задаются картами
+символов английской раскладки (как EN_TO_RU_MAP), поэтому новая раскладка -
+это ещё одна карта. Нажатие - поиск клавиши в словаре и номер строки;
+текст предпросмотра для каждой строки готов заранее, так что стоимость
+нажатия не зависит от количества раскладок
+"""
+
+# Импортируем lru_cache для однократного построения матрицы
+from functools import lru_cache
+# Импортируем типы для аннотации
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+# Импортируем перечисление языков и конфигурации раскладок
+from .config import EnglishLayoutConfig, Language, RussianLayoutConfig
+# Импортируем состояния подписей и подпись клавиши в состоянии
+from .labels import LABEL_STATES, key_legend
+
+# Карты раскладок: символ клавиши на английской раскладке -> символ на этой раскладке
+# (символы, которых нет в карте, совпадают с английскими)
+LAYOUT_MAPS: Dict[Language, Mapping[str, str]] = {
+    Language.ENGLISH: {},
+    Language.RUSSIAN: RussianLayoutConfig.EN_TO_RU_MAP,
+}
+# Разделитель раскладок в тексте предпросмотра
+PREVIEW_SEPARATOR = '  '
+
+
+def _physical_keys(layout: Sequence[Sequence[str]]) -> List[Tuple[str, str]]:
+    """
+    Символьные клавиши английской раскладки
+
+    Args:
+        layout: Ряды подписей английской раскладки
+
+    Returns:
+        List[Tuple[str, str]]: (символ без Shift, символ с Shift) каждой клавиши
+    """
+    keys = []
+    for row in layout:
+        for key in row:
+            if ' | ' in key:
+                base, shifted = key.split(' | ')
+                keys.append((base, shifted))
+            elif len(key) == 1 and key.isalpha():
+                keys.append((key.lower(), key.upper()))
+    return keys
+
+
+class LayoutMatrix:
+    """
+    Матрица перевода клавиш между раскладками
+
+    cells[строка * количество раскладок + раскладка] - символ, где строка -
+    клавиша * LABEL_STATES + состояние подписей; previews[строка] - готовый
+    текст предпросмотра строки
+    """
+
+    __slots__ = ('languages', 'keys', 'cells', 'previews', 'indexes')
+
+    def __init__(self, keys: Sequence[Tuple[str, str]], maps: Mapping[Language, Mapping[str, str]]):
+        """
+        Args:
+            keys: (символ без Shift, символ с Shift) каждой клавиши на английской раскладке
+            maps: Карты раскладок в порядке столбцов
+        """
+        self.languages: Tuple[Language, ...] = tuple(maps)
+        self.keys = tuple(keys)
+        cells = []
+        for base, shifted in self.keys:
+            # Клавиша каждой раскладки в виде подписи 'a | b' (как на кнопке)
+            legends = [f"{layout_map.get(base, base)} | {layout_map.get(shifted, shifted)}"
+                       for layout_map in maps.values()]
+            for state in range(LABEL_STATES):
+                cells.extend(key_legend(legend, state) for legend in legends)
+        self.cells: Tuple[str, ...] = tuple(cells)
+        self.previews: Tuple[str, ...] = tuple(
+            PREVIEW_SEPARATOR.join(f"{language.value} {char}"
+                                   for language, char in zip(self.languages, self.row(row)))
+            for row in range(len(self.keys) * LABEL_STATES))
+        # Символ -> клавиша для каждой раскладки; символ другой раскладки тоже
+        # находит клавишу, но символы своей раскладки важнее
+        own = [{} for _ in self.languages]
+        for index in range(len(self.keys)):
+            for state in range(LABEL_STATES):
+                for column, char in enumerate(self.row(index * LABEL_STATES + state)):
+                    own[column].setdefault(char, index)
+        self.indexes: Dict[Language, Dict[str, int]] = {}
+        for column, language in enumerate(self.languages):
+            index = {}
+            for other in reversed(own):
+                index.update(other)
+            index.update(own[column])
+            self.indexes[language] = index
+
+    def row(self, row: int) -> Tuple[str, ...]:
+        """
+        Строка матрицы: символы клавиши во всех раскладках
+
+        Args:
+            row: Номер строки (клавиша * LABEL_STATES + состояние)
+
+        Returns:
+            Tuple[str, ...]: Символ в каждой раскладке (в порядке languages)
+        """
+        width = len(self.languages)
+        return self.cells[row * width:(row + 1) * width]
+
+    def find_row(self, language: Language, char: str, state: int) -> Optional[int]:
+        """
+        Строка для нажатой клавиши
+
+        Args:
+            language: Раскладка, на которой нажата клавиша
+            char: Символ нажатой клавиши
+            state: Состояние подписей (Shift и Caps Lock)
+
+        Returns:
+            Optional[int]: Номер строки или None, если клавиша не символьная
+        """
+        index = self.indexes[language].get(char)
+        if index is None:
+            return None
+        return index * LABEL_STATES + state
+
+
+@lru_cache(maxsize=None)
+def compile_matrix() -> LayoutMatrix:
+    """
+    Матрица всех раскладок (строится один раз)
+
+    Returns:
+        LayoutMatrix: Матрица по клавишам английской раскладки и LAYOUT_MAPS
+    """
+    return LayoutMatrix(_physical_keys(EnglishLayoutConfig.LAYOUT), LAYOUT_MAPS)
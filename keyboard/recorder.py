@@ -0,0 +1,109 @@
+"""
+Модуль записи сеанса набора
+Сохраняет все нажатия и отпускания клавиш в двоичный файл для офлайн-анализа
+
+Формат файла:
+    сигнатура SESSION_MAGIC (8 байт)
+    длина таблицы специальных клавиш (uint32, little-endian)
+    таблица: названия специальных клавиш pynput через '\\n' (UTF-8)
+    записи KeyEvent.pack() из events.py (по 20 байт, до конца файла)
+
+Таблица хранится в файле, потому что порядок членов pynput.keyboard.Key
+зависит от платформы, а анализ может выполняться на другой машине
+"""
+
+# Импортируем модуль struct для длины таблицы
+import struct
+# Импортируем модуль threading для блокировки записи
+import threading
+# Импортируем типы для аннотации
+from typing import List, Tuple
+
+# Импортируем запись события и таблицу специальных клавиш
+from .events import EVENT_STRUCT, KeyEvent, special_key_names
+
+# Сигнатура файла сеанса
+SESSION_MAGIC = b'VKSESS1\n'
+# Длина таблицы специальных клавиш
+TABLE_LENGTH = struct.Struct('<I')
+# Размер буфера записи (в событиях): файл пишется пачками, а не по событию
+RECORD_BUFFER_EVENTS = 256
+
+
+def write_session_header(f, special_names: Tuple[str, ...]):
+    """
+    Запись заголовка файла сеанса
+
+    Args:
+        f: Двоичный файл, открытый на запись
+        special_names: Названия специальных клавиш в порядке их кодов
+    """
+    table = '\n'.join(special_names).encode('utf-8')
+    f.write(SESSION_MAGIC)
+    f.write(TABLE_LENGTH.pack(len(table)))
+    f.write(table)
+
+
+def read_session_header(f) -> Tuple[List[str], int]:
+    """
+    Чтение заголовка файла сеанса
+
+    Args:
+        f: Двоичный файл, открытый на чтение
+
+    Returns:
+        Tuple[List[str], int]: (названия специальных клавиш, смещение первой записи)
+
+    Raises:
+        ValueError: Если файл не является записью сеанса
+    """
+    if f.read(len(SESSION_MAGIC)) != SESSION_MAGIC:
+        raise ValueError("Not a keyboard session file")
+    (length,) = TABLE_LENGTH.unpack(f.read(TABLE_LENGTH.size))
+    table = f.read(length).decode('utf-8')
+    return table.split('\n') if table else [], len(SESSION_MAGIC) + TABLE_LENGTH.size + length
+
+
+class SessionRecorder:
+    """Запись событий клавиатуры в файл сеанса (вызывается из потока слушателя)"""
+
+    def __init__(self, path: str):
+        """
+        Открытие файла сеанса
+
+        Args:
+            path: Путь к создаваемому файлу
+        """
+        self._file = open(path, 'wb')
+        write_session_header(self._file, special_key_names())
+        self._buffer = bytearray()
+        self._lock = threading.Lock()
+        # Количество записанных событий
+        self.events = 0
+
+    def record(self, event: KeyEvent):
+        """
+        Запись события
+
+        Args:
+            event: Событие нажатия или отпускания
+        """
+        data = event.pack()
+        with self._lock:
+            if self._file is None:
+                return
+            self._buffer += data
+            self.events += 1
+            if len(self._buffer) >= RECORD_BUFFER_EVENTS * EVENT_STRUCT.size:
+                self._file.write(self._buffer)
+                self._buffer.clear()
+
+    def close(self):
+        """Запись остатка буфера и закрытие файла"""
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(self._buffer)
+            self._buffer.clear()
+            self._file.close()
+            self._file = None
@@ -12,6 +12,20 @@ from .config import Language
 class LanguageDetector:
     """Сервис для определения языка клавиатуры"""
 
+    @staticmethod
+    def is_supported() -> bool:
+        """
+        Можно ли узнать раскладку у ОС (только Windows API)
+
+        Returns:
+            bool: True, если get_current_language опрашивает ОС, а не возвращает ENGLISH
+        """
+        try:
+            ctypes.WinDLL('user32')
+            return True
+        except (AttributeError, OSError):
+            return False
+
     @staticmethod
     def get_current_language() -> Language:
         """
@@ -81,4 +95,34 @@ class CapsLockDetector:
         except Exception:
             # Если произошла ошибка при работе с Windows API,
             # возвращаем False (Caps Lock выключен) как безопасное значение
-            return False
\ No newline at end of file
+            return False
+
+
+class WindowFocusService:
+    """Сервис для окна, которое не забирает фокус ввода"""
+
+    @staticmethod
+    def make_non_activating(root) -> bool:
+        """
+        Запрет активации окна щелчком мыши (Windows API)
+
+        Без него щелчок по кнопке делает окно клавиатуры активным, и
+        введённые нажатия попадают в него, а не в приложение пользователя
+
+        Args:
+            root: Главное окно Tkinter (уже созданное)
+
+        Returns:
+            bool: True, если стиль окна изменён (False - не Windows)
+        """
+        try:
+            user32 = ctypes.WinDLL('user32', use_last_error=True)
+            # Стиль ставится окну верхнего уровня, которое Tk создаёт над своим
+            root.update_idletasks()
+            hwnd = user32.GetParent(root.winfo_id())
+            # GWL_EXSTYLE = -20, WS_EX_NOACTIVATE = 0x08000000
+            style = user32.GetWindowLongW(hwnd, -20)
+            user32.SetWindowLongW(hwnd, -20, style | 0x08000000)
+            return True
+        except (AttributeError, OSError):
+            return False
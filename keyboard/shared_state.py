@@ -0,0 +1,374 @@
+"""
+Модуль экспорта состояния клавиатуры в разделяемую память
+Внешние программы (оверлеи OBS, панели, тестовые стенды) читают нажатые
+клавиши, модификаторы, раскладку и набранный текст без окна и без сокетов
+
+Сегмент multiprocessing.shared_memory имеет фиксированную разметку
+(little-endian):
+    HEADER (16 байт): сигнатура SEGMENT_MAGIC, версия, число клавиш, счётчик seq
+    STATE (40 байт): раскладка, модификаторы, длина текста, seq изменения
+        текста, seq изменения названий клавиш, маска нажатых клавиш
+    названия клавиш: MAX_KEYS ячеек по KEY_NAME_BYTES (UTF-8, дополнены нулями)
+    текст: TEXT_BYTES байт UTF-8 (хвост набранного текста)
+
+Запись защищена seqlock: писатель делает seq нечётным, обновляет поля на
+месте и делает seq чётным. Читатель повторяет чтение, если seq был нечётным
+или изменился за время чтения. Чтение - обращения к отображённой памяти без
+системных вызовов; текст и названия клавиш копируются, только когда
+изменились (по своим seq)
+"""
+
+# Импортируем модуль argparse для разбора параметров командной строки
+import argparse
+# Импортируем модуль struct для разметки сегмента
+import struct
+# Импортируем модуль time для интервала опроса в командной строке
+import time
+# Импортируем разделяемую память и трекер ресурсов
+from multiprocessing import resource_tracker, shared_memory
+# Импортируем типы для аннотации
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Импортируем конфигурацию UI (длительность кадра) и перечисление языков
+from .config import Language, UIConfig
+# Импортируем длину маски нажатых клавиш (та же, что у трансляции)
+from .broadcast import KEY_MASK_BYTES
+# Импортируем биты модификаторов (общие для всего пакета)
+from .events import MOD_ALT, MOD_CTRL, MOD_SHIFT, MOD_WIN
+# Импортируем базовый класс наблюдателя и перебор битов маски
+from .state import StateObserver, iter_bits
+
+# Сигнатура и версия разметки сегмента (версия 2 - биты модификаторов из events.py)
+SEGMENT_MAGIC = b'VKBS'
+SEGMENT_VERSION = 2
+# Заголовок: сигнатура (4s), версия (H), число клавиш (H), счётчик seqlock (Q)
+HEADER = struct.Struct('<4sHHQ')
+# Смещение и формат числа клавиш (меняется вместе с названиями клавиш)
+KEY_COUNT_OFFSET = 6
+KEY_COUNT = struct.Struct('<H')
+# Смещение и формат счётчика seqlock
+SEQ_OFFSET = 8
+SEQ = struct.Struct('<Q')
+# Состояние: раскладка (2s), модификаторы (B), выравнивание, длина текста (I),
+# seq изменения текста (Q), seq изменения названий клавиш (Q), маска нажатых клавиш
+STATE = struct.Struct(f'<2sBxIQQ{KEY_MASK_BYTES}s')
+STATE_OFFSET = HEADER.size
+# Названия клавиш по индексу кнопки
+MAX_KEYS = KEY_MASK_BYTES * 8
+KEY_NAME_BYTES = 16
+NAMES_OFFSET = STATE_OFFSET + STATE.size
+# Хвост набранного текста
+TEXT_BYTES = 4096
+TEXT_OFFSET = NAMES_OFFSET + MAX_KEYS * KEY_NAME_BYTES
+# Полный размер сегмента
+SEGMENT_SIZE = TEXT_OFFSET + TEXT_BYTES
+
+# Биты модификаторов в сегменте: MOD_CTRL, MOD_ALT, MOD_SHIFT, MOD_WIN из events.py
+# и бит Caps Lock (Caps Lock - состояние, а не нажатая клавиша)
+MOD_CAPS_LOCK = 16
+EXPORTED_MODS = MOD_CTRL | MOD_ALT | MOD_SHIFT | MOD_WIN
+
+# Сколько раз читатель повторяет чтение, пока писатель обновляет сегмент
+READ_RETRIES = 100_000
+
+# Сегменты, созданные в этом процессе (их трекер ресурсов общий с читателями этого процесса)
+_OWN_SEGMENTS = set()
+
+
+def _key_names(buttons: Dict[str, List[int]]) -> List[str]:
+    """
+    Названия кнопок по индексу: первый зарегистрированный символ кнопки
+
+    Args:
+        buttons: Словарь визуализатора: символ -> индексы кнопок
+
+    Returns:
+        List[str]: Название каждой кнопки ('' - индекс не занят)
+    """
+    names: Dict[int, str] = {}
+    for symbol, indices in buttons.items():
+        for idx in indices:
+            names.setdefault(idx, symbol)
+    return [names.get(idx, '') for idx in range(max(names, default=-1) + 1)]
+
+
+def _encode_tail(text: str, limit: int) -> bytes:
+    """Хвост текста в UTF-8 не длиннее limit байт (без разрезанного символа в начале)"""
+    data = text.encode('utf-8')
+    if len(data) <= limit:
+        return data
+    return data[-limit:].decode('utf-8', 'ignore').encode('utf-8')
+
+
+class SharedStateExporter(StateObserver):
+    """
+    Писатель сегмента разделяемой памяти (главный поток)
+
+    Методы наблюдателя только запоминают новое состояние; сегмент
+    обновляется на месте не чаще одного раза за кадр
+    """
+
+    def __init__(self, root, name: str, visualizers: Dict[Language, object],
+                 caps_lock: Callable[[], bool]):
+        """
+        Создание сегмента
+
+        Args:
+            root: Главное окно Tk (для планирования записи)
+            name: Имя сегмента разделяемой памяти
+            visualizers: Визуализаторы раскладок (названия кнопок и модификаторов)
+            caps_lock: Функция состояния Caps Lock текущей раскладки
+        """
+        self.root = root
+        self.name = name
+        self.visualizers = visualizers
+        self.caps_lock = caps_lock
+        try:
+            self._shm = shared_memory.SharedMemory(name, create=True, size=SEGMENT_SIZE)
+        except FileExistsError:
+            # Сегмент остался от аварийно завершённого запуска
+            stale = shared_memory.SharedMemory(name)
+            stale.close()
+            stale.unlink()
+            self._shm = shared_memory.SharedMemory(name, create=True, size=SEGMENT_SIZE)
+        _OWN_SEGMENTS.add(name)
+        self._buf = self._shm.buf
+        self._seq = 0
+        HEADER.pack_into(self._buf, 0, SEGMENT_MAGIC, SEGMENT_VERSION, 0, 0)
+        # Последнее состояние, ещё не записанное в сегмент
+        self._keys = 0
+        self._text = ""
+        self._language = Language.ENGLISH
+        self._text_dirty = True
+        self._layout_dirty = True
+        # Нажатые модификаторы (KeyEvent.mods последнего события)
+        self._mods = 0
+        self._flush_pending = False
+
+    def on_keys_changed(self, down: int):
+        """Новая карта нажатых клавиш"""
+        self._keys = down
+        self._schedule()
+
+    def on_text_changed(self, text: str):
+        """Новый набранный текст"""
+        self._text = text
+        self._text_dirty = True
+        self._schedule()
+
+    def set_modifiers(self, mods: int):
+        """
+        Нажатые модификаторы (можно вызывать из потока слушателя)
+
+        Записываются вместе с картой нажатых клавиш, которая меняется при
+        том же событии
+
+        Args:
+            mods: Биты MOD_* из KeyEvent.mods
+        """
+        self._mods = mods & EXPORTED_MODS
+
+    def on_layout_changed(self, language: Language):
+        """Новая раскладка (названия кнопок перечитываются при записи)"""
+        self._language = language
+        self._layout_dirty = True
+        self._schedule()
+
+    def _schedule(self):
+        """Планирование записи на следующий кадр (не более одной в очереди)"""
+        if not self._flush_pending:
+            self._flush_pending = True
+            self.root.after(UIConfig.ANIMATION_FRAME_MS, self.flush)
+
+    def flush(self):
+        """Запись накопленного состояния в сегмент под seqlock"""
+        self._flush_pending = False
+        if self._buf is None:
+            return
+        buf = self._buf
+        names = None
+        if self._layout_dirty:
+            buttons = self.visualizers[self._language].buttons
+            if buttons:
+                names = _key_names(buttons)[:MAX_KEYS]
+        modifiers = self._mods | (MOD_CAPS_LOCK if self.caps_lock() else 0)
+        # Нечётный seq: читатели повторят чтение, пока запись не закончится
+        self._seq += 1
+        SEQ.pack_into(buf, SEQ_OFFSET, self._seq)
+        _, _, text_length, text_seq, names_seq, _ = STATE.unpack_from(buf, STATE_OFFSET)
+        if self._text_dirty:
+            data = _encode_tail(self._text, TEXT_BYTES)
+            buf[TEXT_OFFSET:TEXT_OFFSET + len(data)] = data
+            text_length, text_seq = len(data), self._seq + 1
+            self._text_dirty = False
+        if names is not None:
+            buf[NAMES_OFFSET:TEXT_OFFSET] = bytes(MAX_KEYS * KEY_NAME_BYTES)
+            for idx, name in enumerate(names):
+                data = name.encode('utf-8')[:KEY_NAME_BYTES]
+                start = NAMES_OFFSET + idx * KEY_NAME_BYTES
+                buf[start:start + len(data)] = data
+            KEY_COUNT.pack_into(buf, KEY_COUNT_OFFSET, len(names))
+            names_seq = self._seq + 1
+            self._layout_dirty = False
+        STATE.pack_into(buf, STATE_OFFSET, self._language.value.encode('ascii'), modifiers,
+                        text_length, text_seq, names_seq,
+                        (self._keys & ((1 << MAX_KEYS) - 1)).to_bytes(KEY_MASK_BYTES, 'little'))
+        self._seq += 1
+        SEQ.pack_into(buf, SEQ_OFFSET, self._seq)
+
+    def close(self):
+        """Удаление сегмента"""
+        if self._buf is None:
+            return
+        self._buf = None
+        self._shm.close()
+        self._shm.unlink()
+        _OWN_SEGMENTS.discard(self.name)
+
+
+class SharedStateSnapshot:
+    """Согласованный снимок состояния (обновляется читателем на месте)"""
+
+    __slots__ = ('seq', 'language', 'modifiers', 'keys', 'key_names', 'text')
+
+    def __init__(self):
+        self.seq = 0
+        self.language = Language.ENGLISH
+        self.modifiers = 0
+        # Битовая карта нажатых клавиш (индексы - как в key_names)
+        self.keys = 0
+        self.key_names: Tuple[str, ...] = ()
+        self.text = ""
+
+    def pressed(self) -> List[str]:
+        """Названия нажатых клавиш"""
+        return [self.key_names[idx] for idx in iter_bits(self.keys) if idx < len(self.key_names)]
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    Подключение к существующему сегменту без передачи его трекеру ресурсов
+
+    Трекер удалил бы сегмент при выходе читателя (Python < 3.13 не умеет track=False).
+    Сегмент, созданный в этом же процессе (или его родителе), уже учтён писателем
+    """
+    try:
+        return shared_memory.SharedMemory(name, track=False)
+    except TypeError:
+        shm = shared_memory.SharedMemory(name)
+        if name not in _OWN_SEGMENTS:
+            resource_tracker.unregister(shm._name, 'shared_memory')
+        return shm
+
+
+class SharedStateReader:
+    """
+    Читатель сегмента (любой процесс)
+
+    read() возвращает один и тот же объект снимка, обновлённый на месте;
+    текст и названия клавиш копируются, только когда писатель их изменил
+    """
+
+    __slots__ = ('name', '_shm', '_buf', 'snapshot', '_text_seq', '_names_seq', 'retries')
+
+    def __init__(self, name: str):
+        """
+        Args:
+            name: Имя сегмента (main.py --shared-state)
+
+        Raises:
+            FileNotFoundError: Если клавиатура не запущена с экспортом
+            ValueError: Если разметка сегмента другой версии
+        """
+        self.name = name
+        self._shm = _attach(name)
+        self._buf = self._shm.buf
+        magic, version, _, _ = HEADER.unpack_from(self._buf, 0)
+        if magic != SEGMENT_MAGIC or version != SEGMENT_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported shared state segment: {magic!r} v{version}")
+        self.snapshot = SharedStateSnapshot()
+        self._text_seq = 0
+        self._names_seq = 0
+        # Количество повторов чтения из-за одновременной записи (диагностика)
+        self.retries = 0
+
+    def read(self) -> SharedStateSnapshot:
+        """
+        Согласованное чтение состояния
+
+        Returns:
+            SharedStateSnapshot: Снимок (тот же объект при каждом вызове)
+
+        Raises:
+            TimeoutError: Если писатель завис посреди записи
+        """
+        buf = self._buf
+        snapshot = self.snapshot
+        for _ in range(READ_RETRIES):
+            seq = SEQ.unpack_from(buf, SEQ_OFFSET)[0]
+            if seq & 1:
+                self.retries += 1
+                continue
+            if seq == snapshot.seq:
+                # Ничего не изменилось с прошлого чтения
+                return snapshot
+            layout, modifiers, text_length, text_seq, names_seq, keys = STATE.unpack_from(buf, STATE_OFFSET)
+            text = snapshot.text
+            if text_seq != self._text_seq:
+                text = bytes(buf[TEXT_OFFSET:TEXT_OFFSET + min(text_length, TEXT_BYTES)]).decode('utf-8', 'replace')
+            key_names = snapshot.key_names
+            if names_seq != self._names_seq:
+                count = min(KEY_COUNT.unpack_from(buf, KEY_COUNT_OFFSET)[0], MAX_KEYS)
+                key_names = tuple(bytes(buf[NAMES_OFFSET + idx * KEY_NAME_BYTES:
+                                            NAMES_OFFSET + (idx + 1) * KEY_NAME_BYTES])
+                                  .rstrip(b'\0').decode('utf-8', 'replace') for idx in range(count))
+            if SEQ.unpack_from(buf, SEQ_OFFSET)[0] != seq:
+                # Писатель изменил сегмент во время чтения
+                self.retries += 1
+                continue
+            snapshot.seq = seq
+            snapshot.language = Language(layout.decode('ascii'))
+            snapshot.modifiers = modifiers
+            snapshot.keys = int.from_bytes(keys, 'little')
+            snapshot.text = text
+            snapshot.key_names = key_names
+            self._text_seq = text_seq
+            self._names_seq = names_seq
+            return snapshot
+        raise TimeoutError("Shared state writer is stuck in an update")
+
+    def close(self):
+        """Отключение от сегмента (сам сегмент удаляет писатель)"""
+        if self._buf is None:
+            return
+        self._buf = None
+        self._shm.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    """Точка входа командной строки: печать состояния при каждом изменении"""
+    parser = argparse.ArgumentParser(prog='python -m keyboard.shared_state',
+                                     description="Чтение состояния клавиатуры из разделяемой памяти")
+    parser.add_argument('name', nargs='?', default=UIConfig.SHARED_STATE_NAME, help="имя сегмента")
+    parser.add_argument('--interval', type=float, default=UIConfig.ANIMATION_FRAME_MS / 1000,
+                        help="интервал опроса в секундах")
+    args = parser.parse_args(argv)
+    reader = SharedStateReader(args.name)
+    last_seq = -1
+    try:
+        while True:
+            snapshot = reader.read()
+            if snapshot.seq != last_seq:
+                last_seq = snapshot.seq
+                print(f"{snapshot.language.value} mod={snapshot.modifiers:05b} "
+                      f"keys={' '.join(snapshot.pressed()) or '-'} text={snapshot.text[-40:]!r}")
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        reader.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+"""
+Модуль состояния клавиш
+Содержит битовую карту нажатых клавиш, общую для потока слушателя и GUI
+"""
+
+# Импортируем модуль threading для блокировки при изменении карты
+import threading
+# Импортируем типы для аннотации
+from typing import Iterable, Iterator, Tuple
+
+
+def mask_of(indices: Iterable[int]) -> int:
+    """
+    Построение битовой маски из индексов клавиш
+
+    Args:
+        indices: Индексы клавиш
+
+    Returns:
+        int: Маска, в которой установлены биты с указанными индексами
+    """
+    mask = 0
+    for idx in indices:
+        mask |= 1 << idx
+    return mask
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """
+    Перебор индексов установленных битов маски
+
+    Args:
+        mask: Битовая маска
+
+    Yields:
+        int: Индекс очередного установленного бита (от младшего к старшему)
+    """
+    while mask:
+        # Выделяем младший установленный бит
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class KeyStateBitmap:
+    """
+    Битовая карта нажатых клавиш
+
+    Бит с номером i установлен, пока клавиша с индексом i удерживается.
+    Изменяется из потока слушателя (press/release), читается в потоке GUI.
+    Кроме текущей карты копятся отпущенные с прошлого кадра клавиши и число
+    событий: по ним кадр отличает короткие нажатия от перегрузки
+    """
+
+    __slots__ = ('_lock', 'down', 'released', 'events')
+
+    def __init__(self):
+        """Инициализация пустой карты (все клавиши отпущены)"""
+        # Блокировка для атомарного изменения карты
+        self._lock = threading.Lock()
+        # Текущая карта нажатых клавиш
+        self.down = 0
+        # Клавиши, отпущенные после последнего кадра
+        self.released = 0
+        # Количество нажатий и отпусканий после последнего кадра
+        self.events = 0
+
+    def press(self, mask: int):
+        """
+        Отметка клавиш как нажатых
+
+        Args:
+            mask: Маска нажатых клавиш
+        """
+        with self._lock:
+            self.down |= mask
+            self.events += 1
+
+    def release(self, mask: int):
+        """
+        Отметка клавиш как отпущенных
+
+        Args:
+            mask: Маска отпущенных клавиш
+        """
+        with self._lock:
+            self.down &= ~mask
+            self.released |= mask
+            self.events += 1
+
+    def clear(self):
+        """Отметка всех клавиш как отпущенных"""
+        with self._lock:
+            self.down = 0
+            self.released = 0
+            self.events = 0
+
+    def take(self) -> Tuple[int, int, int]:
+        """
+        Чтение карты для кадра со сбросом накопленных событий
+
+        Returns:
+            Tuple[int, int, int]: (нажатые клавиши, отпущенные с прошлого кадра, число событий)
+        """
+        with self._lock:
+            state = (self.down, self.released, self.events)
+            self.released = 0
+            self.events = 0
+        return state
+
+    def set(self, down: int):
+        """
+        Замена всей карты (используется зеркалом трансляции)
+
+        Args:
+            down: Новая битовая карта нажатых клавиш
+        """
+        with self._lock:
+            self.down = down
+
+
+class HeldKey:
+    """
+    Удерживаемая клавиша
+
+    Автоповтор ОС не зажигает кнопки заново, а только увеличивает счётчик
+    повторов; отпускание гасит кнопки, зажжённые первым нажатием
+    """
+
+    __slots__ = ('mask', 'repeats')
+
+    def __init__(self, mask: int):
+        """
+        Args:
+            mask: Маска кнопок клавиши (0 - клавиши нет на виртуальной клавиатуре)
+        """
+        self.mask = mask
+        # Количество событий автоповтора с момента нажатия
+        self.repeats = 0
+
+
+class StateObserver:
+    """
+    Наблюдатель состояния клавиатуры
+
+    Получает изменения карты нажатых клавиш, набранного текста и раскладки.
+    Методы вызываются в главном потоке GUI и не должны блокировать его
+    """
+
+    def on_keys_changed(self, down: int):
+        """
+        Изменилась карта нажатых клавиш (вызывается не чаще одного раза за кадр)
+
+        Args:
+            down: Битовая карта нажатых клавиш
+        """
+        pass
+
+    def on_text_changed(self, text: str):
+        """
+        Изменился набранный текст
+
+        Args:
+            text: Текущий набранный текст
+        """
+        pass
+
+    def on_layout_changed(self, language):
+        """
+        Переключилась раскладка
+
+        Args:
+            language: Новый язык (Language)
+        """
+        pass
@@ -0,0 +1,324 @@
+"""
+Модуль текстовых дисплеев
+Содержит дисплей на tk.Label (перерисовка строки целиком), прокручиваемый
+дисплей на tk.Text (пошаговые вставки и удаления) и дисплей тренажёра
+(текст урока с отметками набранного)
+"""
+
+# Импортируем модуль tkinter для создания виджетов
+import tkinter as tk
+# Импортируем типы для аннотации
+from typing import List, Mapping, Optional
+
+# Импортируем конфигурацию UI
+from .config import UIConfig
+# Импортируем сопоставление с уроком и загрузку урока
+from .tutor import LessonLines, TypingAlignment, common_prefix, load_lesson
+
+
+class LabelTextDisplay:
+    """Текстовый дисплей фиксированной ширины на tk.Label"""
+
+    # Параметры виджета, задаваемые темой: параметр -> константа UIConfig
+    THEME_OPTIONS = (('bg', 'BG_DARK'), ('fg', 'FG_HIGHLIGHT'))
+
+    def __init__(self, parent: tk.Widget, typed_text: str, font_size: int):
+        """
+        Создание дисплея
+
+        Args:
+            parent: Родительский виджет
+            typed_text: Начальный текст
+            font_size: Размер шрифта
+        """
+        self.widget = tk.Label(
+            parent,
+            text=typed_text if typed_text else " ",
+            bg=UIConfig.BG_DARK,
+            fg=UIConfig.FG_HIGHLIGHT,
+            font=(UIConfig.FONT_FAMILY_MONO, font_size, 'bold'),
+            relief=tk.SUNKEN,
+            borderwidth=2,
+            anchor='center',
+            padx=UIConfig.PADDING,
+            pady=8,
+            width=50
+        )
+
+    def set_text(self, text: str):
+        """Замена всего текста"""
+        self.widget.config(text=text if text else " ")
+
+    def insert(self, chars: str, text: str):
+        """
+        Добавление символов в конец
+
+        Args:
+            chars: Добавленные символы
+            text: Полный текст после добавления (Label умеет только заменять текст целиком)
+        """
+        self.set_text(text)
+
+    def delete(self, count: int, text: str):
+        """
+        Удаление символов с конца
+
+        Args:
+            count: Количество удалённых символов
+            text: Полный текст после удаления
+        """
+        self.set_text(text)
+
+
+class ScrollingTextDisplay:
+    """
+    Прокручиваемый текстовый дисплей на tk.Text
+
+    Каждое изменение применяется как вставка или удаление в конце текста,
+    поэтому стоимость нажатия не зависит от длины набранного текста.
+    Дисплей всегда прокручен к концу и хранит не более limit символов
+    """
+
+    # Параметры виджета, задаваемые темой: параметр -> константа UIConfig
+    THEME_OPTIONS = (('bg', 'BG_DARK'), ('fg', 'FG_HIGHLIGHT'), ('insertbackground', 'BG_DARK'))
+
+    def __init__(self, parent: tk.Widget, typed_text: str, font_size: int, limit: int):
+        """
+        Создание дисплея
+
+        Args:
+            parent: Родительский виджет
+            typed_text: Начальный текст
+            font_size: Размер шрифта
+            limit: Максимальное количество хранимых символов
+        """
+        self.limit = limit
+        self.widget = tk.Text(
+            parent,
+            bg=UIConfig.BG_DARK,
+            fg=UIConfig.FG_HIGHLIGHT,
+            insertbackground=UIConfig.BG_DARK,
+            font=(UIConfig.FONT_FAMILY_MONO, font_size, 'bold'),
+            relief=tk.SUNKEN,
+            borderwidth=2,
+            padx=UIConfig.PADDING,
+            pady=8,
+            height=UIConfig.SCROLL_TEXT_LINES,
+            width=50,
+            wrap='char'
+        )
+        # Дисплей только для чтения: отменяем ввод с клавиатуры в сам виджет
+        self.widget.bind('<Key>', lambda event: 'break')
+        # Количество символов в виджете (без завершающего перевода строки Tk)
+        self.length = 0
+        self.set_text(typed_text)
+
+    def set_text(self, text: str):
+        """Замена всего текста (при создании и очистке)"""
+        self.widget.delete('1.0', 'end')
+        self.length = 0
+        self.insert(text, text)
+
+    def insert(self, chars: str, text: str):
+        """
+        Добавление символов в конец
+
+        Args:
+            chars: Добавленные символы
+            text: Полный текст после добавления (не используется)
+        """
+        if not chars:
+            return
+        self.widget.insert('end-1c', chars)
+        self.length += len(chars)
+        # Отбрасываем начало текста сверх предела
+        overflow = self.length - self.limit
+        if overflow > 0:
+            self.widget.delete('1.0', f'1.0 + {overflow} chars')
+            self.length = self.limit
+        self.widget.see('end')
+
+    def delete(self, count: int, text: str):
+        """
+        Удаление символов с конца
+
+        Args:
+            count: Количество удалённых символов
+            text: Полный текст после удаления (не используется)
+        """
+        count = min(count, self.length)
+        if count <= 0:
+            return
+        self.widget.delete(f'end-{count + 1}c', 'end-1c')
+        self.length -= count
+        self.widget.see('end')
+
+
+class TutorTextDisplay:
+    """
+    Дисплей тренажёра на tk.Text: текст урока с отметками набранного
+
+    Верно набранные символы урока окрашиваются тегом 'typed', ошибки -
+    тегом 'error', следующий символ отмечается тегом 'next'; символы сверх
+    урока дописываются в конец как ошибки. Урок разбит на строки по словам
+    (очень длинную строку tk.Text переносит медленно), и каждое изменение
+    перекрашивает только затронутые символы
+    """
+
+    # Параметры виджета, задаваемые темой (ненабранный текст урока - цветом подсказок)
+    THEME_OPTIONS = (('bg', 'BG_DARK'), ('fg', 'FG_COMPLETION'), ('insertbackground', 'BG_DARK'))
+
+    def __init__(self, parent: tk.Widget, typed_text: str, font_size: int, lesson: str):
+        """
+        Создание дисплея
+
+        Args:
+            parent: Родительский виджет
+            typed_text: Начальный набранный текст
+            font_size: Размер шрифта
+            lesson: Текст урока
+        """
+        self.alignment = TypingAlignment(lesson)
+        self.lines = LessonLines(lesson, UIConfig.TUTOR_LINE_LENGTH)
+        # Индекс виджета сразу после урока (дальше - символы сверх урока)
+        self._lesson_end = f'{len(self.lines.starts)}.{len(lesson) - self.lines.starts[-1]}'
+        # Набранные символы (для сравнения при замене всего текста)
+        self.typed: List[str] = []
+        self.widget = tk.Text(
+            parent,
+            bg=UIConfig.BG_DARK,
+            fg=UIConfig.FG_COMPLETION,
+            insertbackground=UIConfig.BG_DARK,
+            font=(UIConfig.FONT_FAMILY_MONO, font_size, 'bold'),
+            relief=tk.SUNKEN,
+            borderwidth=2,
+            padx=UIConfig.PADDING,
+            pady=8,
+            height=UIConfig.TUTOR_TEXT_LINES,
+            width=UIConfig.TUTOR_LINE_LENGTH,
+            wrap='none'
+        )
+        # Дисплей только для чтения: отменяем ввод с клавиатуры в сам виджет
+        self.widget.bind('<Key>', lambda event: 'break')
+        self.widget.insert('1.0', '\n'.join(self.lines.lines(lesson)))
+        # Теги создаются по возрастанию приоритета: отметка следующего символа - поверх всех
+        self.apply_colors(vars(UIConfig))
+        self.widget.tag_add('next', '1.0')
+        self.set_text(typed_text)
+
+    @property
+    def next_char(self) -> Optional[str]:
+        """Следующий символ урока (None - урок набран)"""
+        return self.alignment.next_char
+
+    def apply_colors(self, colors: Mapping[str, str]):
+        """
+        Цвета отметок (при создании и смене темы)
+
+        Args:
+            colors: Цвета с именами констант UIConfig
+        """
+        self.widget.tag_configure('typed', foreground=colors['FG_HIGHLIGHT'])
+        self.widget.tag_configure('error', foreground=colors['FG_ERROR'], underline=True)
+        self.widget.tag_configure('next', background=colors['KEY_TARGET_COLOR'])
+
+    def set_text(self, text: str):
+        """
+        Замена всего набранного текста (очистка, конец пачки правок)
+
+        Перекрашиваются только символы после общего начала старого и нового
+        текста; пустой текст начинает урок заново
+        """
+        common = common_prefix(''.join(self.typed), text)
+        if common == 0 and self.typed:
+            self._restart()
+        else:
+            self.delete(len(self.typed) - common, text)
+        self.insert(text[common:], text)
+
+    def insert(self, chars: str, text: str):
+        """
+        Добавление символов в конец
+
+        Args:
+            chars: Добавленные символы
+            text: Полный текст после добавления (не используется)
+        """
+        for char in chars:
+            self._push(char)
+
+    def delete(self, count: int, text: str):
+        """
+        Удаление символов с конца
+
+        Args:
+            count: Количество удалённых символов
+            text: Полный текст после удаления (не используется)
+        """
+        for _ in range(min(count, len(self.typed))):
+            self._pop()
+
+    def _push(self, char: str):
+        """Набран символ: отметка его позиции и перенос отметки следующего символа"""
+        alignment = self.alignment
+        position = alignment.position
+        correct = alignment.push(char)
+        self.typed.append(char)
+        length = len(alignment.target)
+        if position >= length:
+            self.widget.insert('end-1c', char, 'error')
+            return
+        index = self.lines.index(position)
+        self.widget.tag_remove('next', index)
+        self.widget.tag_add('typed' if correct else 'error', index)
+        if position + 1 < length:
+            index = self.lines.index(position + 1)
+            self.widget.tag_add('next', index)
+        self.widget.see(index)
+
+    def _pop(self):
+        """Удалён последний символ: снятие его отметки"""
+        alignment = self.alignment
+        alignment.pop()
+        self.typed.pop()
+        position = alignment.position
+        length = len(alignment.target)
+        if position >= length:
+            self.widget.delete('end-2c')
+            return
+        if position + 1 < length:
+            self.widget.tag_remove('next', self.lines.index(position + 1))
+        index = self.lines.index(position)
+        self.widget.tag_remove('typed', index)
+        self.widget.tag_remove('error', index)
+        self.widget.tag_add('next', index)
+        self.widget.see(index)
+
+    def _restart(self):
+        """Снятие всех отметок одной командой на тег (новая попытка)"""
+        for tag in ('typed', 'error', 'next'):
+            self.widget.tag_remove(tag, '1.0', 'end')
+        self.widget.delete(self._lesson_end, 'end-1c')
+        self.alignment.reset()
+        self.typed.clear()
+        self.widget.tag_add('next', '1.0')
+        self.widget.see('1.0')
+
+
+def create_text_display(parent: tk.Widget, typed_text: str, font_size: int):
+    """
+    Создание текстового дисплея выбранного в UIConfig.TEXT_DISPLAY_MODE типа
+
+    Args:
+        parent: Родительский виджет
+        typed_text: Начальный текст
+        font_size: Размер шрифта
+
+    Returns:
+        LabelTextDisplay, ScrollingTextDisplay или TutorTextDisplay
+    """
+    if UIConfig.TEXT_DISPLAY_MODE == 'tutor':
+        return TutorTextDisplay(parent, typed_text, font_size, load_lesson(UIConfig.TUTOR_LESSON))
+    if UIConfig.TEXT_DISPLAY_MODE == 'scroll':
+        return ScrollingTextDisplay(parent, typed_text, font_size, UIConfig.SCROLL_TEXT_LENGTH)
+    return LabelTextDisplay(parent, typed_text, font_size)
@@ -0,0 +1,184 @@
+"""
+Модуль тем оформления
+Содержит встроенные темы (тёмная, светлая, контрастная) и их применение
+к уже построенной клавиатуре без её пересоздания
+
+Тема - набор цветов с теми же именами, что и константы UIConfig. При первом
+использовании тема компилируется: для обычных и акцентных клавиш заранее
+строятся таблицы цветов всех уровней подсветки. Смена темы - один проход
+по существующим виджетам с перенастройкой только цветов
+"""
+
+# Импортируем lru_cache для кэша скомпилированных тем
+from functools import lru_cache
+# Импортируем модуль tkinter для аннотации типа окна
+import tkinter as tk
+# Импортируем типы для аннотации
+from typing import Dict, Iterable, List, Tuple
+
+# Импортируем конфигурацию UI (текущие цвета и количество ступеней подсветки)
+from .config import UIConfig
+# Импортируем построение таблицы цветов подсветки
+from .animation import build_color_ramp
+
+# Встроенные темы: название -> цвета (имена констант UIConfig)
+THEMES: Dict[str, Dict[str, str]] = {
+    # Тёмная тема - исходные цвета UIConfig
+    'dark': {
+        'BG_COLOR': '#2b2b2b',
+        'BG_DARK': '#1a1a1a',
+        'FG_COLOR': '#ffffff',
+        'FG_HIGHLIGHT': '#00ff00',
+        'FG_BLACK': '#000000',
+        'FG_COMPLETION': '#aaaaaa',
+        'KEY_DEFAULT_COLOR': '#404040',
+        'KEY_ACCENT_COLOR': '#5a5a5a',
+        'KEY_PRESSED_COLOR': '#00ff00',
+        'KEY_DIM_COLOR': '#408040',
+        'KEY_TARGET_COLOR': '#1f5f99',
+        'FG_ERROR': '#ff5555',
+        'TITLE_COLOR_EN': '#4dabf7',
+        'TITLE_COLOR_RU': '#ff6b6b',
+    },
+    # Светлая тема
+    'light': {
+        'BG_COLOR': '#f0f0f0',
+        'BG_DARK': '#ffffff',
+        'FG_COLOR': '#202020',
+        'FG_HIGHLIGHT': '#0b6e2e',
+        'FG_BLACK': '#000000',
+        'FG_COMPLETION': '#707070',
+        'KEY_DEFAULT_COLOR': '#dcdcdc',
+        'KEY_ACCENT_COLOR': '#c4c4c4',
+        'KEY_PRESSED_COLOR': '#38b000',
+        'KEY_DIM_COLOR': '#a8d5a2',
+        'KEY_TARGET_COLOR': '#8ec5ff',
+        'FG_ERROR': '#d00000',
+        'TITLE_COLOR_EN': '#1c6fb8',
+        'TITLE_COLOR_RU': '#c92a2a',
+    },
+    # Контрастная тема: чёрный фон, белые подписи, жёлтая подсветка
+    'high-contrast': {
+        'BG_COLOR': '#000000',
+        'BG_DARK': '#000000',
+        'FG_COLOR': '#ffffff',
+        'FG_HIGHLIGHT': '#ffff00',
+        'FG_BLACK': '#000000',
+        'FG_COMPLETION': '#ffffff',
+        'KEY_DEFAULT_COLOR': '#000000',
+        'KEY_ACCENT_COLOR': '#303030',
+        'KEY_PRESSED_COLOR': '#ffff00',
+        'KEY_DIM_COLOR': '#808000',
+        'KEY_TARGET_COLOR': '#0000ff',
+        'FG_ERROR': '#ff0000',
+        'TITLE_COLOR_EN': '#00ffff',
+        'TITLE_COLOR_RU': '#ff00ff',
+    },
+}
+
+
+class CompiledTheme:
+    """Тема с заранее построенными таблицами цветов клавиш"""
+
+    __slots__ = ('name', 'colors', 'default_ramp', 'accent_ramp', 'target_ramp')
+
+    def __init__(self, name: str, colors: Dict[str, str]):
+        """
+        Args:
+            name: Название темы
+            colors: Цвета темы (имена констант UIConfig)
+        """
+        self.name = name
+        self.colors = colors
+        # Пары (фон, текст) по ступеням подсветки для обычных и акцентных клавиш
+        self.default_ramp = build_color_ramp(colors['KEY_DEFAULT_COLOR'], UIConfig.ANIMATION_STEPS, colors)
+        self.accent_ramp = build_color_ramp(colors['KEY_ACCENT_COLOR'], UIConfig.ANIMATION_STEPS, colors)
+        # Следующая клавиша урока тренажёра
+        self.target_ramp = build_color_ramp(colors['KEY_TARGET_COLOR'], UIConfig.ANIMATION_STEPS, colors)
+
+    def key_ramp(self, idx: int, accent_mask: int, target_mask: int = 0) -> List[Tuple[str, str]]:
+        """
+        Таблица цветов клавиши (отметка урока важнее акцента)
+
+        Args:
+            idx: Индекс клавиши
+            accent_mask: Битовая маска акцентных клавиш
+            target_mask: Битовая маска клавиш, отмеченных тренажёром
+
+        Returns:
+            List[Tuple[str, str]]: Таблица цветов клавиши
+        """
+        if target_mask >> idx & 1:
+            return self.target_ramp
+        return self.accent_ramp if accent_mask >> idx & 1 else self.default_ramp
+
+    def key_ramps(self, count: int, accent_mask: int, target_mask: int = 0) -> List[List[Tuple[str, str]]]:
+        """
+        Таблицы цветов для набора клавиш
+
+        Args:
+            count: Количество клавиш
+            accent_mask: Битовая маска акцентных клавиш
+            target_mask: Битовая маска клавиш, отмеченных тренажёром
+
+        Returns:
+            List[List[Tuple[str, str]]]: Таблица цветов каждой клавиши по индексу
+        """
+        return [self.key_ramp(idx, accent_mask, target_mask) for idx in range(count)]
+
+
+@lru_cache(maxsize=None)
+def compile_theme(name: str) -> CompiledTheme:
+    """
+    Скомпилированная тема (строится один раз на тему)
+
+    Args:
+        name: Название встроенной темы
+
+    Returns:
+        CompiledTheme: Тема с таблицами цветов
+
+    Raises:
+        ValueError: Если темы нет среди встроенных
+    """
+    if name not in THEMES:
+        raise ValueError(f"Unknown theme: {name}")
+    return CompiledTheme(name, THEMES[name])
+
+
+def use_theme(name: str) -> CompiledTheme:
+    """
+    Установка цветов темы в UIConfig (для виджетов, создаваемых после этого)
+
+    Args:
+        name: Название встроенной темы
+
+    Returns:
+        CompiledTheme: Установленная тема
+    """
+    theme = compile_theme(name)
+    for attr, color in theme.colors.items():
+        setattr(UIConfig, attr, color)
+    UIConfig.THEME = name
+    return theme
+
+
+def apply_theme(name: str, root: tk.Tk, visualizers: Iterable):
+    """
+    Смена темы построенной клавиатуры (главный поток)
+
+    Args:
+        name: Название встроенной темы
+        root: Главное окно приложения
+        visualizers: Визуализаторы всех раскладок (скрытые запомнят тему до показа)
+    """
+    theme = use_theme(name)
+    root.configure(bg=UIConfig.BG_COLOR)
+    for visualizer in visualizers:
+        visualizer.apply_theme(theme)
+
+
+def next_theme(name: str) -> str:
+    """Следующая по кругу встроенная тема (для клавиши смены темы)"""
+    names = list(THEMES)
+    return names[(names.index(name) + 1) % len(names)] if name in names else names[0]
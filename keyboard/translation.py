@@ -0,0 +1,79 @@
+"""
+Модуль перевода текста между раскладками
+Содержит таблицы str.translate, построенные один раз из EN_TO_RU_MAP
+"""
+
+# Импортируем типы для аннотации
+from typing import Dict, List
+
+# Импортируем перечисление языков и карту преобразования символов
+from .config import Language, RussianLayoutConfig
+
+
+def _as_sequence(table: Dict[int, str]) -> List[int]:
+    """
+    Таблица str.maketrans в виде списка кодов символов
+
+    str.translate принимает любую таблицу с индексированием: список до
+    максимального кода переводимого символа ищется быстрее словаря,
+    а символы за его концом (IndexError) остаются без изменений
+
+    Args:
+        table: Таблица str.maketrans
+
+    Returns:
+        List[int]: Код символа-результата для каждого кода символа
+    """
+    sequence = list(range(max(table) + 1))
+    for code, char in table.items():
+        sequence[code] = ord(char)
+    return sequence
+
+
+# Таблица EN -> RU: символ, набранный на английской раскладке, -> символ той же клавиши на русской
+EN_TO_RU_TABLE: List[int] = _as_sequence(str.maketrans(RussianLayoutConfig.EN_TO_RU_MAP))
+# Обратная таблица RU -> EN
+RU_TO_EN_TABLE: List[int] = _as_sequence(str.maketrans(
+    {ru: en for en, ru in RussianLayoutConfig.EN_TO_RU_MAP.items()}))
+
+# Таблица перевода по паре (язык набора, язык назначения)
+TABLES = {
+    (Language.ENGLISH, Language.RUSSIAN): EN_TO_RU_TABLE,
+    (Language.RUSSIAN, Language.ENGLISH): RU_TO_EN_TABLE,
+}
+
+# Символы, которые на каждой раскладке относятся к слову (переводятся на другую раскладку)
+WORD_CHARS = {
+    Language.ENGLISH: frozenset(RussianLayoutConfig.EN_TO_RU_MAP),
+    Language.RUSSIAN: frozenset(RussianLayoutConfig.EN_TO_RU_MAP.values()),
+}
+
+
+def other_language(language: Language) -> Language:
+    """
+    Вторая раскладка пары EN/RU
+
+    Args:
+        language: Язык раскладки
+
+    Returns:
+        Language: Другой язык
+    """
+    return Language.RUSSIAN if language == Language.ENGLISH else Language.ENGLISH
+
+
+def convert(text: str, source: Language, target: Language) -> str:
+    """
+    Перевод текста, набранного на раскладке source, в символы раскладки target
+
+    Args:
+        text: Исходный текст
+        source: Раскладка, на которой текст был набран
+        target: Раскладка, которую имел в виду пользователь
+
+    Returns:
+        str: Текст с заменёнными символами (остальные символы без изменений)
+    """
+    if source == target:
+        return text
+    return text.translate(TABLES[(source, target)])
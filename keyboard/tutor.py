@@ -0,0 +1,202 @@
+"""
+Модуль режима тренажёра
+Урок - целевой текст, который нужно набрать; набранный текст
+сопоставляется с ним по мере ввода
+
+Символ номер i набранного текста сравнивается с символом номер i урока.
+Результаты сравнений хранятся стеком, поэтому символ и Backspace
+обрабатываются за O(1): текст никогда не сравнивается с уроком заново
+целиком, сколько бы символов в уроке ни было
+"""
+
+# Импортируем bisect для поиска строки урока по позиции символа
+from bisect import bisect_right
+# Импортируем lru_cache для однократной загрузки урока
+from functools import lru_cache
+# Импортируем типы для аннотации
+from typing import List, Optional
+
+
+@lru_cache(maxsize=None)
+def load_lesson(path: str) -> str:
+    """
+    Загрузка урока из файла
+
+    Пробелы и переводы строк схлопываются в одиночные пробелы: Enter в
+    режиме тренажёра начинает урок заново, а не переводит строку
+
+    Args:
+        path: Путь к текстовому файлу (UTF-8)
+
+    Returns:
+        str: Текст урока
+
+    Raises:
+        OSError: Если файл не читается
+        ValueError: Если в файле нет текста
+    """
+    with open(path, encoding='utf-8') as f:
+        text = ' '.join(f.read().split())
+    if not text:
+        raise ValueError(f"Lesson is empty: {path}")
+    return text
+
+
+def wrap_lesson(text: str, width: int) -> List[int]:
+    """
+    Разбиение урока на строки по словам
+
+    Пробел в месте переноса остаётся в конце строки, поэтому каждый
+    символ урока попадает ровно в одну строку
+
+    Args:
+        text: Текст урока
+        width: Наибольшая длина строки (слово длиннее строки разрывается)
+
+    Returns:
+        List[int]: Позиции начала строк (первая - 0)
+    """
+    starts = [0]
+    start = 0
+    while len(text) - start > width:
+        cut = text.rfind(' ', start, start + width)
+        end = cut + 1 if cut > start else start + width
+        starts.append(end)
+        start = end
+    return starts
+
+
+class TypingAlignment:
+    """
+    Пошаговое сопоставление набранного текста с уроком
+
+    Хранит стек отметок набранных символов (1 - ошибка) и счётчики;
+    символы сверх урока считаются ошибками
+    """
+
+    __slots__ = ('target', 'marks', 'errors', 'mistakes', 'keystrokes')
+
+    def __init__(self, target: str):
+        """
+        Args:
+            target: Текст урока
+        """
+        self.target = target
+        # Отметки набранных символов по позициям
+        self.marks = bytearray()
+        # Неисправленные ошибки в набранном тексте
+        self.errors = 0
+        # Все ошибки попытки (исправленные тоже) и все набранные символы
+        self.mistakes = 0
+        self.keystrokes = 0
+
+    @property
+    def position(self) -> int:
+        """Количество набранных символов"""
+        return len(self.marks)
+
+    @property
+    def next_char(self) -> Optional[str]:
+        """Следующий символ урока (None - урок набран до конца)"""
+        position = len(self.marks)
+        return self.target[position] if position < len(self.target) else None
+
+    def push(self, char: str) -> bool:
+        """
+        Набран символ
+
+        Args:
+            char: Символ
+
+        Returns:
+            bool: True, если символ совпал с уроком
+        """
+        position = len(self.marks)
+        correct = position < len(self.target) and self.target[position] == char
+        self.marks.append(not correct)
+        self.keystrokes += 1
+        if not correct:
+            self.errors += 1
+            self.mistakes += 1
+        return correct
+
+    def pop(self) -> bool:
+        """
+        Удалён последний набранный символ (вызывать только при position > 0)
+
+        Returns:
+            bool: True, если удалённый символ был ошибкой
+        """
+        wrong = self.marks.pop()
+        self.errors -= wrong
+        return bool(wrong)
+
+    def reset(self):
+        """Начало новой попытки"""
+        self.marks.clear()
+        self.errors = 0
+        self.mistakes = 0
+        self.keystrokes = 0
+
+    def accuracy(self) -> float:
+        """Доля символов, набранных без ошибки с первого раза (за попытку)"""
+        return 1.0 - self.mistakes / self.keystrokes if self.keystrokes else 1.0
+
+
+class LessonLines:
+    """Позиции символов урока в строках дисплея (индексы tk.Text 'строка.столбец')"""
+
+    __slots__ = ('starts',)
+
+    def __init__(self, text: str, width: int):
+        """
+        Args:
+            text: Текст урока
+            width: Наибольшая длина строки дисплея
+        """
+        self.starts = wrap_lesson(text, width)
+
+    def lines(self, text: str) -> List[str]:
+        """Строки урока для вставки в виджет"""
+        bounds = self.starts + [len(text)]
+        return [text[bounds[i]:bounds[i + 1]] for i in range(len(self.starts))]
+
+    def index(self, position: int) -> str:
+        """
+        Индекс tk.Text символа урока (O(log строк))
+
+        Args:
+            position: Позиция символа в уроке
+
+        Returns:
+            str: Индекс вида 'строка.столбец'
+        """
+        line = bisect_right(self.starts, position)
+        return f'{line}.{position - self.starts[line - 1]}'
+
+
+def common_prefix(a: str, b: str) -> int:
+    """
+    Длина общего начала двух строк
+
+    Сравнение срезов выполняется в C; обычный случай (одна строка -
+    продолжение другой) - одно сравнение, иначе - двоичный поиск
+
+    Args:
+        a: Первая строка
+        b: Вторая строка
+
+    Returns:
+        int: Количество совпадающих первых символов
+    """
+    n = min(len(a), len(b))
+    if a[:n] == b[:n]:
+        return n
+    low, high = 0, n - 1
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[:middle] == b[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
@@ -7,16 +7,48 @@
 import tkinter as tk
 # Импортируем ABC и abstractmethod для создания абстрактных классов
 from abc import ABC, abstractmethod
+# Импортируем partial для обработчиков щелчка по кнопкам
+from functools import partial
 # Импортируем типы для аннотации: Dict, List, Tuple, Optional
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional, Union
 
 # Импортируем классы конфигурации UI и раскладок клавиатуры
-from .config import UIConfig, EnglishLayoutConfig, RussianLayoutConfig
+from .config import UIConfig, EnglishLayoutConfig, KeyboardLayoutConfig, Language, RussianLayoutConfig
+# Импортируем счётчики перегрузки
+from .overload import OverloadCounters
+# Импортируем единые часы анимации подсветки
+from .animation import HighlightAnimator
+# Импортируем битовую карту нажатых клавиш и функции работы с масками
+from .state import KeyStateBitmap, StateObserver, iter_bits, mask_of
+# Импортируем скомпилированную тему оформления и компиляцию текущей темы
+from .themes import CompiledTheme, compile_theme
+# Импортируем кнопку-изображение из атласа клавиш
+from .keycaps import IMAGES_AVAILABLE, KeyCap
+# Импортируем таблицы подписей клавиш для состояний Shift и Caps Lock
+from .labels import LabelTable, compile_labels
+# Импортируем матрицу перевода клавиш между раскладками для предпросмотра
+from .preview import LayoutMatrix, compile_matrix
+# Импортируем текстовые дисплеи
+from .text_display import LabelTextDisplay, ScrollingTextDisplay, TutorTextDisplay, create_text_display
+
+
+# Символы урока, набираемые специальными клавишами: символ -> название клавиши
+TUTOR_KEY_NAMES = {' ': 'space', '\t': 'tab'}
 
 
 class BaseKeyboardVisualizer(ABC):
     """Абстрактный базовый класс для визуализации клавиатуры"""
 
+    # Фиксированный набор полей: без __dict__ у каждого экземпляра
+    __slots__ = ('root', 'buttons', 'button_widgets', 'button_colors', 'button_positions',
+                 'scale_factor', 'animator', 'key_state', '_rendered_keys', '_all_keys_mask',
+                 '_render_pending', 'observers', 'main_frame', 'text_display',
+                 'completions_enabled', 'completion_label', 'completions', 'layout_hint',
+                 'overload', '_batching', '_text_dirty', '_bar_dirty',
+                 'title_label', 'themed_widgets', '_accent_keys', '_target_keys', '_shift_symbols',
+                 'click_handler', 'labels', 'label_state', '_rendered_label_state',
+                 'preview_matrix', 'preview_label', 'preview_row', '_rendered_preview_row')
+
     def __init__(self, root: tk.Tk):
         """
         Инициализация базового визуализатора клавиатуры
@@ -26,23 +58,73 @@ class BaseKeyboardVisualizer(ABC):
         """
         # Сохраняем ссылку на главное окно
         self.root = root
-        # Словарь: символ клавиши -> список кнопок Label с этим символом
+        # Словарь: символ клавиши -> список индексов кнопок с этим символом
         # Используется для быстрого поиска кнопок по символу
-        self.buttons: Dict[str, List[tk.Label]] = {}
-        # Список всех виджетов-кнопок клавиатуры
+        self.buttons: Dict[str, List[int]] = {}
+        # Список всех виджетов-кнопок клавиатуры (единственное место, где хранятся кнопки)
         self.button_widgets: List[tk.Label] = []
-        # Словарь: кнопка -> её базовый цвет (для восстановления после подсветки)
-        self.button_colors: Dict[tk.Label, str] = {}
-        # Словарь: позиция (строка, колонка) -> кнопка в этой позиции
-        self.button_positions: Dict[Tuple[int, int], tk.Label] = {}
+        # Базовые цвета кнопок по индексу (для восстановления после подсветки)
+        self.button_colors: List[str] = []
+        # Словарь: позиция (строка, колонка) -> индекс кнопки в этой позиции
+        self.button_positions: Dict[Tuple[int, int], int] = {}
         # Коэффициент масштабирования для размеров шрифтов (по умолчанию 1.0)
         self.scale_factor = 1.0
-        # Список последних нажатых кнопок (для отслеживания и сброса подсветки)
-        self.last_pressed_buttons: List[tk.Label] = []
+        # Единые часы анимации подсветки всех клавиш
+        self.animator = HighlightAnimator(root)
+        # Битовая карта нажатых клавиш (обновляется из on_press и on_release)
+        self.key_state = KeyStateBitmap()
+        # Карта нажатых клавиш, отрисованная на предыдущем кадре
+        self._rendered_keys = 0
+        # Маска всех существующих кнопок (защита от индексов старой клавиатуры)
+        self._all_keys_mask = 0
+        # Флаг запланированной отрисовки карты (чтобы не планировать её дважды)
+        self._render_pending = False
+        # Наблюдатели состояния (трансляция, экспорт и т.п.)
+        self.observers: List[StateObserver] = []
         # Главный фрейм клавиатуры (может быть None до создания)
         self.main_frame: Optional[tk.Frame] = None
-        # Текстовое поле для отображения набранного текста (может быть None)
-        self.text_display: Optional[tk.Label] = None
+        # Текстовый дисплей для отображения набранного текста (может быть None)
+        self.text_display: Optional[Union[LabelTextDisplay, ScrollingTextDisplay, TutorTextDisplay]] = None
+        # Показывать строку подсказок (включается контроллером, если есть
+        # словарь автодополнения или проверка раскладки)
+        self.completions_enabled = False
+        # Строка подсказок (может быть None)
+        self.completion_label: Optional[tk.Label] = None
+        # Текущие подсказки (сохраняются при пересоздании клавиатуры)
+        self.completions: List[str] = []
+        # Исправление последнего слова, набранного не на той раскладке
+        self.layout_hint = ""
+        # Счётчики очереди правок и объединённой подсветки
+        self.overload = OverloadCounters()
+        # Заголовок (его цвет зависит от раскладки)
+        self.title_label: Optional[tk.Label] = None
+        # Виджеты оформления и их цвета из темы: (виджет, ((параметр, константа UIConfig), ...))
+        self.themed_widgets: List[Tuple[tk.Widget, Tuple[Tuple[str, str], ...]]] = []
+        # Битовая маска акцентных клавиш (клавиши основного ряда)
+        self._accent_keys = 0
+        # Битовая маска клавиш, отмеченных тренажёром (следующая клавиша урока)
+        self._target_keys = 0
+        # Символы, набираемые с Shift (вторые символы подписей 'a | b')
+        self._shift_symbols = set()
+        # Обработчик щелчка по кнопке (индекс кнопки, подпись); None - кнопки только отображают нажатия
+        self.click_handler: Optional[Callable[[int, str], None]] = None
+        # Подписи кнопок во всех состояниях Shift и Caps Lock (строятся один раз на раскладку)
+        self.labels: Optional[LabelTable] = None
+        # Состояние подписей (биты LABEL_SHIFT, LABEL_CAPS) и состояние, показанное кнопками
+        self.label_state = 0
+        self._rendered_label_state = 0
+        # Матрица перевода клавиш между раскладками (None - предпросмотр отключён)
+        self.preview_matrix: Optional[LayoutMatrix] = compile_matrix() if UIConfig.LAYOUT_PREVIEW else None
+        # Строка предпросмотра (может быть None)
+        self.preview_label: Optional[tk.Label] = None
+        # Строка матрицы последней символьной клавиши и строка, показанная на экране
+        self.preview_row: Optional[int] = None
+        self._rendered_preview_row: Optional[int] = None
+        # Идёт ли пачка правок (перерисовка дисплея и подсказок откладывается до её конца)
+        self._batching = False
+        # Изменились ли текст и подсказки во время пачки
+        self._text_dirty = False
+        self._bar_dirty = False
 
     @abstractmethod
     def get_layout(self) -> List[List[str]]:
@@ -68,6 +150,18 @@ class BaseKeyboardVisualizer(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_language(self) -> Language:
+        """
+        Возвращает язык раскладки (абстрактный метод)
+
+        Должен быть реализован в классах-наследниках
+
+        Returns:
+            Language: Язык раскладки визуализатора
+        """
+        pass
+
     @abstractmethod
     def get_title(self) -> str:
         """
@@ -126,8 +220,29 @@ class BaseKeyboardVisualizer(ABC):
         self._create_title()
         # Создаём текстовый дисплей для отображения набранного текста
         self._create_text_display(typed_text)
+        # Создаём строку подсказок (автодополнение и исправление раскладки)
+        self._create_completion_bar()
+        # Создаём строку предпросмотра клавиши на других раскладках
+        self._create_preview_bar()
         # Создаём раскладку клавиатуры (кнопки)
         self._create_keyboard_layout()
+        # Отмечаем следующую клавишу урока (в режиме тренажёра)
+        self._mark_next_key()
+
+    def destroy_keyboard(self):
+        """
+        Удаление визуальной клавиатуры (при переключении на другую раскладку)
+
+        Кроме фрейма освобождаются все ссылки на его виджеты, чтобы скрытая
+        раскладка не удерживала уничтоженные кнопки до следующего показа
+        """
+        if self.main_frame is not None:
+            self.main_frame.destroy()
+            self.main_frame = None
+        self._reset_internal_state()
+        self.text_display = None
+        self.completion_label = None
+        self.preview_label = None
 
     def _reset_internal_state(self):
         """
@@ -140,10 +255,21 @@ class BaseKeyboardVisualizer(ABC):
         self.buttons = {}
         # Очищаем список всех виджетов-кнопок
         self.button_widgets = []
-        # Очищаем словарь базовых цветов кнопок
-        self.button_colors = {}
+        # Очищаем список базовых цветов кнопок
+        self.button_colors = []
         # Очищаем словарь позиций кнопок
         self.button_positions = {}
+        # Новые кнопки создаются в базовом цвете - на них ещё ничего не отрисовано
+        self._rendered_keys = 0
+        self._all_keys_mask = 0
+        self._accent_keys = 0
+        self._target_keys = 0
+        self._shift_symbols = set()
+        # Забываем виджеты оформления старой клавиатуры
+        self.themed_widgets = []
+        self.title_label = None
+        # Останавливаем анимацию и отвязываем аниматор от старых кнопок
+        self.animator.bind([], [])
 
     def _create_main_frame(self):
         """Создание главного фрейма"""
@@ -151,11 +277,22 @@ class BaseKeyboardVisualizer(ABC):
                                    padx=0, pady=UIConfig.PADDING)
         self.main_frame.pack(fill=tk.BOTH, expand=True)
         self.main_frame.columnconfigure(0, weight=1)
+        self._add_themed(self.main_frame)
+
+    def _add_themed(self, widget: tk.Widget, options=(('bg', 'BG_COLOR'),)):
+        """
+        Регистрация виджета оформления для смены темы
+
+        Args:
+            widget: Виджет
+            options: Пары (параметр виджета, константа UIConfig с его цветом)
+        """
+        self.themed_widgets.append((widget, options))
 
     def _create_title(self):
         """Создание заголовка"""
         title_size = max(8, int(12 * self.scale_factor))
-        title_label = tk.Label(
+        self.title_label = tk.Label(
             self.main_frame,
             text=self.get_title(),
             bg=UIConfig.BG_COLOR,
@@ -163,35 +300,70 @@ class BaseKeyboardVisualizer(ABC):
             font=(UIConfig.FONT_FAMILY, title_size, 'bold'),
             pady=UIConfig.PADDING
         )
-        title_label.grid(row=0, column=0, sticky='ew', pady=(0, UIConfig.PADDING))
+        self.title_label.grid(row=0, column=0, sticky='ew', pady=(0, UIConfig.PADDING))
+        self._add_themed(self.title_label)
 
     def _create_text_display(self, typed_text: str):
         """Создание текстового дисплея"""
         text_size = max(12, int(20 * self.scale_factor))
-        self.text_display = tk.Label(
+        self.text_display = create_text_display(self.main_frame, typed_text, text_size)
+        self.text_display.widget.grid(row=1, column=0, sticky='ew', pady=(0, UIConfig.PADDING))
+        self._add_themed(self.text_display.widget, self.text_display.THEME_OPTIONS)
+
+    def _create_completion_bar(self):
+        """Создание строки подсказок автодополнения"""
+        self.completion_label = None
+        if not self.completions_enabled:
+            return
+        completion_size = max(10, int(14 * self.scale_factor))
+        self.completion_label = tk.Label(
+            self.main_frame,
+            text=self._format_suggestions(),
+            bg=UIConfig.BG_COLOR,
+            fg=UIConfig.FG_COMPLETION,
+            font=(UIConfig.FONT_FAMILY_MONO, completion_size),
+            anchor='center'
+        )
+        self.completion_label.grid(row=2, column=0, sticky='ew', pady=(0, UIConfig.PADDING))
+        self._add_themed(self.completion_label, (('bg', 'BG_COLOR'), ('fg', 'FG_COMPLETION')))
+
+    def _create_preview_bar(self):
+        """Создание строки предпросмотра: что нажатая клавиша ввела бы на каждой раскладке"""
+        self.preview_label = None
+        if self.preview_matrix is None:
+            return
+        preview_size = max(8, int(11 * self.scale_factor))
+        self.preview_label = tk.Label(
             self.main_frame,
-            text=typed_text if typed_text else " ",
-            bg=UIConfig.BG_DARK,
-            fg=UIConfig.FG_HIGHLIGHT,
-            font=(UIConfig.FONT_FAMILY_MONO, text_size, 'bold'),
-            relief=tk.SUNKEN,
-            borderwidth=2,
-            anchor='center',
-            padx=UIConfig.PADDING,
-            pady=8,
-            width=50
+            text=self._format_preview(),
+            bg=UIConfig.BG_COLOR,
+            fg=UIConfig.FG_COMPLETION,
+            font=(UIConfig.FONT_FAMILY_MONO, preview_size),
+            anchor='e'
         )
-        self.text_display.grid(row=1, column=0, sticky='ew', pady=(0, UIConfig.PADDING))
+        self.preview_label.grid(row=3, column=0, sticky='ew', pady=(0, UIConfig.PADDING))
+        self._add_themed(self.preview_label, (('bg', 'BG_COLOR'), ('fg', 'FG_COMPLETION')))
+        self._rendered_preview_row = self.preview_row
+
+    def _format_preview(self) -> str:
+        """Текст предпросмотра последней символьной клавиши"""
+        if self.preview_row is None:
+            return ""
+        return self.preview_matrix.previews[self.preview_row]
 
     def _create_keyboard_layout(self):
         """Создание раскладки клавиатуры"""
         keyboard_container = tk.Frame(self.main_frame, bg=UIConfig.BG_COLOR)
-        keyboard_container.grid(row=2, column=0, sticky='nsew')
-        self.main_frame.rowconfigure(2, weight=1)
+        keyboard_container.grid(row=4, column=0, sticky='nsew')
+        self._add_themed(keyboard_container)
+        self.main_frame.rowconfigure(4, weight=1)
 
         layout = self.get_layout()
         position_weights = self.get_position_weights()
         home_row_keys = self.get_home_row_keys()
+        self.labels = compile_labels(tuple(tuple(row) for row in layout))
+        legends = self.labels.labels[self.label_state]
+        self._rendered_label_state = self.label_state
 
         # Создаем список всех элементов без вложенных циклов
         layout_items = [(row_idx, col_idx, key)
@@ -209,6 +381,7 @@ class BaseKeyboardVisualizer(ABC):
                 row_frame.grid(row=row_idx, column=0, sticky='nsew', pady=0)
                 row_frame.rowconfigure(0, weight=1)
                 row_frames[row_idx] = row_frame
+                self._add_themed(row_frame)
             else:
                 row_frame = row_frames[row_idx]
 
@@ -216,8 +389,10 @@ class BaseKeyboardVisualizer(ABC):
             row_frame.columnconfigure(col_idx, weight=weight)
 
             base_key = key.split('|')[0].strip() if '|' in key else key
-            bg_color = (UIConfig.KEY_ACCENT_COLOR if base_key.upper() in home_row_keys
-                       else UIConfig.KEY_DEFAULT_COLOR)
+            is_accent = base_key.upper() in home_row_keys
+            bg_color = UIConfig.KEY_ACCENT_COLOR if is_accent else UIConfig.KEY_DEFAULT_COLOR
+            if is_accent:
+                self._accent_keys |= 1 << len(self.button_widgets)
 
             button_size = max(9, int(14 * self.scale_factor))
 
@@ -228,16 +403,22 @@ class BaseKeyboardVisualizer(ABC):
             # Создаем фрейм-контейнер для кнопки с фиксированными размерами
             btn_container = tk.Frame(row_frame, bg=UIConfig.BG_COLOR)
             btn_container.grid(row=0, column=col_idx, sticky='nsew', padx=UIConfig.SPACING, pady=UIConfig.SPACING)
+            self._add_themed(btn_container)
 
-            btn = tk.Label(
-                btn_container,
-                text=key,
-                relief=tk.RAISED,
-                bg=bg_color,
-                fg=UIConfig.FG_COLOR,
-                font=(UIConfig.FONT_FAMILY, button_size, 'bold'),
-                borderwidth=2
-            )
+            if UIConfig.KEY_RENDER_MODE == 'image' and IMAGES_AVAILABLE:
+                # Подсветка заменой изображения из атласа
+                btn = KeyCap(btn_container, self.get_title(), legends[len(self.button_widgets)],
+                             bg_color, UIConfig.FG_COLOR, button_size)
+            else:
+                btn = tk.Label(
+                    btn_container,
+                    text=legends[len(self.button_widgets)],
+                    relief=tk.RAISED,
+                    bg=bg_color,
+                    fg=UIConfig.FG_COLOR,
+                    font=(UIConfig.FONT_FAMILY, button_size, 'bold'),
+                    borderwidth=2
+                )
 
             # Настраиваем размеры в зависимости от типа клавиши
             if is_square:
@@ -249,53 +430,374 @@ class BaseKeyboardVisualizer(ABC):
                 # Для специальных клавиш используем растягивание
                 btn.pack(fill=tk.BOTH, expand=True)
 
-            # Регистрируем символы для кнопки
-            self._register_button_symbols(key, btn)
+            # Регистрируем символы для кнопки по её индексу
+            self._register_button_symbols(key, len(self.button_widgets))
+            # Щелчок или касание кнопки вводит её нажатие
+            if self.click_handler is not None:
+                btn.bind('<ButtonPress-1>', partial(self._on_button_click, len(self.button_widgets), key))
 
-            self.button_colors[btn] = bg_color
+            self.button_positions[(row_idx, col_idx)] = len(self.button_widgets)
+            self.button_colors.append(bg_color)
             self.button_widgets.append(btn)
-            self.button_positions[(row_idx, col_idx)] = btn
 
         keyboard_container.columnconfigure(0, weight=1)
+        # Привязываем часы анимации к созданным кнопкам
+        self.animator.bind(self.button_widgets, self.button_colors)
+        self._all_keys_mask = (1 << len(self.button_widgets)) - 1
+        # Клавиши, удерживаемые во время пересоздания, сразу подсвечиваются снова
+        self.request_render()
+
+    def apply_theme(self, theme: CompiledTheme):
+        """
+        Смена темы без пересоздания клавиатуры
+
+        Один проход по виджетам оформления и кнопкам: меняются только цвета,
+        уровни подсветки нажатых и затухающих клавиш сохраняются
+
+        Args:
+            theme: Скомпилированная тема (её цвета уже установлены в UIConfig)
+        """
+        colors = theme.colors
+        try:
+            for widget, options in self.themed_widgets:
+                widget.configure({option: colors[name] for option, name in options})
+            if isinstance(self.text_display, TutorTextDisplay):
+                self.text_display.apply_colors(colors)
+            if self.title_label is not None:
+                self.title_label.configure(fg=self.get_title_color())
+            ramps = theme.key_ramps(len(self.button_widgets), self._accent_keys, self._target_keys)
+            self.button_colors = [ramp[0][0] for ramp in ramps]
+            for widget, color in zip(self.button_widgets, self.button_colors):
+                if isinstance(widget, KeyCap):
+                    widget.set_base_color(color)
+            self.animator.set_ramps(ramps)
+        except tk.TclError:
+            # Клавиатура уничтожается - новая будет создана уже в цветах темы
+            pass
 
-    def _register_button_symbols(self, key: str, btn: tk.Label):
-        """Регистрация символов для кнопки"""
+    def _register_button_symbols(self, key: str, index: int):
+        """Регистрация символов для кнопки с указанным индексом"""
         symbols = [s.strip() for s in key.split('|')] if '|' in key else [key]
+        if len(symbols) == 2 and symbols[1] != symbols[0]:
+            self._shift_symbols.add(symbols[1])
         for symbol in symbols:
             symbol_lower = symbol.lower()
-            self.buttons.setdefault(symbol_lower, []).append(btn)
+            self.buttons.setdefault(symbol_lower, []).append(index)
             symbol_upper = symbol.upper()
             if symbol_upper != symbol_lower:
-                self.buttons.setdefault(symbol_upper, []).append(btn)
+                self.buttons.setdefault(symbol_upper, []).append(index)
+
+    def begin_batch(self):
+        """Начало пачки правок: дисплей и подсказки не перерисовываются до end_batch"""
+        self._batching = True
+
+    def end_batch(self, text: str):
+        """
+        Конец пачки правок: одна перерисовка того, что изменилось
+
+        Args:
+            text: Полный текст после пачки
+        """
+        self._batching = False
+        if self._text_dirty:
+            self._text_dirty = False
+            self.update_text_display(text)
+        if self._bar_dirty:
+            self._bar_dirty = False
+            self._update_suggestion_bar()
 
     def update_text_display(self, text: str):
-        """Обновление текстового дисплея"""
+        """Обновление текстового дисплея (замена всего текста)"""
+        if self._batching:
+            self._text_dirty = True
+            return
         try:
-            if self.text_display and self.text_display.winfo_exists():
-                display_text = text if text else " "
-                self.text_display.config(text=display_text)
-        except:
+            if self.text_display:
+                self.text_display.set_text(text)
+        except tk.TclError:
             pass
+        self._notify_text(text)
 
-    def highlight_key(self, key_name: str, key_mapping: Dict[str, str]):
-        """Подсветка клавиши"""
+    def append_text(self, chars: str, text: str):
+        """
+        Добавление символов в конец текстового дисплея
+
+        Args:
+            chars: Добавленные символы
+            text: Полный текст после добавления
+        """
+        if self._batching:
+            self._text_dirty = True
+            return
         try:
-            buttons_to_highlight = self._find_buttons_to_highlight(key_name, key_mapping)
+            if self.text_display:
+                self.text_display.insert(chars, text)
+        except tk.TclError:
+            pass
+        self._notify_text(text)
 
-            if buttons_to_highlight and buttons_to_highlight == self.last_pressed_buttons:
-                self._reset_button_colors(self.last_pressed_buttons)
-                self.last_pressed_buttons = []
-                return
+    def delete_text(self, count: int, text: str):
+        """
+        Удаление символов с конца текстового дисплея
+
+        Args:
+            count: Количество удалённых символов
+            text: Полный текст после удаления
+        """
+        if self._batching:
+            self._text_dirty = True
+            return
+        try:
+            if self.text_display:
+                self.text_display.delete(count, text)
+        except tk.TclError:
+            pass
+        self._notify_text(text)
 
-            self._reset_button_colors(self.last_pressed_buttons)
-            self._set_button_colors(buttons_to_highlight, UIConfig.KEY_PRESSED_COLOR, UIConfig.FG_BLACK)
+    def show_completions(self, words: List[str]):
+        """
+        Обновление строки подсказок
+
+        Args:
+            words: Подсказки для текущего префикса
+        """
+        # Пока слово не меняет подсказки, виджет не перенастраивается
+        if words == self.completions:
+            return
+        self.completions = words
+        self._update_suggestion_bar()
 
-            self.root.after(200, lambda: self._set_dim_color(buttons_to_highlight))
-            self.last_pressed_buttons = buttons_to_highlight
+    def show_layout_hint(self, word: str = "", converted: str = ""):
+        """
+        Показ исправления раскладки последнего слова (без аргументов - скрыть)
+
+        Args:
+            word: Набранное слово
+            converted: Слово на другой раскладке
+        """
+        hint = f"{word} → {converted}" if word else ""
+        if hint == self.layout_hint:
+            return
+        self.layout_hint = hint
+        self._update_suggestion_bar()
+
+    def _update_suggestion_bar(self):
+        """Перерисовка строки подсказок"""
+        if self._batching:
+            self._bar_dirty = True
+            return
+        try:
+            if self.completion_label:
+                self.completion_label.config(text=self._format_suggestions())
+        except tk.TclError:
+            pass
+
+    def _format_suggestions(self) -> str:
+        """Текст строки подсказок (пробел сохраняет высоту пустой строки)"""
+        parts = [self.layout_hint] if self.layout_hint else []
+        parts.extend(self.completions)
+        return '   '.join(parts) if parts else " "
+
+    def _notify_text(self, text: str):
+        """Уведомление наблюдателей об изменении текста (и отметка следующей клавиши урока)"""
+        self._mark_next_key()
+        for observer in self.observers:
+            observer.on_text_changed(text)
+
+    def _mark_next_key(self):
+        """
+        Отметка клавиш следующего символа урока (только в режиме тренажёра)
+
+        Отмеченные клавиши получают цвет KEY_TARGET_COLOR так же, как клавиши
+        основного ряда - акцентный цвет; прописной букве или второму символу
+        клавиши добавляется Shift
+        """
+        if not isinstance(self.text_display, TutorTextDisplay):
+            return
+        char = self.text_display.next_char
+        mask = 0
+        if char is not None:
+            name = TUTOR_KEY_NAMES.get(char, char)
+            mask = mask_of(self._find_buttons_to_highlight(name, KeyboardLayoutConfig.SPECIAL_KEY_MAPPING))
+            if char in self._shift_symbols or char != char.lower():
+                mask |= mask_of(self.buttons.get('shift', ()))
+        self.set_target_keys(mask)
+
+    def set_target_keys(self, mask: int):
+        """
+        Смена отмеченных тренажёром клавиш (перекрашиваются только изменившиеся)
+
+        Args:
+            mask: Битовая маска отмечаемых клавиш
+        """
+        mask &= self._all_keys_mask
+        changed = mask ^ self._target_keys
+        if not changed:
+            return
+        self._target_keys = mask
+        theme = compile_theme(UIConfig.THEME)
+        try:
+            for idx in iter_bits(changed):
+                ramp = theme.key_ramp(idx, self._accent_keys, mask)
+                self.button_colors[idx] = ramp[0][0]
+                widget = self.button_widgets[idx]
+                if isinstance(widget, KeyCap):
+                    widget.set_base_color(ramp[0][0])
+                self.animator.set_ramp(idx, ramp)
+        except tk.TclError:
+            pass
+
+    def highlight_key(self, key_name: str, key_mapping: Dict[str, str]):
+        """Вспышка подсветки клавиши (нажатие и сразу отпускание)"""
+        try:
+            self.animator.pulse(self._find_buttons_to_highlight(key_name, key_mapping))
         except:
             pass
 
-    def _find_buttons_to_highlight(self, key_name: str, key_mapping: Dict[str, str]) -> List[tk.Label]:
+    def press_key(self, key_name: str, key_mapping: Dict[str, str]) -> int:
+        """
+        Отметка клавиши как нажатой в битовой карте
+
+        Можно вызывать из потока слушателя: сама отрисовка выполняется
+        в главном потоке на ближайшем кадре
+
+        Args:
+            key_name: Символ или название клавиши
+            key_mapping: Маппинг названий специальных клавиш
+
+        Returns:
+            int: Маска нажатых кнопок (0, если кнопка не найдена)
+        """
+        mask = mask_of(self._find_buttons_to_highlight(key_name, key_mapping))
+        if mask:
+            self.key_state.press(mask)
+            self.request_render()
+        return mask
+
+    def press_buttons(self, mask: int):
+        """
+        Отметка кнопок как нажатых по маске (например, зафиксированный щелчком Shift)
+
+        Args:
+            mask: Маска кнопок
+        """
+        self.key_state.press(mask)
+        self.request_render()
+
+    def release_keys(self, mask: int):
+        """
+        Отметка кнопок как отпущенных в битовой карте
+
+        Args:
+            mask: Маска отпущенных кнопок (полученная из press_key)
+        """
+        self.key_state.release(mask)
+        self.request_render()
+
+    def _on_button_click(self, index: int, key: str, event=None):
+        """Щелчок по кнопке: передача её индекса и подписи обработчику"""
+        self.click_handler(index, key)
+
+    def set_label_state(self, state: int):
+        """
+        Смена состояния подписей (можно вызывать из потока слушателя)
+
+        Кнопки переподписываются на ближайшем кадре
+
+        Args:
+            state: Состояние подписей (labels.label_state)
+        """
+        if state != self.label_state:
+            self.label_state = state
+            self.request_render()
+
+    def show_preview(self, char: str):
+        """
+        Предпросмотр символьной клавиши на других раскладках (можно вызывать из потока слушателя)
+
+        Строка матрицы выбирается по символу и текущему состоянию подписей;
+        текст меняется на ближайшем кадре
+
+        Args:
+            char: Символ нажатой клавиши на этой раскладке
+        """
+        if self.preview_matrix is None:
+            return
+        row = self.preview_matrix.find_row(self.get_language(), char, self.label_state)
+        if row is not None and row != self.preview_row:
+            self.preview_row = row
+            self.request_render()
+
+    def _render_labels(self):
+        """Переподписывание кнопок, подпись которых отличается в новом состоянии (главный поток)"""
+        state = self.label_state
+        legends = self.labels.labels[state]
+        widgets = self.button_widgets
+        for index in self.labels.changes[self._rendered_label_state][state]:
+            widget = widgets[index]
+            if isinstance(widget, KeyCap):
+                widget.set_text(legends[index])
+            else:
+                widget.configure(text=legends[index])
+        self._rendered_label_state = state
+
+    def request_render(self):
+        """Планирование отрисовки карты нажатых клавиш (не более одной в очереди)"""
+        if not self._render_pending:
+            self._render_pending = True
+            self.root.after(0, self._render_key_state)
+
+    def _render_key_state(self):
+        """
+        Отрисовка изменений карты нажатых клавиш
+
+        Сравнивает текущую карту с отрисованной на прошлом кадре и
+        перекрашивает только кнопки, состояние которых изменилось. Клавиши,
+        нажатые и отпущенные между кадрами, вспыхивают, пока событий за кадр
+        не больше UIConfig.OVERLOAD_THRESHOLD; сверх порога показывается
+        только последнее состояние каждой клавиши. В том же кадре кнопки
+        переподписываются, если изменились Shift или Caps Lock, и
+        обновляется строка предпросмотра
+        """
+        # Сбрасываем флаг до чтения карты: нажатие после этой точки запланирует новый кадр
+        self._render_pending = False
+        if self.label_state != self._rendered_label_state and self.button_widgets:
+            try:
+                self._render_labels()
+            except tk.TclError:
+                # Кнопки уничтожены во время переключения раскладки
+                return
+        if self.preview_row != self._rendered_preview_row and self.preview_label is not None:
+            try:
+                self.preview_label.configure(text=self._format_preview())
+            except tk.TclError:
+                # Строка уничтожена во время переключения раскладки
+                return
+            self._rendered_preview_row = self.preview_row
+        down, released, events = self.key_state.take()
+        down &= self._all_keys_mask
+        changed = down ^ self._rendered_keys
+        # Короткие нажатия: клавиша отпущена, но на прошлом кадре не горела
+        tapped = released & self._all_keys_mask & ~down & ~self._rendered_keys
+        self.overload.highlight_events += events
+        if events > UIConfig.OVERLOAD_THRESHOLD:
+            # Перегрузка: события, не изменившие итоговое состояние клавиш, объединяются
+            self.overload.collapsed_highlights += max(0, events - bin(changed).count('1'))
+            tapped = 0
+        if not changed and not tapped:
+            return
+        try:
+            self.animator.hold(iter_bits(changed & down))
+            self.animator.pulse(iter_bits(tapped))
+            self.animator.release(iter_bits(changed & ~down))
+        except tk.TclError:
+            # Кнопки уничтожены во время переключения раскладки
+            return
+        self._rendered_keys = down
+        for observer in self.observers:
+            observer.on_keys_changed(down)
+
+    def _find_buttons_to_highlight(self, key_name: str, key_mapping: Dict[str, str]) -> List[int]:
         """Поиск кнопок для подсветки"""
         key_lower = key_name.lower()
         key_upper = key_name.upper()
@@ -316,41 +818,21 @@ class BaseKeyboardVisualizer(ABC):
 
         return []
 
-    def _reset_button_colors(self, buttons: List[tk.Label]):
-        """Сброс цветов кнопок"""
-        for btn in buttons:
-            if btn.winfo_exists():
-                base_color = self.button_colors.get(btn, UIConfig.KEY_DEFAULT_COLOR)
-                btn.configure(bg=base_color, fg=UIConfig.FG_COLOR)
-
-    def _set_button_colors(self, buttons: List[tk.Label], bg_color: str, fg_color: str):
-        """Установка цветов кнопок"""
-        for btn in buttons:
-            if btn.winfo_exists():
-                btn.configure(bg=bg_color, fg=fg_color)
-
-    def _set_dim_color(self, buttons: List[tk.Label]):
-        """Установка приглушенного цвета"""
-        for btn in buttons:
-            if btn in self.last_pressed_buttons:
-                try:
-                    if btn.winfo_exists():
-                        btn.configure(bg=UIConfig.KEY_DIM_COLOR, fg=UIConfig.FG_COLOR)
-                except:
-                    pass
-
     def reset_highlights(self):
         """Сброс всех подсветок"""
+        self.key_state.clear()
+        self._rendered_keys = 0
         try:
-            self._reset_button_colors(self.last_pressed_buttons)
-            self.last_pressed_buttons = []
+            self.animator.reset()
         except:
-            self.last_pressed_buttons = []
+            pass
 
 
 class EnglishKeyboardVisualizer(BaseKeyboardVisualizer):
     """Визуализатор английской (EN) клавиатуры"""
 
+    __slots__ = ()
+
     def get_layout(self) -> List[List[str]]:
         """
         Возвращает английскую раскладку QWERTY
@@ -371,6 +853,15 @@ class EnglishKeyboardVisualizer(BaseKeyboardVisualizer):
         # Возвращаем клавиши F и J (стандартные для английской раскладки)
         return EnglishLayoutConfig.HOME_ROW_KEYS
 
+    def get_language(self) -> Language:
+        """
+        Возвращает язык английской раскладки
+
+        Returns:
+            Language: Language.ENGLISH
+        """
+        return Language.ENGLISH
+
     def get_title(self) -> str:
         """
         Возвращает заголовок для английской раскладки
@@ -395,6 +886,8 @@ class EnglishKeyboardVisualizer(BaseKeyboardVisualizer):
 class RussianKeyboardVisualizer(BaseKeyboardVisualizer):
     """Визуализатор русской (RU) клавиатуры"""
 
+    __slots__ = ()
+
     def get_layout(self) -> List[List[str]]:
         """
         Возвращает русскую раскладку ЙЦУКЕН
@@ -415,6 +908,15 @@ class RussianKeyboardVisualizer(BaseKeyboardVisualizer):
         # Возвращаем клавиши А и О (стандартные для русской раскладки)
         return RussianLayoutConfig.HOME_ROW_KEYS
 
+    def get_language(self) -> Language:
+        """
+        Возвращает язык русской раскладки
+
+        Returns:
+            Language: Language.RUSSIAN
+        """
+        return Language.RUSSIAN
+
     def get_title(self) -> str:
         """
         Возвращает заголовок для русской раскладки
@@ -3,29 +3,72 @@
 Точка входа в приложение
 """
 
+# Импортируем модуль argparse для разбора параметров командной строки
+import argparse
+# Импортируем модуль logging для вывода диагностических сообщений
+import logging
+# Импортируем модуль multiprocessing для поддержки дочерних процессов в EXE-сборке
+import multiprocessing
 # Импортируем модуль tkinter для создания графического интерфейса
 import tkinter as tk
+# Импортируем тип Optional для необязательных параметров
+from typing import Optional, Sequence
 
 # Импортируем класс UIConfig с настройками интерфейса из пакета keyboard
 from keyboard.config import UIConfig
 # Импортируем класс LayoutManager для управления раскладками клавиатуры
 from keyboard.manager import LayoutManager
+# Импортируем сторожа медленных обратных вызовов главного цикла
+from keyboard.diagnostics import SlowCallbackWatchdog
+# Импортируем модуль атласа изображений клавиш (проверка наличия Pillow)
+from keyboard import keycaps
+# Импортируем встроенные темы оформления
+from keyboard.themes import THEMES, use_theme
+# Импортируем загрузку плагинов шины событий
+from keyboard.plugins import load_plugin
+# Импортируем сервис окна, не забирающего фокус ввода
+from keyboard.services import WindowFocusService
 
 
 class VirtualKeyboardApp:
     """Главное приложение виртуальной клавиатуры"""
 
-    def __init__(self):
+    def __init__(self, isolated_capture: bool = False, broadcast_address: Optional[str] = None,
+                 record_path: Optional[str] = None, profile: bool = False,
+                 shared_state_name: Optional[str] = None, plugins: Sequence[str] = ()):
         """
         Инициализация приложения
         Создаёт главное окно и запускает менеджер раскладок
+
+        Args:
+            isolated_capture: Перехватывать клавиатуру в отдельном процессе
+            broadcast_address: Адрес трансляции для зрителей (None - без трансляции)
+            record_path: Файл записи сеанса набора (None - без записи)
+            profile: Профилировать главный поток сразу после запуска
+            shared_state_name: Имя сегмента разделяемой памяти для экспорта состояния (None - без экспорта)
+            plugins: Модули плагинов с функцией register(bus)
         """
         # Создаём главное окно приложения
         self.root = self._create_window()
+        # Щелчок по кнопке не должен забирать фокус у приложения, в которое вводятся нажатия
+        if UIConfig.CLICK_TO_TYPE and not WindowFocusService.make_non_activating(self.root):
+            logging.warning("Window activation cannot be disabled here; "
+                            "return focus to the target application before clicking keys")
+        # Сторож устанавливается до создания раскладок, чтобы видеть все обратные вызовы
+        self.watchdog = (SlowCallbackWatchdog(self.root, UIConfig.SLOW_CALLBACK_MS)
+                         if UIConfig.SLOW_CALLBACK_MS > 0 else None)
         # Создаём менеджер раскладок, передавая ему главное окно
-        self.manager = LayoutManager(self.root)
+        self.manager = LayoutManager(self.root, isolated_capture=isolated_capture,
+                                     broadcast_address=broadcast_address, record_path=record_path,
+                                     shared_state_name=shared_state_name)
+        # Плагины подписываются на шину событий до запуска слушателя
+        for module_name in plugins:
+            load_plugin(self.manager.hooks, module_name)
         # Создаём начальную визуализацию клавиатуры
         self.manager.current_visualizer.create_keyboard()
+        # Профилирование с момента запуска (иначе - по клавише UIConfig.PROFILER_HOTKEY)
+        if profile:
+            self.root.after(0, self.manager.profiler.start)
 
     def _create_window(self) -> tk.Tk:
         """
@@ -59,11 +102,121 @@ class VirtualKeyboardApp:
         # Запускаем главный цикл обработки событий Tkinter
         # Это блокирующий вызов - программа будет работать до закрытия окна
         self.root.mainloop()
+        # После закрытия окна сохраняем запись сеанса и останавливаем трансляцию
+        self.manager.close()
+
+
+def positive_seconds(value: str) -> float:
+    """
+    Длительность в секундах (больше нуля) для argparse
+
+    Args:
+        value: Значение параметра командной строки
+
+    Returns:
+        float: Длительность в секундах
+    """
+    try:
+        seconds = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"не число: {value!r}")
+    if not seconds > 0:
+        raise argparse.ArgumentTypeError(f"длительность должна быть больше нуля: {value!r}")
+    return seconds
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Разбор параметров командной строки
+
+    Returns:
+        argparse.Namespace: Значения параметров
+    """
+    parser = argparse.ArgumentParser(description="Виртуальная клавиатура")
+    parser.add_argument('--isolated-capture', action='store_true',
+                        help="перехватывать клавиатуру в отдельном процессе")
+    parser.add_argument('--broadcast', metavar='ADDRESS',
+                        help="транслировать состояние зрителям: 'хост:порт' или 'unix:/путь'")
+    parser.add_argument('--text-display', choices=['label', 'scroll'], default=UIConfig.TEXT_DISPLAY_MODE,
+                        help="тип текстового дисплея: строка фиксированной ширины или прокручиваемый")
+    parser.add_argument('--lesson', metavar='FILE',
+                        help="режим тренажёра: показать текст урока из файла и отмечать следующую клавишу")
+    parser.add_argument('--completion-dir', metavar='DIR', default=UIConfig.COMPLETION_DIR,
+                        help="каталог словарей автодополнения (en.trie, ru.trie)")
+    parser.add_argument('--shared-state', nargs='?', const=UIConfig.SHARED_STATE_NAME, metavar='NAME',
+                        help=f"экспортировать состояние в разделяемую память для python -m keyboard.shared_state "
+                             f"(по умолчанию имя {UIConfig.SHARED_STATE_NAME})")
+    parser.add_argument('--macros', metavar='FILE', default=UIConfig.MACRO_FILE,
+                        help="файл макросов: 'ctrl+alt+k t => text:...' (перечитывается при изменении)")
+    parser.add_argument('--plugin', action='append', default=[], metavar='MODULE',
+                        help="загрузить плагин: модуль с функцией register(bus) (можно указать несколько раз)")
+    parser.add_argument('--record', metavar='FILE',
+                        help="записывать нажатия в файл сеанса для python -m keyboard.analysis")
+    parser.add_argument('--profile', nargs='?', type=positive_seconds, const=UIConfig.PROFILE_SECONDS, metavar='SECONDS',
+                        help=f"профилировать главный поток после запуска (по умолчанию {UIConfig.PROFILE_SECONDS} с); "
+                             f"в любой момент - клавишей {UIConfig.PROFILER_HOTKEY.title()}")
+    parser.add_argument('--profile-output', default=UIConfig.PROFILE_OUTPUT, metavar='FILE',
+                        help="файл pstats ('{time}' - время запуска)")
+    parser.add_argument('--slow-callback-ms', type=float, default=UIConfig.SLOW_CALLBACK_MS, metavar='MS',
+                        help="записывать в журнал обратные вызовы Tk дольше порога (0 - не следить)")
+    parser.add_argument('--theme', choices=list(THEMES), default=UIConfig.THEME,
+                        help=f"тема оформления (смена по кругу - клавишей {UIConfig.THEME_HOTKEY.title()})")
+    parser.add_argument('--key-images', action='store_true',
+                        help="подсвечивать клавиши заменой заранее нарисованных изображений (нужен Pillow)")
+    parser.add_argument('--wrong-layout', choices=['off', 'flag', 'convert'], default=UIConfig.WRONG_LAYOUT_MODE,
+                        help="слова, набранные не на той раскладке: не проверять, подсказывать или исправлять")
+    parser.add_argument('--layout-detection', choices=['auto', 'os', 'content'], default=UIConfig.LAYOUT_DETECTION,
+                        help="определение раскладки: опрос ОС, по набираемому тексту или auto (ОС, если доступна)")
+    parser.add_argument('--click-to-type', action='store_true',
+                        help="вводить нажатия в активное приложение щелчком или касанием кнопок")
+    parser.add_argument('--layout-preview', action='store_true',
+                        help="показывать, что нажатая клавиша ввела бы на каждой раскладке")
+    return parser.parse_args()
 
 
 # Точка входа в программу - выполняется только при прямом запуске файла
 if __name__ == '__main__':
+    # Поддержка дочернего процесса перехвата в собранном EXE (PyInstaller)
+    multiprocessing.freeze_support()
+    # Разбираем параметры командной строки
+    args = parse_args()
+    # Применяем выбранный тип текстового дисплея до создания визуализаторов
+    UIConfig.TEXT_DISPLAY_MODE = args.text_display
+    # Урок тренажёра заменяет текстовый дисплей дисплеем урока
+    if args.lesson:
+        UIConfig.TUTOR_LESSON = args.lesson
+        UIConfig.TEXT_DISPLAY_MODE = 'tutor'
+    # Каталог словарей автодополнения (словари открываются при создании раскладок)
+    UIConfig.COMPLETION_DIR = args.completion_dir
+    # Режим проверки раскладки слов
+    UIConfig.WRONG_LAYOUT_MODE = args.wrong_layout
+    # Способ определения раскладки (выбирается при запуске менеджера)
+    UIConfig.LAYOUT_DETECTION = args.layout_detection
+    # Файл макросов (загружается менеджером раскладок)
+    UIConfig.MACRO_FILE = args.macros
+    # Ввод нажатий щелчком по кнопкам (обработчики ставит менеджер раскладок)
+    UIConfig.CLICK_TO_TYPE = args.click_to_type
+    # Предпросмотр клавиши на других раскладках (матрица строится при создании визуализаторов)
+    UIConfig.LAYOUT_PREVIEW = args.layout_preview
+    # Цвета темы устанавливаются до создания окна
+    use_theme(args.theme)
+    # Параметры диагностики главного потока
+    UIConfig.SLOW_CALLBACK_MS = args.slow_callback_ms
+    UIConfig.PROFILE_OUTPUT = args.profile_output
+    if args.profile is not None:
+        UIConfig.PROFILE_SECONDS = args.profile
+    # Диагностические сообщения выводятся в stderr
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(name)s: %(message)s')
+    # Режим изображений клавиш (без Pillow остаётся перекраска tk.Label)
+    if args.key_images:
+        if keycaps.IMAGES_AVAILABLE:
+            UIConfig.KEY_RENDER_MODE = 'image'
+        else:
+            logging.warning("Pillow is not installed; --key-images is ignored")
     # Создаём экземпляр приложения виртуальной клавиатуры
-    app = VirtualKeyboardApp()
+    app = VirtualKeyboardApp(isolated_capture=args.isolated_capture,
+                             broadcast_address=args.broadcast, record_path=args.record,
+                             profile=args.profile is not None, shared_state_name=args.shared_state,
+                             plugins=args.plugin)
     # Запускаем приложение (входим в главный цикл)
     app.run()
\ No newline at end of file
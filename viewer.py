@@ -0,0 +1,118 @@
+"""
+Зритель трансляции виртуальной клавиатуры
+Показывает зеркало (только для чтения) клавиатуры, запущенной с параметром --broadcast
+"""
+
+# Импортируем модуль argparse для разбора параметров командной строки
+import argparse
+# Импортируем модуль threading для блокировки общего состояния
+import threading
+# Импортируем модуль tkinter для создания графического интерфейса
+import tkinter as tk
+# Импортируем типы для аннотации
+from typing import Dict, List, Tuple
+
+# Импортируем конфигурацию UI и перечисление языков
+from keyboard.config import Language, UIConfig
+# Импортируем базовый класс визуализатора
+from keyboard.visualizers import BaseKeyboardVisualizer
+# Импортируем фабрику для создания визуализаторов
+from keyboard.factory import KeyboardFactory
+# Импортируем приёмник трансляции и типы записей
+from keyboard.broadcast import BroadcastReceiver, RECORD_KEYS, RECORD_LAYOUT, RECORD_TEXT
+# Импортируем встроенные темы оформления
+from keyboard.themes import THEMES, use_theme
+
+
+class KeyboardMirrorApp:
+    """Зеркало виртуальной клавиатуры, управляемое трансляцией"""
+
+    def __init__(self, address: str):
+        """
+        Инициализация зеркала
+
+        Args:
+            address: Адрес издателя ('unix:/путь' или 'хост:порт')
+        """
+        # Создаём главное окно так же, как основное приложение
+        self.root = tk.Tk()
+        self.root.title("Виртуальная клавиатура - зеркало")
+        self.root.configure(bg=UIConfig.BG_COLOR)
+        self.root.minsize(UIConfig.MIN_WINDOW_WIDTH, UIConfig.MIN_WINDOW_HEIGHT)
+        self.root.geometry(f"{UIConfig.DEFAULT_WINDOW_WIDTH}x{UIConfig.DEFAULT_WINDOW_HEIGHT}")
+        # Визуализаторы всех раскладок (создаются фабрикой, как в основном приложении)
+        self.visualizers: Dict[Language, BaseKeyboardVisualizer] = {
+            lang: KeyboardFactory.create_visualizer(lang, self.root) for lang in Language
+        }
+        self.language = Language.ENGLISH
+        self.visualizer = self.visualizers[self.language]
+        self.text = ""
+        self.visualizer.create_keyboard()
+        # Последнее принятое состояние: поток приёмника пишет, главный поток читает
+        self._lock = threading.Lock()
+        self._latest: Dict[int, object] = {}
+        self._apply_pending = False
+        # Приёмник трансляции
+        self.receiver = BroadcastReceiver(address, self._on_records)
+
+    def _on_records(self, records: List[Tuple[int, object]]):
+        """
+        Приём записей одного кадра (поток приёмника)
+
+        Из каждого типа записи важно только последнее значение,
+        поэтому кадры, пришедшие между отрисовками, схлопываются
+        """
+        with self._lock:
+            for record_type, value in records:
+                self._latest[record_type] = value
+            if self._apply_pending:
+                return
+            self._apply_pending = True
+        self.root.after(0, self._apply)
+
+    def _apply(self):
+        """Применение последнего состояния к визуализатору (главный поток)"""
+        with self._lock:
+            latest, self._latest = self._latest, {}
+            self._apply_pending = False
+        if RECORD_TEXT in latest:
+            self.text = latest[RECORD_TEXT]
+        language = latest.get(RECORD_LAYOUT, self.language)
+        if language != self.language:
+            # Переключаем раскладку так же, как LayoutManager.switch_layout
+            down = self.visualizer.key_state.down
+            self.visualizer.destroy_keyboard()
+            self.language = language
+            self.visualizer = self.visualizers[language]
+            self.visualizer.key_state.set(down)
+            self.visualizer.create_keyboard(self.text)
+        elif RECORD_TEXT in latest:
+            self.visualizer.update_text_display(self.text)
+        if RECORD_KEYS in latest:
+            self.visualizer.key_state.set(latest[RECORD_KEYS])
+            self.visualizer.request_render()
+
+    def run(self):
+        """Подключение к издателю и запуск главного цикла"""
+        self.receiver.start()
+        self.root.mainloop()
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Разбор параметров командной строки
+
+    Returns:
+        argparse.Namespace: Значения параметров
+    """
+    parser = argparse.ArgumentParser(description="Зеркало виртуальной клавиатуры")
+    parser.add_argument('address', help="адрес издателя: 'хост:порт' или 'unix:/путь'")
+    parser.add_argument('--theme', choices=list(THEMES), default=UIConfig.THEME, help="тема оформления")
+    return parser.parse_args()
+
+
+# Точка входа в программу - выполняется только при прямом запуске файла
+if __name__ == '__main__':
+    args = parse_args()
+    use_theme(args.theme)
+    KeyboardMirrorApp(args.address).run()